@@ -19,11 +19,20 @@ Description
 
 import sys
 import os
+import csv
+import datetime
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+import zlib
 import bcrypt
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from flask import Flask, request, jsonify, redirect, Response
-import requests
 import pymysql.cursors
 
 # backend 디렉토리에서 실행할 때 상위 디렉토리를 sys.path에 추가
@@ -32,8 +41,12 @@ parent_dir = os.path.dirname(backend_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from utils.constants import get_connection
+from utils.constants import get_connection, db_connection, get_streaming_connection
 from utils.user_insert import load_users_from_csv
+from backend.cache import TTLCache
+from backend.pagination import decode_cursor, encode_cursor, parse_limit, split_page
+from backend.playback_ingest import PlaybackIngestQueue
+from backend.spotify_client import SpotifyAPIError, get_spotify_client, parse_track_fields
 
 DictCursor = pymysql.cursors.DictCursor
 
@@ -43,51 +56,115 @@ app = Flask(__name__)
 # -------------------------------------------------------------
 # 0) 초기 테이블 생성
 # -------------------------------------------------------------
+# 목록 API(keyset 페이지네이션)가 사용하는 복합 인덱스
+# - InnoDB 보조 인덱스에는 PK 가 자동으로 붙으므로 (col, created_at) 만으로 (col, created_at, PK) 순서가 됨
+# - CREATE TABLE IF NOT EXISTS 는 이미 있는 테이블에 인덱스를 추가하지 않으므로
+#   각 init 라우트에서 ensure_indexes() 로 없는 인덱스만 추가
+USERS_INDEXES = {
+    "idx_grade_user": ("grade", "user_id"),
+}
+# users_search 이름/좋아하는 음악 검색용 (ngram, 컬럼별로 따로 MATCH 하므로 인덱스도 컬럼별)
+USERS_FULLTEXT_INDEXES = {
+    "ft_users_name": ("name",),
+    "ft_users_favorite_music": ("favorite_music",),
+}
+USER_PREDICTION_INDEXES = {
+    "idx_risk_score": ("risk_score",),
+}
+LOG_INDEXES = {
+    "idx_user_created": ("user_id", "created_at"),
+    "idx_action_created": ("action_type", "created_at"),
+}
+USER_ACHIEVEMENTS_INDEXES = {
+    "idx_achievement_completed": ("achievement_id", "is_completed", "completed_at", "user_id"),
+}
+
+
+def ensure_indexes(cursor, table, indexes, fulltext=False):
+    """
+    테이블에 없는 인덱스만 추가합니다.
+
+    Args:
+        table: 테이블 이름
+        indexes: {인덱스 이름: (컬럼, ...)}
+        fulltext: True 이면 ngram 파서 FULLTEXT 인덱스로 추가 (한글 부분 일치 검색용)
+
+    Returns:
+        list: 새로 추가한 인덱스 이름
+    """
+    cursor.execute("""
+        SELECT DISTINCT INDEX_NAME AS index_name
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    existing = {row["index_name"] for row in cursor.fetchall()}
+
+    created = []
+    for name, columns in indexes.items():
+        if name in existing:
+            continue
+        if fulltext:
+            cursor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {name} ({', '.join(columns)}) WITH PARSER ngram")
+        else:
+            cursor.execute(f"ALTER TABLE {table} ADD INDEX {name} ({', '.join(columns)})")
+        created.append(name)
+    return created
+
+
 @app.route("/api/init_user_table")
 def init_user_table():
-    conn = get_connection()
-    cursor = conn.cursor()
+    with db_connection() as conn:
+        cursor = conn.cursor()
 
-    sql = """
-    CREATE TABLE IF NOT EXISTS users (
-        user_id INT AUTO_INCREMENT PRIMARY KEY,
-        name VARCHAR(100) NOT NULL,
-        favorite_music VARCHAR(50),
-        password VARCHAR(200) NOT NULL,
-        join_date DATE,
-        modify_date DATE,
-        grade CHAR(2) NOT NULL
-    )
-    """
+        sql = """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            favorite_music VARCHAR(50),
+            password VARCHAR(200) NOT NULL,
+            join_date DATE,
+            modify_date DATE,
+            grade CHAR(2) NOT NULL
+        )
+        """
 
-    cursor.execute(sql)
-    conn.commit()
-    cursor.close()
-    conn.close()
+        cursor.execute(sql)
+        conn.commit()
 
-    # selected_achievement_id 컬럼 추가 (이미 있으면 무시)
-    try:
-        cursor.execute("ALTER TABLE users ADD COLUMN selected_achievement_id INT")
-    except Exception:
-        pass  # 컬럼이 이미 존재하는 경우 무시
-    
-    # 외래키 제약조건 추가 (achievements 테이블이 존재하는 경우에만)
-    try:
-        cursor.execute("""
-            ALTER TABLE users 
-            ADD CONSTRAINT fk_users_selected_achievement 
-            FOREIGN KEY (selected_achievement_id) 
-            REFERENCES achievements(achievement_id) 
-            ON DELETE SET NULL
-        """)
-    except Exception:
-        pass  # 제약조건이 이미 존재하거나 achievements 테이블이 없는 경우 무시
-    
-    conn.commit()
-    cursor.close()
-    conn.close()
+        # selected_achievement_id 컬럼 추가 (이미 있으면 무시)
+        try:
+            cursor.execute("ALTER TABLE users ADD COLUMN selected_achievement_id INT")
+        except Exception:
+            pass  # 컬럼이 이미 존재하는 경우 무시
+
+        # 외래키 제약조건 추가 (achievements 테이블이 존재하는 경우에만)
+        try:
+            cursor.execute("""
+                ALTER TABLE users 
+                ADD CONSTRAINT fk_users_selected_achievement 
+                FOREIGN KEY (selected_achievement_id) 
+                REFERENCES achievements(achievement_id) 
+                ON DELETE SET NULL
+            """)
+        except Exception:
+            pass  # 제약조건이 이미 존재하거나 achievements 테이블이 없는 경우 무시
+
+        created_indexes = ensure_indexes(cursor, "users", USERS_INDEXES)
+        # 불용어가 켜져 있으면 ngram 인덱스가 LIKE 와 다른 결과를 내므로 만들지 않음 (LIKE 검색 유지)
+        fulltext_search = fulltext_stopwords_disabled(cursor)
+        if fulltext_search:
+            created_indexes += ensure_indexes(cursor, "users", USERS_FULLTEXT_INDEXES, fulltext=True)
+
+        conn.commit()
+        _USERS_FULLTEXT["ready"] = None
+        fulltext_search = users_fulltext_ready(cursor)
+        cursor.close()
 
-    return jsonify({"message": "User table created"})
+    return jsonify({
+        "message": "User table created",
+        "created_indexes": created_indexes,
+        "fulltext_search": fulltext_search,
+    })
 
 
 # -------------------------------------------------------------
@@ -118,11 +195,55 @@ def init_user_prediction_table():
     """
 
     cursor.execute(sql)
+    created_indexes = ensure_indexes(cursor, "user_prediction", USER_PREDICTION_INDEXES)
     conn.commit()
     cursor.close()
     conn.close()
 
-    return jsonify({"message": "user_prediction table created"})
+    return jsonify({"message": "user_prediction table created", "created_indexes": created_indexes})
+
+
+# user_prediction INSERT OR UPDATE (user_id 기준 1행 유지)
+# - VALUES 절이 전부 %s 여야 pymysql executemany 가 다건 INSERT 한 문장으로 묶어 보냅니다.
+#   (CURDATE() 를 넣으면 행마다 왕복) → update_date 는 파라미터로 전달
+USER_PREDICTION_UPSERT_SQL = """
+INSERT INTO user_prediction (user_id, churn_rate, risk_score, update_date)
+VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    churn_rate = VALUES(churn_rate),
+    risk_score = VALUES(risk_score),
+    update_date = VALUES(update_date)
+"""
+
+
+def upsert_user_predictions(cursor, rows):
+    """
+    (user_id, churn_rate, risk_score) 리스트를 user_prediction 에 한 번에 저장합니다.
+
+    - update_date 는 오늘 날짜로 채웁니다.
+    - commit 은 호출 측에서 합니다.
+
+    Returns:
+        저장 요청한 행 수
+    """
+    if not rows:
+        return 0
+    today = pd.Timestamp.now().date()
+    cursor.executemany(
+        USER_PREDICTION_UPSERT_SQL,
+        [(user_id, churn_rate, risk_score, today) for user_id, churn_rate, risk_score in rows],
+    )
+    return len(rows)
+
+
+# /api/prediction_summary 집계 캐시
+# - user_prediction 을 쓰는 곳에서 commit 후 invalidate_prediction_summary() 호출
+#   (commit 전에 무효화하면 그 사이 다시 읽은 이전 값이 캐시될 수 있음)
+_PREDICTION_SUMMARY_CACHE = TTLCache(ttl_seconds=float(os.getenv("PREDICTION_SUMMARY_TTL", 300)), maxsize=1)
+
+
+def invalidate_prediction_summary():
+    _PREDICTION_SUMMARY_CACHE.clear()
 
 
 # -------------------------------------------------------------
@@ -207,11 +328,12 @@ def init_log_table():
         """
 
         cursor.execute(sql)
+        created_indexes = ensure_indexes(cursor, "log", LOG_INDEXES)
         conn.commit()
         cursor.close()
         conn.close()
 
-        return jsonify({"success": True, "message": "log table created"})
+        return jsonify({"success": True, "message": "log table created", "created_indexes": created_indexes})
     except Exception as e:
         return jsonify({"success": False, "error": f"테이블 생성 중 오류: {str(e)}"}), 500
 
@@ -304,11 +426,12 @@ def init_user_achievements_table():
         """
 
         cursor.execute(sql)
+        created_indexes = ensure_indexes(cursor, "user_achievements", USER_ACHIEVEMENTS_INDEXES)
         conn.commit()
         cursor.close()
         conn.close()
 
-        return jsonify({"success": True, "message": "user_achievements table created"})
+        return jsonify({"success": True, "message": "user_achievements table created", "created_indexes": created_indexes})
     except Exception as e:
         return jsonify({"success": False, "error": f"테이블 생성 중 오류: {str(e)}"}), 500
 
@@ -329,6 +452,9 @@ def init_music_playback_log_table():
     - genre: 장르 (선택적)
     - playback_duration: 재생 시간 (초)
     - created_at: 재생 시간
+
+    재생 횟수 집계 테이블(user_genre_play_counts / user_track_play_counts)도 함께 생성합니다.
+    (로그보다 늦게 만들면 그 사이 기록된 재생이 집계에서 빠짐)
     """
     try:
         conn = get_connection()
@@ -355,13 +481,96 @@ def init_music_playback_log_table():
         """
 
         cursor.execute(sql)
+        _create_play_count_tables(cursor)
         conn.commit()
         cursor.close()
         conn.close()
 
+        _PLAY_COUNT_TABLES["ready"] = True
         return jsonify({"success": True, "message": "music_playback_log table created"})
     except Exception as e:
         return jsonify({"success": False, "error": f"테이블 생성 중 오류: {str(e)}"}), 500
+
+
+def _create_play_count_tables(cursor):
+    """재생 횟수 집계 테이블 생성 + 현재 재생 로그로 재집계 → (장르 행 수, 트랙 행 수). (commit 은 호출 측)"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS user_genre_play_counts (
+        user_id INT NOT NULL,
+        genre_key VARCHAR(100) NOT NULL,
+        play_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, genre_key),
+        INDEX idx_genre_key (genre_key),
+        FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS user_track_play_counts (
+        user_id INT NOT NULL,
+        track_uri VARCHAR(200) NOT NULL,
+        play_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, track_uri),
+        INDEX idx_track_uri (track_uri),
+        FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+    )
+    """)
+
+    # 기존 로그로 채우기 (재호출 시 재집계)
+    cursor.execute("""
+    INSERT INTO user_genre_play_counts (user_id, genre_key, play_count)
+    SELECT user_id, LOWER(genre), COUNT(*)
+    FROM music_playback_log
+    WHERE genre IS NOT NULL AND genre != ''
+    GROUP BY user_id, LOWER(genre)
+    ON DUPLICATE KEY UPDATE play_count = VALUES(play_count)
+    """)
+    genre_rows = cursor.rowcount
+    cursor.execute("""
+    INSERT INTO user_track_play_counts (user_id, track_uri, play_count)
+    SELECT user_id, track_uri, COUNT(*)
+    FROM music_playback_log
+    GROUP BY user_id, track_uri
+    ON DUPLICATE KEY UPDATE play_count = VALUES(play_count)
+    """)
+    track_rows = cursor.rowcount
+    return genre_rows, track_rows
+
+
+# -------------------------------------------------------------
+# 0-3-4) 재생 횟수 집계 테이블 생성 (유저별 장르/트랙 재생 횟수)
+# -------------------------------------------------------------
+@app.route("/api/init_play_count_tables")
+def init_play_count_tables():
+    """
+    music_playback_log 를 유저별로 미리 집계해 두는 테이블을 생성하고, 기존 로그로 채웁니다.
+
+    - user_genre_play_counts: (user_id, genre_key=소문자 장르) → play_count
+    - user_track_play_counts: (user_id, track_uri) → play_count
+
+    재생 로그를 기록할 때마다 함께 증가시키며,
+    새 도전과제 생성 시 전체 로그를 GROUP BY 하는 대신 이 테이블을 조회합니다.
+    (다시 호출하면 현재 로그 기준으로 재집계)
+    """
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            genre_rows, track_rows = _create_play_count_tables(cursor)
+
+            conn.commit()
+            cursor.close()
+
+        _PLAY_COUNT_TABLES["ready"] = True
+        return jsonify({
+            "success": True,
+            "message": "play count tables created",
+            "genre_rows": genre_rows,
+            "track_rows": track_rows
+        })
+    except Exception as e:
+        return jsonify({"success": False, "error": f"테이블 생성 중 오류: {str(e)}"}), 500
+
+
 # -------------------------------------------------------------
 # 0-4) 로그 기록 API
 # -------------------------------------------------------------
@@ -407,26 +616,111 @@ def create_log():
         return jsonify({"success": False, "error": f"로그 기록 중 오류: {str(e)}"}), 500
 
 
+# -------------------------------------------------------------
+# 목록 API 공통 (keyset 페이지네이션 + 전체 개수 모드)
+# -------------------------------------------------------------
+# count 파라미터
+# - exact : 매 요청 COUNT(*) (기본값)
+# - cached: 같은 조건의 COUNT(*) 결과를 LIST_COUNT_TTL 초 동안 재사용
+# - approx: 조건이 없으면 테이블 통계(information_schema.TABLES.TABLE_ROWS) 추정치, 조건이 있으면 cached
+# - none  : 개수 조회 생략 (total_rows / total_pages = null)
+COUNT_MODES = ("exact", "cached", "approx", "none")
+
+_LIST_COUNT_CACHE = TTLCache(ttl_seconds=float(os.getenv("LIST_COUNT_TTL", 60)), maxsize=256)
+
+
+def parse_list_params(default_page_size, cursor_keys, max_page_size=500):
+    """
+    목록 API 공통 쿼리 파라미터를 읽습니다.
+
+    - cursor   : 이전 응답의 next_cursor (있으면 keyset 조회)
+    - page     : cursor 없이 2 이상이면 기존 OFFSET 조회 (호환용), cursor 와 함께 오면 표시용으로만 사용
+    - page_size: 페이지 크기
+    - count    : COUNT_MODES 중 하나
+
+    Raises:
+        ValueError: 잘못된 cursor / count 값
+    """
+    page_size = parse_limit(request.args.get("page_size"), default=default_page_size, maximum=max_page_size)
+    try:
+        page = max(1, int(request.args.get("page", 1)))
+    except ValueError:
+        page = 1
+    count_mode = request.args.get("count", "exact").strip().lower()
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"count 는 {', '.join(COUNT_MODES)} 중 하나여야 합니다.")
+    cursor_values = decode_cursor(request.args.get("cursor"), required=cursor_keys)
+    return page, page_size, cursor_values, count_mode
+
+
+def resolve_total_count(cursor, count_mode, count_sql, params, approx_table=None):
+    """
+    count_mode 에 따라 전체 개수를 구합니다. (none 이면 None)
+
+    Args:
+        count_sql: "SELECT COUNT(*) AS cnt ..." 쿼리
+        approx_table: 조건 없는 조회일 때만 넘김 (approx 모드에서 테이블 통계 사용)
+    """
+    if count_mode == "none":
+        return None
+
+    def load():
+        cursor.execute(count_sql, tuple(params))
+        return int(cursor.fetchone()["cnt"])
+
+    if count_mode == "approx" and approx_table:
+        cursor.execute("""
+            SELECT TABLE_ROWS AS cnt
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (approx_table,))
+        row = cursor.fetchone()
+        if row and row["cnt"] is not None:
+            return int(row["cnt"])
+
+    if count_mode in ("cached", "approx"):
+        return _LIST_COUNT_CACHE.get_or_load((count_sql, tuple(params)), load)
+    return load()
+
+
+def list_page_response(rows, page, page_size, total_rows, count_mode, next_cursor, **extra):
+    """목록 API 공통 응답 (기존 page/total_pages 필드 + next_cursor, extra 는 그대로 추가)"""
+    return jsonify({
+        **extra,
+        "success": True,
+        "page": page,
+        "page_size": page_size,
+        "total_rows": total_rows,
+        "total_pages": (total_rows + page_size - 1) // page_size if total_rows is not None else None,
+        "count_mode": count_mode,
+        "next_cursor": next_cursor,
+        "rows": rows
+    })
+
+
 # -------------------------------------------------------------
 # 0-5) 로그 조회 API
 # -------------------------------------------------------------
 @app.route("/api/logs", methods=["GET"])
 def get_logs():
     """
-    로그를 조회합니다.
+    로그를 조회합니다. (최신순, created_at DESC + log_id DESC)
     
     Query Parameters:
     - user_id: 특정 사용자의 로그만 조회 (선택적)
     - action_type: 특정 액션 타입만 조회 (선택적)
-    - page: 페이지 번호 (기본값: 1)
+    - cursor: 이전 응답의 next_cursor (다음 페이지, keyset)
+    - page: 페이지 번호 (기본값: 1, cursor 없이 2 이상이면 OFFSET 조회)
     - page_size: 페이지 크기 (기본값: 50)
+    - count: exact | cached | approx | none (기본값: exact)
     """
     try:
         user_id = request.args.get("user_id", "").strip()
         action_type = request.args.get("action_type", "").strip()
-        page = int(request.args.get("page", 1))
-        page_size = int(request.args.get("page_size", 50))
-        offset = (page - 1) * page_size
+        try:
+            page, page_size, cursor_values, count_mode = parse_list_params(50, ("created_at", "log_id"))
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
         
         conn = get_connection()
         cursor = conn.cursor(DictCursor)
@@ -453,34 +747,41 @@ def get_logs():
         FROM log l
         {where_clause}
         """
-        cursor.execute(count_sql, tuple(params))
-        total_rows = cursor.fetchone()["cnt"]
+        total_rows = resolve_total_count(
+            cursor, count_mode, count_sql, params, approx_table=None if conditions else "log"
+        )
         
-        # 페이징된 데이터 조회
+        # 페이지 데이터 조회 (limit + 1 건 → 다음 페이지 여부)
+        page_conditions = list(conditions)
+        page_params = list(params)
+        offset_clause = ""
+        if cursor_values:
+            page_conditions.append("(l.created_at < %s OR (l.created_at = %s AND l.log_id < %s))")
+            page_params.extend([cursor_values["created_at"], cursor_values["created_at"], cursor_values["log_id"]])
+        elif page > 1:
+            offset_clause = f"OFFSET {(page - 1) * page_size}"
+        page_where = ("WHERE " + " AND ".join(page_conditions)) if page_conditions else ""
+
         query_sql = f"""
         SELECT l.log_id, l.user_id, u.name AS user_name, l.action_type, 
                l.page_name, l.additional_info, l.created_at
         FROM log l
         LEFT JOIN users u ON l.user_id = u.user_id
-        {where_clause}
-        ORDER BY l.created_at DESC
-        LIMIT %s OFFSET %s
+        {page_where}
+        ORDER BY l.created_at DESC, l.log_id DESC
+        LIMIT %s {offset_clause}
         """
         
-        cursor.execute(query_sql, tuple(params) + (page_size, offset))
-        rows = cursor.fetchall()
+        cursor.execute(query_sql, tuple(page_params) + (page_size + 1,))
+        rows, next_cursor = split_page(
+            cursor.fetchall(), page_size,
+            lambda row: {"created_at": row["created_at"], "log_id": row["log_id"]}
+        )
         
         cursor.close()
         conn.close()
         
-        return jsonify({
-            "success": True,
-            "page": page,
-            "page_size": page_size,
-            "total_rows": total_rows,
-            "total_pages": (total_rows + page_size - 1) // page_size,
-            "rows": rows
-        })
+        return list_page_response(rows, page, page_size, total_rows, count_mode, next_cursor)
         
     except Exception as e:
         return jsonify({"success": False, "error": f"로그 조회 중 오류: {str(e)}"}), 500
@@ -494,8 +795,8 @@ def import_users_from_csv():
     csv_path = os.path.join("data", "user_data.csv")
 
     try:
-        load_users_from_csv(csv_path)
-        return jsonify({"message": "CSV imported to DB"})
+        summary = load_users_from_csv(csv_path) or {}
+        return jsonify({"message": "CSV imported to DB", **summary})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -503,6 +804,94 @@ def import_users_from_csv():
 # -------------------------------------------------------------
 # 1-1) user_features CSV 데이터 삽입
 # -------------------------------------------------------------
+# user_features 테이블 컬럼 순서와 타입 (init_user_features_table 과 동일하게 유지)
+USER_FEATURE_COLUMNS = [
+    ("user_id", "int"),
+    ("gender", "str"),
+    ("age", "int"),
+    ("country", "str"),
+    ("subscription_type", "str"),
+    ("listening_time", "float"),
+    ("songs_played_per_day", "float"),
+    ("skip_rate", "float"),
+    ("device_type", "str"),
+    ("ads_listened_per_week", "int"),
+    ("offline_listening", "int"),
+    ("is_churned", "int"),
+    ("listening_time_trend_7d", "float"),
+    ("login_frequency_30d", "int"),
+    ("days_since_last_login", "int"),
+    ("skip_rate_increase_7d", "float"),
+    ("freq_of_use_trend_14d", "float"),
+    ("customer_support_contact", "int"),
+    ("payment_failure_count", "int"),
+    ("promotional_email_click", "int"),
+    ("app_crash_count_30d", "int"),
+]
+
+USER_FEATURES_UPSERT_SQL = (
+    "INSERT INTO user_features ("
+    + ", ".join(col for col, _ in USER_FEATURE_COLUMNS)
+    + ") VALUES ("
+    + ", ".join(["%s"] * len(USER_FEATURE_COLUMNS))
+    + ") ON DUPLICATE KEY UPDATE "
+    + ", ".join(f"{col} = VALUES({col})" for col, _ in USER_FEATURE_COLUMNS[1:])
+)
+
+
+def coerce_user_features_frame(df):
+    """
+    DataFrame 을 user_features 테이블 타입에 맞게 컬럼 단위로 한 번에 변환합니다.
+
+    - int/float 컬럼: 숫자로 변환 (int 는 소수점 버림), 결측은 None
+    - str 컬럼: 문자열로 변환, 결측은 None
+    - CSV 에 없는 컬럼은 전부 None
+    - user_id 가 없거나, 숫자 컬럼에 숫자로 바꿀 수 없는 값(inf 포함)이 있는 행은 제외
+
+    Returns:
+        (INSERT 파라미터 튜플 리스트, 제외된 행 수, 오류 메시지 리스트(최대 5개))
+    """
+    n = len(df)
+    bad = np.zeros(n, dtype=bool)
+    error_messages = []
+    columns = []
+
+    for col, kind in USER_FEATURE_COLUMNS:
+        values = np.full(n, None, dtype=object)
+        if col not in df.columns:
+            columns.append(values)
+            continue
+
+        raw = df[col]
+        present = raw.notna().to_numpy()
+
+        if kind == "str":
+            values[present] = raw[present].astype(str).tolist()
+        else:
+            if pd.api.types.is_bool_dtype(raw):
+                numeric = raw.astype(float).to_numpy()
+            else:
+                numeric = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            ok = np.isfinite(numeric)
+            invalid = present & ~ok
+            for i in np.flatnonzero(invalid & ~bad)[: max(0, 5 - len(error_messages))]:
+                error_messages.append(f"행 {i + 1}: '{col}' 값을 숫자로 변환할 수 없습니다: {raw.iloc[i]!r}")
+            bad |= invalid
+            if kind == "int":
+                values[ok] = np.trunc(numeric[ok]).astype(np.int64).tolist()
+            else:
+                values[ok] = numeric[ok].tolist()
+
+        columns.append(values)
+
+    # user_id 는 필수
+    bad |= np.array([v is None for v in columns[0]], dtype=bool)
+
+    keep = np.flatnonzero(~bad)
+    rows = list(zip(*(column[keep] for column in columns))) if len(keep) else []
+    return rows, int(bad.sum()), error_messages
+
+
 @app.route("/api/import_user_features_from_csv", methods=["POST"])
 def import_user_features_from_csv():
     """
@@ -512,9 +901,17 @@ def import_user_features_from_csv():
     1. 파일 업로드: multipart/form-data로 CSV 파일 전송
     2. JSON 데이터: request.json에 rows 배열로 데이터 전송
     3. 기본 경로: 파일이 없으면 data/processed/enhanced_data_not_clean_FE_delete.csv 사용
+
+    저장 방식:
+    - 행 단위 변환 대신 coerce_user_features_frame() 으로 컬럼 단위 일괄 변환
+    - chunk_size 행씩 executemany(다건 INSERT) 후 청크마다 commit
+      (form/query/JSON 의 chunk_size, 기본 2000, 100 ~ 50000)
+    - 청크 저장이 실패하면(예: users 에 없는 user_id 로 FK 오류) 그 청크만 행 단위로 다시 저장
+    - 처리 속도(rows_per_sec)를 함께 반환
     """
     try:
         df = None
+        payload = None
         
         # 1. 파일 업로드 방식 확인
         if 'file' in request.files:
@@ -543,94 +940,54 @@ def import_user_features_from_csv():
         missing_columns = [col for col in required_columns if col not in df.columns]
         if missing_columns:
             return jsonify({"success": False, "error": f"필수 컬럼이 없습니다: {', '.join(missing_columns)}"}), 400
-        
-        # NaN 값을 None으로 변환
-        df = df.where(pd.notnull(df), None)
-        
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # INSERT OR UPDATE (ON DUPLICATE KEY UPDATE)
-        sql = """
-        INSERT INTO user_features (
-            user_id, gender, age, country, subscription_type, listening_time,
-            songs_played_per_day, skip_rate, device_type, ads_listened_per_week,
-            offline_listening, is_churned, listening_time_trend_7d, login_frequency_30d,
-            days_since_last_login, skip_rate_increase_7d, freq_of_use_trend_14d,
-            customer_support_contact, payment_failure_count, promotional_email_click,
-            app_crash_count_30d
-        ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-        )
-        ON DUPLICATE KEY UPDATE
-            gender = VALUES(gender),
-            age = VALUES(age),
-            country = VALUES(country),
-            subscription_type = VALUES(subscription_type),
-            listening_time = VALUES(listening_time),
-            songs_played_per_day = VALUES(songs_played_per_day),
-            skip_rate = VALUES(skip_rate),
-            device_type = VALUES(device_type),
-            ads_listened_per_week = VALUES(ads_listened_per_week),
-            offline_listening = VALUES(offline_listening),
-            is_churned = VALUES(is_churned),
-            listening_time_trend_7d = VALUES(listening_time_trend_7d),
-            login_frequency_30d = VALUES(login_frequency_30d),
-            days_since_last_login = VALUES(days_since_last_login),
-            skip_rate_increase_7d = VALUES(skip_rate_increase_7d),
-            freq_of_use_trend_14d = VALUES(freq_of_use_trend_14d),
-            customer_support_contact = VALUES(customer_support_contact),
-            payment_failure_count = VALUES(payment_failure_count),
-            promotional_email_click = VALUES(promotional_email_click),
-            app_crash_count_30d = VALUES(app_crash_count_30d)
-        """
-        
+
+        raw_chunk_size = request.form.get("chunk_size", request.args.get("chunk_size"))
+        if raw_chunk_size is None and isinstance(payload, dict):
+            raw_chunk_size = payload.get("chunk_size")
+        try:
+            chunk_size = int(raw_chunk_size) if raw_chunk_size is not None else 2000
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "chunk_size 는 정수여야 합니다."}), 400
+        chunk_size = max(100, min(chunk_size, 50000))
+
+        started = pd.Timestamp.now()
+
+        # 컬럼 단위 타입 변환
+        rows, error_count, error_messages = coerce_user_features_frame(df)
+
         inserted_count = 0
-        error_count = 0
-        error_messages = []
-        
-        for idx, row in df.iterrows():
-            try:
-                # user_id는 필수
-                user_id = int(row['user_id']) if pd.notna(row['user_id']) else None
-                if user_id is None:
-                    error_count += 1
+        chunks = 0
+
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                chunks += 1
+                try:
+                    cursor.executemany(USER_FEATURES_UPSERT_SQL, chunk)
+                    conn.commit()
+                    inserted_count += len(chunk)
                     continue
-                
-                values = (
-                    user_id,
-                    str(row['gender']) if pd.notna(row.get('gender')) else None,
-                    int(row['age']) if pd.notna(row.get('age')) else None,
-                    str(row['country']) if pd.notna(row.get('country')) else None,
-                    str(row['subscription_type']) if pd.notna(row.get('subscription_type')) else None,
-                    float(row['listening_time']) if pd.notna(row.get('listening_time')) else None,
-                    float(row['songs_played_per_day']) if pd.notna(row.get('songs_played_per_day')) else None,
-                    float(row['skip_rate']) if pd.notna(row.get('skip_rate')) else None,
-                    str(row['device_type']) if pd.notna(row.get('device_type')) else None,
-                    int(row['ads_listened_per_week']) if pd.notna(row.get('ads_listened_per_week')) else None,
-                    int(row['offline_listening']) if pd.notna(row.get('offline_listening')) else None,
-                    int(row['is_churned']) if pd.notna(row.get('is_churned')) else None,
-                    float(row['listening_time_trend_7d']) if pd.notna(row.get('listening_time_trend_7d')) else None,
-                    int(row['login_frequency_30d']) if pd.notna(row.get('login_frequency_30d')) else None,
-                    int(row['days_since_last_login']) if pd.notna(row.get('days_since_last_login')) else None,
-                    float(row['skip_rate_increase_7d']) if pd.notna(row.get('skip_rate_increase_7d')) else None,
-                    float(row['freq_of_use_trend_14d']) if pd.notna(row.get('freq_of_use_trend_14d')) else None,
-                    int(row['customer_support_contact']) if pd.notna(row.get('customer_support_contact')) else None,
-                    int(row['payment_failure_count']) if pd.notna(row.get('payment_failure_count')) else None,
-                    int(row['promotional_email_click']) if pd.notna(row.get('promotional_email_click')) else None,
-                    int(row['app_crash_count_30d']) if pd.notna(row.get('app_crash_count_30d')) else None,
-                )
-                cursor.execute(sql, values)
-                inserted_count += 1
-            except Exception as e:
-                error_count += 1
-                if len(error_messages) < 5:  # 최대 5개까지만 저장
-                    error_messages.append(f"행 {idx+1}: {str(e)}")
-                continue
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
+                except Exception:
+                    conn.rollback()
+
+                # 청크 저장 실패 → 행 단위로 다시 저장해 문제 행만 제외
+                for offset, values in enumerate(chunk):
+                    try:
+                        cursor.execute(USER_FEATURES_UPSERT_SQL, values)
+                        inserted_count += 1
+                    except Exception as e:
+                        error_count += 1
+                        if len(error_messages) < 5:  # 최대 5개까지만 저장
+                            error_messages.append(f"user_id {values[0]} (청크 {chunks}, {offset + 1}번째): {str(e)}")
+                conn.commit()
+
+            cursor.close()
+
+        elapsed = (pd.Timestamp.now() - started).total_seconds()
+        rows_per_sec = round(inserted_count / elapsed, 1) if elapsed > 0 else None
+        print(f"[user_features import] {inserted_count}개 행, {chunks}개 청크, {elapsed:.2f}s ({rows_per_sec} rows/s)")
         
         result_message = f"CSV 데이터 import 완료: {inserted_count}개 행 처리됨"
         if error_count > 0:
@@ -641,7 +998,11 @@ def import_user_features_from_csv():
             "message": result_message,
             "inserted_count": inserted_count,
             "error_count": error_count,
-            "errors": error_messages if error_messages else None
+            "errors": error_messages if error_messages else None,
+            "chunk_size": chunk_size,
+            "chunks": chunks,
+            "elapsed_sec": round(elapsed, 3),
+            "rows_per_sec": rows_per_sec,
         })
         
     except Exception as e:
@@ -657,14 +1018,11 @@ def import_user_features_from_csv():
 # -------------------------------------------------------------
 @app.route("/api/users", methods=["GET"])
 def get_all_users():
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT * FROM users")
-    rows = cursor.fetchall()
-
-    cursor.close()
-    conn.close()
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM users")
+        rows = cursor.fetchall()
+        cursor.close()
 
     return jsonify(rows)
 
@@ -673,14 +1031,11 @@ def get_all_users():
 # -------------------------------------------------------------
 @app.route("/api/users/<int:user_id>", methods=["GET"])
 def get_user(user_id):
-    conn = get_connection()
-    cursor = conn.cursor(DictCursor)
-
-    cursor.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
-    row = cursor.fetchone()
-
-    cursor.close()
-    conn.close()
+    with db_connection() as conn:
+        cursor = conn.cursor(DictCursor)
+        cursor.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
+        row = cursor.fetchone()
+        cursor.close()
 
     if not row:
         return jsonify({"error": "User not found"}), 404
@@ -692,39 +1047,47 @@ def get_user(user_id):
 # -------------------------------------------------------------
 @app.route("/api/users_paged", methods=["GET"])
 def get_users_paged():
+    """
+    사용자 목록 페이지 조회 (user_id 오름차순)
+
+    Query Parameters:
+    - cursor / page / page_size(기본 20) / count : `/api/logs` 와 동일
+    """
     try:
-        page = int(request.args.get("page", 1))
-        page_size = int(request.args.get("page_size", 20))
-        offset = (page - 1) * page_size
+        try:
+            page, page_size, cursor_values, count_mode = parse_list_params(20, ("user_id",))
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
 
         conn = get_connection()
         cursor = conn.cursor(DictCursor)
 
         # 전체 개수 조회
-        cursor.execute("SELECT COUNT(*) AS cnt FROM users")
-        total_rows = cursor.fetchone()["cnt"]
+        total_rows = resolve_total_count(
+            cursor, count_mode, "SELECT COUNT(*) AS cnt FROM users", [], approx_table="users"
+        )
 
         # 페이징 데이터 조회
-        cursor.execute("""
+        if cursor_values:
+            where_clause, params, offset_clause = "WHERE user_id > %s", [cursor_values["user_id"]], ""
+        else:
+            where_clause, params = "", []
+            offset_clause = f"OFFSET {(page - 1) * page_size}" if page > 1 else ""
+
+        cursor.execute(f"""
             SELECT user_id, name, favorite_music, grade, join_date
             FROM users
+            {where_clause}
             ORDER BY user_id ASC
-            LIMIT %s OFFSET %s
-        """, (page_size, offset))
+            LIMIT %s {offset_clause}
+        """, (*params, page_size + 1))
 
-        rows = cursor.fetchall()
+        rows, next_cursor = split_page(cursor.fetchall(), page_size, lambda row: {"user_id": row["user_id"]})
 
         cursor.close()
         conn.close()
 
-        return jsonify({
-            "success": True,
-            "page": page,
-            "page_size": page_size,
-            "total_rows": total_rows,
-            "total_pages": (total_rows + page_size - 1) // page_size,
-            "rows": rows
-        })
+        return list_page_response(rows, page, page_size, total_rows, count_mode, next_cursor)
 
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
@@ -732,8 +1095,96 @@ def get_users_paged():
 # -------------------------------------------------------------
 # USER 조건 검색
 # -------------------------------------------------------------  
+# users FULLTEXT(ngram) 검색 사용 가능 여부 (None: 아직 모름, /api/init_user_table 호출 시 다시 확인)
+_USERS_FULLTEXT = {"ready": None}
+
+# innodb_ft_*_stopword_table 값 형식: db_name/table_name
+_STOPWORD_TABLE_PATTERN = re.compile(r"^(\w+)/(\w+)$")
+
+# FULLTEXT 로 찾는 검색어 (문자/숫자만) - 공백/기호가 있으면 ngram 구문 검색과 LIKE 결과가 달라질 수 있음
+_FULLTEXT_TERM_PATTERN = re.compile(r"[^\W_]+")
+
+# ngram 토큰 길이 (MySQL ngram_token_size 기본값 2), 이보다 짧은 검색어는 FULLTEXT 로 찾을 수 없음
+NGRAM_TOKEN_SIZE = int(os.getenv("NGRAM_TOKEN_SIZE", 2))
+
+
+def fulltext_stopwords_disabled(cursor):
+    """
+    FULLTEXT 색인/검색에 불용어(stopword)가 적용되지 않는지 확인합니다.
+
+    ngram 파서는 불용어를 '포함한' 토큰을 모두 버리고, InnoDB 기본 불용어 목록에는 a, i 등이 있어
+    "Liam" 의 li/ia/am 같은 토큰이 색인되지 않습니다. (LIKE 로는 찾히는 행이 MATCH 로는 안 찾힘)
+    - innodb_ft_enable_stopword = OFF → True
+    - 사용자/서버 불용어 테이블이 지정되어 있고 비어 있음 → True
+    - 그 외 (기본 불용어 목록 사용) → False
+    """
+    cursor.execute("""
+        SELECT @@innodb_ft_enable_stopword AS enabled,
+               @@innodb_ft_user_stopword_table AS user_table,
+               @@innodb_ft_server_stopword_table AS server_table
+    """)
+    row = cursor.fetchone()
+    if not int(row["enabled"]):
+        return True
+    match = _STOPWORD_TABLE_PATTERN.match(row["user_table"] or row["server_table"] or "")
+    if not match:
+        return False
+    cursor.execute(f"SELECT COUNT(*) AS cnt FROM `{match.group(1)}`.`{match.group(2)}`")
+    return cursor.fetchone()["cnt"] == 0
+
+
+def users_fulltext_ready(cursor):
+    """
+    users 의 FULLTEXT 인덱스가 모두 있고 불용어가 꺼져 있는지 (처음 한 번만 DB 확인)
+
+    불용어 설정을 바꾼 뒤에는 기존 FULLTEXT 인덱스를 DROP 하고 /api/init_user_table 로 다시 만들어야 합니다.
+    (인덱스는 만들 때의 불용어 설정으로 색인됨)
+    """
+    if _USERS_FULLTEXT["ready"] is None:
+        cursor.execute("""
+            SELECT DISTINCT INDEX_NAME AS index_name
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'users' AND INDEX_TYPE = 'FULLTEXT'
+        """)
+        existing = {row["index_name"] for row in cursor.fetchall()}
+        _USERS_FULLTEXT["ready"] = set(USERS_FULLTEXT_INDEXES) <= existing and fulltext_stopwords_disabled(cursor)
+    return _USERS_FULLTEXT["ready"]
+
+
+def text_search_condition(column, term, use_fulltext):
+    """
+    부분 일치 검색 조건을 만듭니다.
+
+    - FULLTEXT 사용 가능(users_fulltext_ready) + 검색어가 문자/숫자로만 되어 있고 ngram 토큰 길이 이상
+      → MATCH ... AGAINST (구문 검색)
+      불용어가 꺼진 ngram 인덱스의 구문 검색은 연속된 n-gram 을 모두 찾으므로 LIKE '%검색어%' 와 같은 부분 일치가 됨
+      (불용어가 켜져 있으면 일부 n-gram 이 색인되지 않아 결과가 다르므로 users_fulltext_ready 가 False)
+    - 그 외 → 기존 LIKE '%검색어%'
+
+    Returns:
+        (조건 SQL, 파라미터 리스트, 관련도 SQL or None)
+    """
+    if use_fulltext and len(term) >= NGRAM_TOKEN_SIZE and _FULLTEXT_TERM_PATTERN.fullmatch(term):
+        match_sql = f"MATCH({column}) AGAINST (%s IN BOOLEAN MODE)"
+        return match_sql, [f'"{term}"'], match_sql
+    return f"{column} LIKE %s", [f"%{term}%"], None
+
+
+# users_search 관련도 점수 정수화 배율 (소수점 6자리까지 구분)
+RELEVANCE_SCALE = 1000000
+
+
 @app.route("/api/users_search", methods=["GET"])
 def users_search():
+    """
+    사용자 조건 검색
+
+    - name / favorite_music 은 FULLTEXT(ngram) 인덱스로 부분 일치 검색
+      (인덱스가 없거나, 불용어가 켜져 있거나, 검색어가 짧거나 공백/기호가 있으면 LIKE 로 대체)
+    - sort: relevance (FULLTEXT 검색 시 기본값, 관련도 높은 순) | user_id (그 외 기본값)
+      relevance 는 MATCH 점수 × RELEVANCE_SCALE 를 반올림한 정수 (커서에도 같은 값)
+    - cursor / page / page_size / count : `/api/logs` 와 동일
+    """
     try:
         # 검색 파라미터
         name = request.args.get("name", "").strip()
@@ -742,10 +1193,9 @@ def users_search():
         grade = request.args.get("grade", "").strip()
         risk_score = request.args.get("risk_score", "").strip()
 
-        # 페이징 파라미터
-        page = int(request.args.get("page", 1))
-        page_size = int(request.args.get("page_size", 20))
-        offset = (page - 1) * page_size
+        sort = request.args.get("sort", "").strip().lower()
+        if sort not in ("", "relevance", "user_id"):
+            return jsonify({"success": False, "error": "sort 는 relevance, user_id 중 하나여야 합니다."}), 400
 
         conn = get_connection()
         cursor = conn.cursor(DictCursor)
@@ -755,19 +1205,24 @@ def users_search():
         # ----------------------------
         conditions = []
         params = []
+        relevance_parts = []
+        relevance_params = []
 
-        if name:
-            conditions.append("u.name LIKE %s")
-            params.append(f"%{name}%")
+        use_fulltext = bool(name or favorite_music) and users_fulltext_ready(cursor)
+        for column, term in (("u.name", name), ("u.favorite_music", favorite_music)):
+            if not term:
+                continue
+            condition, condition_params, relevance_sql = text_search_condition(column, term, use_fulltext)
+            conditions.append(condition)
+            params.extend(condition_params)
+            if relevance_sql:
+                relevance_parts.append(relevance_sql)
+                relevance_params.extend(condition_params)
 
         if user_id.isdigit():
             conditions.append("u.user_id = %s")
             params.append(int(user_id))
 
-        if favorite_music:
-            conditions.append("u.favorite_music LIKE %s")
-            params.append(f"%{favorite_music}%")
-
         if grade:
             conditions.append("u.grade = %s")
             params.append(grade)
@@ -780,46 +1235,94 @@ def users_search():
         if where_clause:
             where_clause = "WHERE " + where_clause
 
+        # 정렬: FULLTEXT 검색이면 관련도 순(동점은 user_id 순), 아니면 user_id 순
+        if not relevance_parts:
+            sort = "user_id"
+        elif not sort:
+            sort = "relevance"
+        # MATCH 점수(float)를 정수로 고정해 정렬/커서 비교에 같은 값 사용
+        # (float 를 커서로 왕복시켜 = 비교하면 행이 빠지거나 중복될 수 있음)
+        relevance_expr = (
+            f"CAST(ROUND(({' + '.join(relevance_parts)}) * {RELEVANCE_SCALE}) AS SIGNED)"
+            if relevance_parts else ""
+        )
+
+        # 페이징 파라미터 (정렬에 따라 cursor 키가 다름)
+        try:
+            page, page_size, cursor_values, count_mode = parse_list_params(
+                20, ("relevance", "user_id") if sort == "relevance" else ("user_id",)
+            )
+            if cursor_values and sort == "relevance":
+                if isinstance(cursor_values["relevance"], bool) or not isinstance(cursor_values["relevance"], int):
+                    raise ValueError("잘못된 cursor 입니다 (relevance 는 정수여야 합니다)")
+        except ValueError as e:
+            cursor.close()
+            conn.close()
+            return jsonify({"success": False, "error": str(e)}), 400
+
         # ----------------------------
-        # 전체 개수 조회 (JOIN 포함)
+        # 전체 개수 조회
+        # (user_prediction 은 user_id 당 1행이므로 위험도 조건이 없으면 JOIN 불필요)
         # ----------------------------
+        count_join = "LEFT JOIN user_prediction up ON u.user_id = up.user_id" if risk_score else ""
         count_sql = f"""
             SELECT COUNT(*) AS cnt 
             FROM users u
-            LEFT JOIN user_prediction up ON u.user_id = up.user_id
+            {count_join}
             {where_clause}
         """
-        cursor.execute(count_sql, tuple(params))
-        total_rows = cursor.fetchone()["cnt"]
+        total_rows = resolve_total_count(
+            cursor, count_mode, count_sql, params, approx_table=None if conditions else "users"
+        )
 
         # ----------------------------
-        # 페이징된 데이터 조회 (위험도 포함)
+        # 페이지 데이터 조회 (위험도 포함, limit + 1 건 → 다음 페이지 여부)
         # ----------------------------
+        page_conditions = list(conditions)
+        page_params = list(params)
+        offset_clause = ""
+        if cursor_values and sort == "relevance":
+            page_conditions.append(f"(({relevance_expr}) < %s OR (({relevance_expr}) = %s AND u.user_id > %s))")
+            page_params.extend([*relevance_params, cursor_values["relevance"],
+                                *relevance_params, cursor_values["relevance"], cursor_values["user_id"]])
+        elif cursor_values:
+            page_conditions.append("u.user_id > %s")
+            page_params.append(cursor_values["user_id"])
+        elif page > 1:
+            offset_clause = f"OFFSET {(page - 1) * page_size}"
+        page_where = ("WHERE " + " AND ".join(page_conditions)) if page_conditions else ""
+
+        if sort == "relevance":
+            select_relevance = f", ({relevance_expr}) AS relevance"
+            order_by = "relevance DESC, u.user_id"
+            key_fn = lambda row: {"relevance": row["relevance"], "user_id": row["user_id"]}
+        else:
+            select_relevance, relevance_params = "", []
+            order_by = "u.user_id"
+            key_fn = lambda row: {"user_id": row["user_id"]}
+
         query_sql = f"""
             SELECT u.user_id, u.name, u.favorite_music, u.join_date, u.grade,
                    COALESCE(up.risk_score, 'UNKNOWN') AS risk_score,
                    COALESCE(up.churn_rate, 0) AS churn_rate
+                   {select_relevance}
             FROM users u
             LEFT JOIN user_prediction up ON u.user_id = up.user_id
-            {where_clause}
-            ORDER BY u.user_id
-            LIMIT %s OFFSET %s
+            {page_where}
+            ORDER BY {order_by}
+            LIMIT %s {offset_clause}
         """
 
-        cursor.execute(query_sql, tuple(params) + (page_size, offset))
-        rows = cursor.fetchall()
+        cursor.execute(query_sql, (*relevance_params, *page_params, page_size + 1))
+        rows, next_cursor = split_page(cursor.fetchall(), page_size, key_fn)
 
         cursor.close()
         conn.close()
 
-        return jsonify({
-            "success": True,
-            "page": page,
-            "page_size": page_size,
-            "total_rows": total_rows,
-            "total_pages": (total_rows + page_size - 1) // page_size,
-            "rows": rows
-        })
+        return list_page_response(
+            rows, page, page_size, total_rows, count_mode, next_cursor,
+            sort=sort, search_mode="fulltext" if relevance_parts else "like"
+        )
 
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
@@ -888,6 +1391,8 @@ def signup():
     # ID 중복 체크
     cursor.execute("SELECT COUNT(*) AS cnt FROM users WHERE user_id = %s", (user_id,))
     if cursor.fetchone()["cnt"] > 0:
+        cursor.close()
+        conn.close()
         return jsonify({"success": False, "message": "이미 존재하는 ID입니다."})
 
     # 회원 생성
@@ -1021,14 +1526,14 @@ def update_user_data():
 # -------------------------------------------------------------  
 @app.route("/api/users/<int:user_id>", methods=["DELETE"])
 def delete_user(user_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("DELETE FROM users WHERE user_id=%s", (user_id,))
-    conn.commit()
-
-    cursor.close()
-    conn.close()
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM users WHERE user_id=%s", (user_id,))
+        conn.commit()
+        cursor.close()
+    # user_prediction / user_achievements 행도 FK(ON DELETE CASCADE)로 함께 삭제됨
+    invalidate_prediction_summary()
+    invalidate_achievement_statistics(None)
 
     return jsonify({"message": "User deleted"})
 
@@ -1142,6 +1647,7 @@ def unsubscribe_user():
         cursor.execute(sql_log, (user_id, 'UNSUBSCRIBE', '개인정보 수정', additional_info))
         
         conn.commit()
+        invalidate_prediction_summary()
         
         return jsonify({
             "success": True,
@@ -1168,14 +1674,11 @@ def check_user_id():
     if not user_id.isdigit():
         return jsonify({"success": False, "exists": False, "msg": "ID는 숫자만 가능합니다."})
 
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT COUNT(*) AS cnt FROM users WHERE user_id = %s", (user_id,))
-    cnt = cursor.fetchone()["cnt"]
-
-    cursor.close()
-    conn.close()
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) AS cnt FROM users WHERE user_id = %s", (user_id,))
+        cnt = cursor.fetchone()["cnt"]
+        cursor.close()
 
     return jsonify({"success": True, "exists": cnt > 0})
 
@@ -1311,16 +1814,9 @@ def api_predict_churn():
                 
                 conn = get_connection()
                 cursor = conn.cursor()
-                sql = """
-                INSERT INTO user_prediction (user_id, churn_rate, risk_score, update_date)
-                VALUES (%s, %s, %s, CURDATE())
-                ON DUPLICATE KEY UPDATE
-                    churn_rate = VALUES(churn_rate),
-                    risk_score = VALUES(risk_score),
-                    update_date = CURDATE()
-                """
-                cursor.execute(sql, (user_id, churn_rate, risk_score))
+                upsert_user_predictions(cursor, [(user_id, churn_rate, risk_score)])
                 conn.commit()
+                invalidate_prediction_summary()
                 cursor.close()
                 conn.close()
             except Exception as e:
@@ -1397,10 +1893,7 @@ def api_predict_churn_bulk():
         if not isinstance(rows, list):
             return jsonify({"success": False, "error": "rows 필드는 리스트 형태여야 합니다."}), 400
 
-        from inference import predict_churn as _predict_churn
-
-        import math
-        import numpy as np
+        from inference import predict_churn_batch
         
         conn = get_connection()
         cursor = conn.cursor(DictCursor)
@@ -1450,20 +1943,7 @@ def api_predict_churn_bulk():
                 features.pop('user_id', None)  # 예측 함수에 전달하지 않음
                 user_features_dict[user_id] = features
         
-        # 3단계: 전처리기와 모델을 한 번만 로드 (성능 최적화)
-        import inference
-        
-        inference._load_artifacts_if_needed()
-        effective_model_name = (model_name or inference.DEFAULT_MODEL_NAME).lower()
-        model = inference._get_or_train_model(effective_model_name)
-        
-        if not hasattr(model, "predict_proba"):
-            cursor.close()
-            conn.close()
-            return jsonify({"success": False, "error": f"모델 '{effective_model_name}' 은 predict_proba를 지원하지 않습니다."}), 500
-        
-        # 4단계: 배치 예측 수행
-        print(f"[배치 예측] 배치 예측 시작...")
+        # 3단계: 예측 대상 행 목록 구성
         all_features_list = []
         all_indices = []
         all_user_ids = []
@@ -1485,90 +1965,41 @@ def api_predict_churn_bulk():
                         "error": f"user_features에서 user_id={user_id}를 찾을 수 없습니다."
                     })
         
-        # user_id가 없는 행들 처리 (직접 제공된 features)
+        # user_id가 없는 행들 처리 (직접 제공된 features, NaN/inf 는 predict_churn_batch 에서 처리)
         for idx, row in rows_without_user_id.items():
-            cleaned_row = {}
-            # NaN, inf, -inf 값 정리
-            for key, value in row.items():
-                if key == "user_id":
-                    continue  # user_id는 제외
-                
-                if value is None:
-                    cleaned_row[key] = None
-                elif isinstance(value, (int, float)):
-                    if math.isnan(value) or math.isinf(value):
-                        cleaned_row[key] = None
-                    else:
-                        cleaned_row[key] = value
-                else:
-                    # pandas의 NaN 체크 (안전하게)
-                    try:
-                        if pd.isna(value):
-                            cleaned_row[key] = None
-                        else:
-                            cleaned_row[key] = value
-                    except (TypeError, ValueError):
-                        # pd.isna()가 실패하면 그냥 값 사용
-                        cleaned_row[key] = value
-            
-            all_features_list.append(cleaned_row)
+            all_features_list.append({k: v for k, v in row.items() if k != "user_id"})
             all_indices.append(idx)
             all_user_ids.append(None)
         
-        # 5단계: 모든 유저를 한 번에 전처리 및 예측 (배치 처리)
+        # 4단계: 모든 유저를 한 번에 전처리 및 예측 (배치 처리)
         if all_features_list:
-            try:
-                # 모든 유저의 DataFrame 생성
-                X_df_list = []
-                for features in all_features_list:
-                    X_df = inference._build_input_dataframe(features)
-                    X_df_list.append(X_df)
-                
-                # DataFrame들을 합치기
-                X_df_batch = pd.concat(X_df_list, ignore_index=True)
-                
-                # 배치 전처리
-                X_transformed = inference._PREPROCESSOR.transform(X_df_batch)
-                
-                # 배치 예측
-                probas = model.predict_proba(X_transformed)[:, 1]
-                
-                # 결과 처리
-                for i, (idx, user_id, proba) in enumerate(zip(all_indices, all_user_ids, probas)):
-                    proba = float(proba)
-                    if math.isnan(proba) or math.isinf(proba):
-                        proba = 0.0
-                    proba = max(0.0, min(1.0, proba))
-                    
-                    risk_level = inference._prob_to_risk_level(proba)
-                    
-                    results.append({
-                        "index": idx,
-                        "user_id": user_id,
-                        "churn_prob": proba,
-                        "risk_level": risk_level
-                    })
-                    
-                    # user_id가 있으면 예측 결과 저장 준비
-                    if user_id is not None:
-                        try:
-                            churn_rate = int(round(proba * 100))
-                            prediction_inserts.append((user_id, churn_rate, risk_level))
-                        except Exception as e:
-                            print(f"예측 결과 저장 준비 중 오류 (user_id={user_id}): {str(e)}")
+            print(f"[배치 예측] 배치 예측 시작...")
+            batch = predict_churn_batch(all_features_list, model_name=model_name)
             
-            except Exception as e:
-                import traceback
-                error_msg = f"배치 예측 실행 중 오류: {str(e)}"
-                print(f"배치 예측 오류: {error_msg}")
-                print(traceback.format_exc())
-                # 오류 발생 시 개별 처리로 폴백
-                for idx, user_id in zip(all_indices, all_user_ids):
+            if not batch.get("success"):
+                print(f"배치 예측 오류: {batch.get('error')}")
+            
+            for i, (idx, user_id) in enumerate(zip(all_indices, all_user_ids)):
+                if batch["error_mask"][i]:
                     results.append({
                         "index": idx,
                         "user_id": user_id,
-                        "error": error_msg
+                        "error": batch["errors"][i]
                     })
+                    continue
+                
+                proba = float(batch["churn_prob"][i])
+                risk_level = batch["risk_level"][i]
+                results.append({
+                    "index": idx,
+                    "user_id": user_id,
+                    "churn_prob": proba,
+                    "risk_level": risk_level
+                })
+                
+                # user_id가 있으면 예측 결과 저장 준비
+                if user_id is not None:
+                    prediction_inserts.append((user_id, int(round(proba * 100)), risk_level))
         
         # 결과를 index 순서로 정렬
         results.sort(key=lambda x: x.get("index", 0))
@@ -1581,17 +2012,9 @@ def api_predict_churn_bulk():
             print(f"[배치 예측 저장] {len(prediction_inserts)}개 예측 결과 DB 저장 시작")
             try:
                 cursor = conn.cursor()
-                sql = """
-                INSERT INTO user_prediction (user_id, churn_rate, risk_score, update_date)
-                VALUES (%s, %s, %s, CURDATE())
-                ON DUPLICATE KEY UPDATE
-                    churn_rate = VALUES(churn_rate),
-                    risk_score = VALUES(risk_score),
-                    update_date = CURDATE()
-                """
-                cursor.executemany(sql, prediction_inserts)
+                saved_count = upsert_user_predictions(cursor, prediction_inserts)
                 conn.commit()
-                saved_count = len(prediction_inserts)
+                invalidate_prediction_summary()
                 cursor.close()
                 print(f"[배치 예측 저장 완료] {saved_count}개 예측 결과 저장됨")
             except Exception as e:
@@ -1612,7 +2035,8 @@ def api_predict_churn_bulk():
             "success": True,
             "model_name": (model_name or "default"),
             "results": results,
-            "saved_count": saved_count
+            "saved_count": saved_count,
+            "cache_hits": batch.get("cache_hits", 0) if all_features_list else 0
         }
         return jsonify(response_data), 200
 
@@ -1624,6 +2048,25 @@ def api_predict_churn_bulk():
         return jsonify({"success": False, "error": error_msg}), 500
 
 
+@app.route("/api/predict_churn/cache_stats", methods=["GET"])
+def api_predict_churn_cache_stats():
+    """
+    예측 캐시 상태 조회 (프로세스별)
+
+    Response:
+    {
+      "success": true,
+      "prediction": {"hits": 10, "misses": 3, "hit_rate": 0.7692, "size": 3, ...}
+    }
+    """
+    from inference import get_prediction_cache_stats
+
+    return jsonify({
+        "success": True,
+        "prediction": get_prediction_cache_stats(),
+    }), 200
+
+
 # -------------------------------------------------------------
 # 예측 API (6개 피처 전용 LGBM 단조제약 시뮬레이터)
 # -------------------------------------------------------------
@@ -1682,16 +2125,9 @@ def api_predict_churn_6feat():
         # user_prediction 테이블에 INSERT OR UPDATE (user_id 기준 1행 유지)
         conn = get_connection()
         cursor = conn.cursor()
-        sql = """
-        INSERT INTO user_prediction (user_id, churn_rate, risk_score, update_date)
-        VALUES (%s, %s, %s, CURDATE())
-        ON DUPLICATE KEY UPDATE
-            churn_rate = VALUES(churn_rate),
-            risk_score = VALUES(risk_score),
-            update_date = CURDATE()
-        """
-        cursor.execute(sql, (user_id, churn_rate, risk_score))
+        upsert_user_predictions(cursor, [(user_id, churn_rate, risk_score)])
         conn.commit()
+        invalidate_prediction_summary()
         cursor.close()
         conn.close()
 
@@ -1774,6 +2210,32 @@ def get_user_prediction(user_id):
 # -------------------------------------------------------------
 # user_prediction 다건/전체 조회 API
 # -------------------------------------------------------------
+USER_PREDICTION_LIST_FORMATS = ("rows", "columnar", "ndjson")
+
+
+def _iter_prediction_ndjson(conn, cursor):
+    """unbuffered 커서에서 읽은 행을 한 줄에 JSON 하나씩 내보냅니다. (끝나거나 끊기면 연결 닫음)"""
+    try:
+        while True:
+            rows = cursor.fetchmany(PREDICTION_CSV_FETCH_SIZE)
+            if not rows:
+                break
+            yield "".join(
+                json.dumps({
+                    "user_id": user_id,
+                    "churn_rate": churn_rate,
+                    "risk_score": risk_score,
+                    "update_date": update_date.isoformat() if update_date is not None else None
+                }, ensure_ascii=False, separators=(",", ":")) + "\n"
+                for user_id, churn_rate, risk_score, update_date in rows
+            ).encode("utf-8")
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
 @app.route("/api/user_prediction", methods=["GET"])
 def get_user_prediction_list():
     """
@@ -1782,6 +2244,12 @@ def get_user_prediction_list():
     - 쿼리스트링에 user_ids 파라미터를 주면 해당 ID 들만 조회
       예) /api/user_prediction?user_ids=1,5,10
     - user_ids 를 생략하면 user_prediction 전체 행을 반환
+    - limit 을 주면 user_id 순으로 limit 건씩 페이지 조회 (다음 페이지는 응답의 next_cursor 를 cursor 로 전달)
+    - format
+        rows     : 행 dict 리스트 (기본값)
+        columnar : 컬럼별 배열 {"columns": [...], "data": {"user_id": [...], ...}}
+                   (행마다 키 이름이 반복되지 않아 응답이 작고 직렬화가 빠름)
+        ndjson   : 한 줄에 행 하나씩 스트리밍 (application/x-ndjson, limit/cursor 미사용)
 
     Response 예시:
     {
@@ -1794,14 +2262,21 @@ def get_user_prediction_list():
           "update_date": "2025-11-24"
         },
         ...
-      ]
+      ],
+      "next_cursor": null  # limit 을 준 경우만
     }
     """
     try:
         user_ids_param = request.args.get("user_ids", "").strip()
+        response_format = request.args.get("format", "rows").strip().lower()
+        if response_format not in USER_PREDICTION_LIST_FORMATS:
+            return jsonify({
+                "success": False,
+                "error": f"format 은 {', '.join(USER_PREDICTION_LIST_FORMATS)} 중 하나여야 합니다."
+            }), 400
 
-        conn = get_connection()
-        cursor = conn.cursor(DictCursor)
+        conditions = []
+        params = []
 
         if user_ids_param:
             # user_ids=1,2,3 형태를 파싱
@@ -1813,35 +2288,86 @@ def get_user_prediction_list():
             if not id_list:
                 return jsonify({"success": True, "rows": []}), 200
 
-            placeholders = ",".join(["%s"] * len(id_list))
-            sql = f"""
-                SELECT user_id, churn_rate, risk_score, update_date
-                FROM user_prediction
-                WHERE user_id IN ({placeholders})
-                ORDER BY user_id ASC
-            """
-            cursor.execute(sql, tuple(id_list))
-        else:
-            # 전체 행 조회
-            cursor.execute(
-                """
-                SELECT user_id, churn_rate, risk_score, update_date
-                FROM user_prediction
-                ORDER BY user_id ASC
-                """
-            )
+            conditions.append(f"user_id IN ({','.join(['%s'] * len(id_list))})")
+            params.extend(id_list)
 
-        rows = cursor.fetchall()
+        # 페이지 조회 (limit 이 있을 때만)
+        limit = None
+        if request.args.get("limit") and response_format != "ndjson":
+            limit = parse_limit(request.args.get("limit"), default=1000, maximum=10000)
+            try:
+                cursor_values = decode_cursor(request.args.get("cursor"), required=("user_id",))
+            except ValueError as e:
+                return jsonify({"success": False, "error": str(e)}), 400
+            if cursor_values:
+                conditions.append("user_id > %s")
+                params.append(cursor_values["user_id"])
+
+        where_clause = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        sql = f"""
+            SELECT user_id, churn_rate, risk_score, update_date
+            FROM user_prediction
+            {where_clause}
+            ORDER BY user_id ASC
+            {"LIMIT %s" if limit else ""}
+        """
+        if limit:
+            params.append(limit + 1)
 
-        cursor.close()
-        conn.close()
+        if response_format == "ndjson":
+            # 연결/쿼리 오류는 응답 시작 전에 500 으로 반환
+            conn = get_streaming_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(sql, tuple(params))
+            except Exception:
+                conn.close()
+                raise
+            return Response(
+                _iter_prediction_ndjson(conn, cursor),
+                mimetype="application/x-ndjson",
+                headers={"X-Accel-Buffering": "no"},
+            )
 
-        # DATE → 문자열 변환
-        for row in rows:
-            if "update_date" in row and row["update_date"] is not None:
-                row["update_date"] = row["update_date"].isoformat()
+        # 튜플 커서: 행마다 dict 를 만들지 않음
+        with db_connection() as conn:
+            cursor = conn.cursor(pymysql.cursors.Cursor)
+            cursor.execute(sql, tuple(params))
+            records = cursor.fetchall()
+            cursor.close()
+
+        next_cursor = None
+        if limit and len(records) > limit:
+            records = records[:limit]
+            next_cursor = encode_cursor({"user_id": records[-1][0]})
+        page_info = {"next_cursor": next_cursor} if limit else {}
+
+        if response_format == "columnar":
+            columns = ["user_id", "churn_rate", "risk_score", "update_date"]
+            values = list(zip(*records)) if records else [(), (), (), ()]
+            data = dict(zip(columns, map(list, values)))
+            # DATE → 문자열 변환
+            data["update_date"] = [d.isoformat() if d is not None else None for d in data["update_date"]]
+            return jsonify({
+                "success": True,
+                "format": "columnar",
+                "count": len(records),
+                "columns": columns,
+                "data": data,
+                **page_info
+            }), 200
+
+        rows = [
+            {
+                "user_id": user_id,
+                "churn_rate": churn_rate,
+                "risk_score": risk_score,
+                "update_date": update_date.isoformat() if update_date is not None else None
+            }
+            for user_id, churn_rate, risk_score, update_date in records
+        ]
 
-        return jsonify({"success": True, "rows": rows}), 200
+        return jsonify({"success": True, "rows": rows, **page_info}), 200
 
     except Exception as e:
         error_msg = str(e)
@@ -1851,6 +2377,97 @@ def get_user_prediction_list():
         return jsonify({"success": False, "error": f"user_prediction 목록 조회 중 오류: {error_msg}"}), 500
 
 
+# -------------------------------------------------------------
+# 위험도 대시보드 집계 API (관리자 홈 화면용)
+# -------------------------------------------------------------
+# 이탈률 분포 구간 (pd.cut(bins=[0, 20, 40, 60, 80, 100], include_lowest=True) 와 같은 경계)
+CHURN_RATE_BINS = [0, 20, 40, 60, 80, 100]
+CHURN_RATE_BIN_LABELS = ["0-20%", "20-40%", "40-60%", "60-80%", "80-100%"]
+
+
+def _churn_bucket_sql(column="churn_rate"):
+    """churn_rate → 구간 번호(0 ~ 4, 범위 밖이면 NULL) CASE 식"""
+    cases = [f"WHEN {column} >= {CHURN_RATE_BINS[0]} AND {column} <= {CHURN_RATE_BINS[1]} THEN 0"]
+    for i in range(1, len(CHURN_RATE_BIN_LABELS)):
+        cases.append(f"WHEN {column} > {CHURN_RATE_BINS[i]} AND {column} <= {CHURN_RATE_BINS[i + 1]} THEN {i}")
+    return "CASE " + " ".join(cases) + " ELSE NULL END"
+
+
+def _load_prediction_summary():
+    """user_prediction 을 (risk_score, 이탈률 구간) 으로 한 번 GROUP BY 해서 대시보드 집계를 만듭니다."""
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT risk_score, {_churn_bucket_sql()} AS bucket,
+                   COUNT(*) AS cnt, SUM(churn_rate) AS churn_sum
+            FROM user_prediction
+            GROUP BY risk_score, bucket
+        """)
+        groups = cursor.fetchall()
+        cursor.close()
+
+    total_users = 0
+    churn_sum = 0
+    by_risk = {}
+    histogram = [0] * len(CHURN_RATE_BIN_LABELS)
+    for row in groups:
+        count = int(row["cnt"])
+        group_sum = int(row["churn_sum"] or 0)
+        total_users += count
+        churn_sum += group_sum
+        risk = by_risk.setdefault(row["risk_score"], {"count": 0, "churn_sum": 0})
+        risk["count"] += count
+        risk["churn_sum"] += group_sum
+        if row["bucket"] is not None:
+            histogram[int(row["bucket"])] += count
+
+    return {
+        "total_users": total_users,
+        "avg_churn_rate": round(churn_sum / total_users, 2) if total_users else 0,
+        "risk_counts": {risk: stats["count"] for risk, stats in by_risk.items()},
+        "by_risk": [
+            {
+                "risk_score": risk,
+                "count": stats["count"],
+                "avg_churn_rate": round(stats["churn_sum"] / stats["count"], 2)
+            }
+            for risk, stats in sorted(by_risk.items())
+        ],
+        "churn_histogram": [
+            {"range": label, "count": count}
+            for label, count in zip(CHURN_RATE_BIN_LABELS, histogram)
+        ],
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+@app.route("/api/prediction_summary", methods=["GET"])
+def get_prediction_summary():
+    """
+    관리자 홈 화면의 위험도/이탈률 통계를 집계해서 반환합니다.
+    (전체 행을 내려받지 않고 SQL GROUP BY 결과만 전달, user_prediction 저장 시 캐시 무효화)
+
+    Response 예시:
+    {
+      "success": true,
+      "total_users": 1000,
+      "avg_churn_rate": 32.5,
+      "risk_counts": {"HIGH": 120, "MEDIUM": 300, "LOW": 580},
+      "by_risk": [{"risk_score": "HIGH", "count": 120, "avg_churn_rate": 78.1}, ...],
+      "churn_histogram": [{"range": "0-20%", "count": 400}, ...],
+      "generated_at": "2025-11-24T10:00:00"
+    }
+    """
+    try:
+        summary = _PREDICTION_SUMMARY_CACHE.get_or_load(("summary",), _load_prediction_summary)
+        return jsonify({"success": True, **summary}), 200
+    except Exception as e:
+        error_msg = str(e)
+        if "doesn't exist" in error_msg.lower():
+            error_msg = "user_prediction 테이블이 존재하지 않습니다. 먼저 테이블을 생성해주세요. (사용자 데이터 관리 > User Prediction Table 생성)"
+        return jsonify({"success": False, "error": f"위험도 통계 조회 중 오류: {error_msg}"}), 500
+
+
 # -------------------------------------------------------------
 # CSV 업로드 API (여러 유저 위험도 일괄 예측)
 # -------------------------------------------------------------
@@ -1869,70 +2486,95 @@ def upload_prediction_csv():
     - listening_time_trend_7d
     - freq_of_use_trend_14d
     - login_frequency_30d
+
+    처리 방식 (스트리밍):
+    - 파일 전체를 DataFrame 으로 올리지 않고 chunk_size 행씩 읽습니다.
+      (form 또는 query 의 chunk_size, 기본 5000, 100 ~ 100000)
+    - 청크마다 predict_churn_6feat_lgbm_batch 로 한 번에 예측하고,
+      다건 INSERT 한 문장으로 저장한 뒤 commit 합니다.
+    - user_id 가 숫자가 아니거나 예측에 실패한 행은 건너뜁니다 (skipped_rows).
     """
+    required_cols = [
+        "user_id",
+        "app_crash_count_30d",
+        "skip_rate_increase_7d",
+        "days_since_last_login",
+        "listening_time_trend_7d",
+        "freq_of_use_trend_14d",
+        "login_frequency_30d",
+    ]
+    feature_cols = [col for col in required_cols if col != "user_id"]
+
     try:
         file = request.files.get("file")
         if file is None:
             return jsonify({"success": False, "error": "file 필드에 CSV 파일을 업로드해야 합니다."}), 400
 
-        df = pd.read_csv(file)
-
-        required_cols = [
-            "user_id",
-            "app_crash_count_30d",
-            "skip_rate_increase_7d",
-            "days_since_last_login",
-            "listening_time_trend_7d",
-            "freq_of_use_trend_14d",
-            "login_frequency_30d",
-        ]
-        for col in required_cols:
-            if col not in df.columns:
-                return jsonify({"success": False, "error": f"CSV에 '{col}' 컬럼이 필요합니다."}), 400
-
-        from inference_sim_6feat_lgbm import predict_churn_6feat_lgbm
+        try:
+            chunk_size = int(request.form.get("chunk_size", request.args.get("chunk_size", 5000)))
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "chunk_size 는 정수여야 합니다."}), 400
+        chunk_size = max(100, min(chunk_size, 100000))
+
+        from inference_sim_6feat_lgbm import predict_churn_6feat_lgbm_batch
+
+        # 필요한 컬럼만 읽어 청크 메모리를 줄임 (누락 컬럼은 첫 청크에서 확인)
+        reader = pd.read_csv(
+            file.stream,
+            chunksize=chunk_size,
+            usecols=lambda c: c in required_cols,
+        )
 
-        conn = get_connection()
-        cursor = conn.cursor()
+        processed = 0
+        skipped = 0
+        chunks = 0
+        started = pd.Timestamp.now()
 
-        sql = """
-        INSERT INTO user_prediction (user_id, churn_rate, risk_score, update_date)
-        VALUES (%s, %s, %s, CURDATE())
-        ON DUPLICATE KEY UPDATE
-            churn_rate = VALUES(churn_rate),
-            risk_score = VALUES(risk_score),
-            update_date = CURDATE()
-        """
+        with db_connection() as conn:
+            cursor = conn.cursor()
 
-        processed = 0
+            for chunk in reader:
+                if chunks == 0:
+                    missing = [col for col in required_cols if col not in chunk.columns]
+                    if missing:
+                        cursor.close()
+                        return jsonify({"success": False, "error": f"CSV에 '{missing[0]}' 컬럼이 필요합니다."}), 400
+                chunks += 1
 
-        for _, row in df.iterrows():
-            user_id = row["user_id"]
-            try:
-                user_id_int = int(user_id)
-            except Exception:
                 # user_id 가 숫자가 아니면 스킵
-                continue
+                user_ids = pd.to_numeric(chunk["user_id"], errors="coerce")
+                valid = user_ids.notna().to_numpy()
 
-            features = {col: row[col] for col in required_cols if col != "user_id"}
-            result = predict_churn_6feat_lgbm(features)
-            if not result.get("success"):
-                continue
+                batch = predict_churn_6feat_lgbm_batch(chunk.loc[valid, feature_cols])
+                if not batch["success"]:
+                    skipped += len(chunk)
+                    continue
 
-            churn_prob = float(result["churn_prob"])
-            churn_rate = int(round(churn_prob * 100))
-            risk_score = result["risk_level"]
+                ok = ~batch["error_mask"]
+                churn_rates = np.rint(batch["churn_prob"][ok] * 100).astype(int)
+                rows = list(zip(
+                    user_ids.to_numpy()[valid][ok].astype(np.int64).tolist(),
+                    churn_rates.tolist(),
+                    batch["risk_level"][ok].tolist(),
+                ))
 
-            cursor.execute(sql, (user_id_int, churn_rate, risk_score))
-            processed += 1
+                upsert_user_predictions(cursor, rows)
+                conn.commit()
+                invalidate_prediction_summary()
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+                processed += len(rows)
+                skipped += len(chunk) - len(rows)
 
+            cursor.close()
+
+        elapsed = (pd.Timestamp.now() - started).total_seconds()
         return jsonify({
             "success": True,
-            "processed_rows": processed
+            "processed_rows": processed,
+            "skipped_rows": skipped,
+            "chunks": chunks,
+            "chunk_size": chunk_size,
+            "elapsed_sec": round(elapsed, 3),
         }), 200
 
     except Exception as e:
@@ -1963,30 +2605,14 @@ def setup_test_accounts():
         if test2_user:
             test2_user_id = test2_user['user_id']
             test2_name = test2_user['name']
-            sql = """
-            INSERT INTO user_prediction (user_id, churn_rate, risk_score, update_date)
-            VALUES (%s, %s, %s, CURDATE())
-            ON DUPLICATE KEY UPDATE
-                churn_rate = VALUES(churn_rate),
-                risk_score = VALUES(risk_score),
-                update_date = CURDATE()
-            """
-            cursor.execute(sql, (test2_user_id, 80, 'HIGH'))
+            upsert_user_predictions(cursor, [(test2_user_id, 80, 'HIGH')])
             results.append(f"test2 ({test2_name}, user_id: {test2_user_id}) 위험도 HIGH 설정 완료")
         else:
             # user_id = 1인 계정도 시도 (test2 임시 계정의 기본 user_id)
             cursor.execute("SELECT user_id, name FROM users WHERE user_id = 1 LIMIT 1")
             user_1 = cursor.fetchone()
             if user_1:
-                sql = """
-                INSERT INTO user_prediction (user_id, churn_rate, risk_score, update_date)
-                VALUES (%s, %s, %s, CURDATE())
-                ON DUPLICATE KEY UPDATE
-                    churn_rate = VALUES(churn_rate),
-                    risk_score = VALUES(risk_score),
-                    update_date = CURDATE()
-                """
-                cursor.execute(sql, (1, 80, 'HIGH'))
+                upsert_user_predictions(cursor, [(1, 80, 'HIGH')])
                 results.append(f"user_id=1 ({user_1['name']}) 위험도 HIGH 설정 완료")
             else:
                 results.append("test2 계정을 찾을 수 없습니다.")
@@ -2035,17 +2661,11 @@ def setup_test_accounts():
             """, (user_id, account["subscription_type"]))
             
             # user_prediction 테이블에 위험도 HIGH 설정
-            cursor.execute("""
-                INSERT INTO user_prediction (user_id, churn_rate, risk_score, update_date)
-                VALUES (%s, %s, %s, CURDATE())
-                ON DUPLICATE KEY UPDATE
-                    churn_rate = VALUES(churn_rate),
-                    risk_score = VALUES(risk_score),
-                    update_date = CURDATE()
-            """, (user_id, 75, 'HIGH'))
+            upsert_user_predictions(cursor, [(user_id, 75, 'HIGH')])
             results.append(f"  - {account['name']} 위험도 HIGH 설정 완료 (구독 유형: {account['subscription_type']})")
         
         conn.commit()
+        invalidate_prediction_summary()
         cursor.close()
         conn.close()
         
@@ -2066,6 +2686,53 @@ def setup_test_accounts():
 
 # CSV 다운로드 API (user_prediction 전체를 CSV로 반환)
 # -------------------------------------------------------------
+PREDICTION_CSV_COLUMNS = ["user_id", "churn_rate", "risk_score", "update_date"]
+PREDICTION_CSV_FETCH_SIZE = 2000
+
+
+def _iter_prediction_csv(conn, cursor, compress):
+    """
+    unbuffered 커서에서 fetchmany 로 읽은 행을 CSV 조각(bytes)으로 내보냅니다.
+    (끝나거나 클라이언트가 끊으면 연결을 닫음)
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def take(final=False):
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        if compressor is None:
+            return data
+        data = compressor.compress(data)
+        return data + compressor.flush() if final else data
+
+    try:
+        # 엑셀에서 한글이 깨지지 않도록 BOM (기존 utf-8-sig 출력과 동일)
+        buffer.write("\ufeff")
+        writer.writerow(PREDICTION_CSV_COLUMNS)
+        # 헤더는 바로 전송 (gzip 이면 Z_SYNC_FLUSH 로 압축기 버퍼를 비움)
+        yield take() + (compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else b"")
+
+        while True:
+            rows = cursor.fetchmany(PREDICTION_CSV_FETCH_SIZE)
+            if not rows:
+                break
+            writer.writerows(rows)
+            chunk = take()
+            if chunk:
+                yield chunk
+
+        yield take(final=True)
+    finally:
+        # SSCursor 는 close() 시 남은 결과를 끝까지 읽으므로, 연결째 닫아 중단
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
 @app.route("/api/download_prediction_csv", methods=["GET"])
 def download_prediction_csv():
     """
@@ -2077,35 +2744,56 @@ def download_prediction_csv():
     컬럼으로 구성된 CSV 파일로 반환합니다.
 
     위험도 예측 화면의 "CSV 다운로드" 버튼에서 호출하는 용도입니다.
+    전체 결과를 메모리에 올리지 않고, unbuffered 커서에서 읽은 만큼 바로 전송합니다.
+
+    Query Parameters:
+        risk_score: 위험도 필터 (쉼표로 여러 개, 예: HIGH,MEDIUM)
+        update_from / update_to: update_date 범위 (YYYY-MM-DD, 양 끝 포함)
+        gzip: true 이면 user_prediction.csv.gz 로 압축해서 전송
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor(DictCursor)
+        conditions = []
+        params = []
 
-        cursor.execute(
-            """
-            SELECT user_id, churn_rate, risk_score, update_date
-            FROM user_prediction
-            ORDER BY user_id ASC
-            """
-        )
-        rows = cursor.fetchall()
+        risk_scores = [r.strip() for r in request.args.get("risk_score", "").split(",") if r.strip()]
+        if risk_scores:
+            conditions.append(f"risk_score IN ({', '.join(['%s'] * len(risk_scores))})")
+            params.extend(risk_scores)
 
-        cursor.close()
-        conn.close()
+        for arg, op in (("update_from", ">="), ("update_to", "<=")):
+            value = request.args.get(arg, "").strip()
+            if not value:
+                continue
+            try:
+                params.append(datetime.date.fromisoformat(value))
+            except ValueError:
+                return jsonify({"success": False, "error": f"{arg} 는 YYYY-MM-DD 형식이어야 합니다."}), 400
+            conditions.append(f"update_date {op} %s")
 
-        # pandas DataFrame으로 변환 후 CSV 문자열 생성
-        df = pd.DataFrame(rows, columns=["user_id", "churn_rate", "risk_score", "update_date"])
-        if not df.empty:
-            # DATE → 문자열
-            df["update_date"] = df["update_date"].astype(str)
-        csv_data = df.to_csv(index=False, encoding="utf-8-sig")
+        compress = request.args.get("gzip", "false").lower() in ("1", "true", "yes")
+        where_clause = ("WHERE " + " AND ".join(conditions)) if conditions else ""
 
+        # 연결/쿼리 오류는 응답 시작 전에 500 으로 반환
+        conn = get_streaming_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT user_id, churn_rate, risk_score, update_date
+                FROM user_prediction
+                {where_clause}
+                ORDER BY user_id ASC
+            """, tuple(params))
+        except Exception:
+            conn.close()
+            raise
+
+        filename = "user_prediction.csv.gz" if compress else "user_prediction.csv"
         return Response(
-            csv_data,
-            mimetype="text/csv",
+            _iter_prediction_csv(conn, cursor, compress),
+            mimetype="application/gzip" if compress else "text/csv",
             headers={
-                "Content-Disposition": "attachment; filename=user_prediction.csv"
+                "Content-Disposition": f"attachment; filename={filename}",
+                "X-Accel-Buffering": "no",  # 프록시(nginx) 버퍼링 없이 바로 전달
             },
         )
 
@@ -2140,6 +2828,28 @@ def spotify_callback():
 # -------------------------------------------------------------
 @app.route('/api/music/search', methods=['GET'])
 def search_music():
+    """
+    Spotify 트랙 검색 프록시
+
+    Query:
+      q: 검색어 (필수)
+      limit: 1~50 (기본 20), offset: 0 이상 (기본 0), market: 국가 코드 (선택)
+      fields: 응답 트랙 필드 (쉼표 구분, 기본 id,uri,name,artists,album,image_url,thumbnail_url,duration_ms,popularity)
+              "full" 이면 Spotify 원본 트랙 객체
+      token: Authorization 헤더 대신 쓸 수 있는 access token
+
+    Response (기본 fields):
+    {
+      "tracks": [
+        {"id": "...", "uri": "spotify:track:...", "name": "...", "artists": ["..."], "album": "...",
+         "image_url": "...", "thumbnail_url": "...", "duration_ms": 201000, "popularity": 80},
+        ...
+      ]
+    }
+
+    - 공유 keep-alive 세션 + 타임아웃으로 호출 (`backend/spotify_client.py`)
+    - 같은 토큰의 같은 (q, limit, offset, market) 검색은 SPOTIFY_SEARCH_CACHE_TTL 동안 캐시 (X-Cache: HIT/MISS)
+    """
     query = request.args.get('q')
     access_token = request.headers.get('Authorization') # Bearer token expected
     
@@ -2152,42 +2862,358 @@ def search_music():
          if access_token and not access_token.startswith("Bearer "):
              access_token = "Bearer " + access_token
 
-    if not access_token:
-        return jsonify({"error": "Authorization header or token is required"}), 401
+    if not access_token:
+        return jsonify({"error": "Authorization header or token is required"}), 401
+
+    # 캐시 키가 갈라지지 않도록 정수로 정규화
+    limit = parse_limit(request.args.get('limit'), default=20, maximum=50)
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+    except (TypeError, ValueError):
+        return jsonify({"error": "offset 은 0 이상의 정수여야 합니다."}), 400
+    market = request.args.get('market') or None
+    try:
+        fields = parse_track_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        tracks, cached = get_spotify_client().search_tracks(
+            query, access_token, limit=limit, offset=offset, market=market, full=fields is None
+        )
+        if fields is not None:
+            tracks = [{name: track[name] for name in fields} for track in tracks]
+    except SpotifyAPIError as e:
+        return jsonify(e.payload), e.status_code
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    response = jsonify({"tracks": tracks})
+    response.headers["X-Cache"] = "HIT" if cached else "MISS"
+    return response
+
+
+@app.route('/api/music/search/stats', methods=['GET'])
+def search_music_stats():
+    """Spotify 호출/검색 캐시 통계 (프로세스별)"""
+    return jsonify({"success": True, **get_spotify_client().stats()}), 200
+
+# -------------------------------------------------------------
+# 도전과제 관련 API
+# -------------------------------------------------------------
+
+# -------------------------------------------------------------
+# 노래 재생 로그 기록 API
+# -------------------------------------------------------------
+class AchievementRuleIndex:
+    """
+    활성 도전과제 규칙 인덱스 (프로세스 메모리 캐시)
+
+    - TRACK_PLAY: target_track_uri → 도전과제 목록
+    - GENRE_PLAY: 소문자 target_genre → 도전과제 목록
+    재생 1건마다 활성 도전과제 전체를 조회/순회하지 않고,
+    해당 트랙/장르로 진행될 수 있는 도전과제만 바로 찾습니다.
+
+    - 도전과제 생성/삭제 API 에서 invalidate() 로 무효화합니다.
+    - API 를 거치지 않은 변경(직접 UPDATE, 다른 서버 프로세스)은 ttl_seconds 후 반영됩니다.
+    """
+
+    def __init__(self, ttl_seconds=60.0):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._by_track = {}
+        self._by_genre = {}
+        self._loaded_at = None
+        self._version = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._loaded_at = None
+
+    def _is_fresh(self):
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def _load(self, cursor):
+        with self._lock:
+            version = self._version
+
+        cursor.execute("""
+            SELECT achievement_id, achievement_type, target_value, target_track_uri, target_genre,
+                   title, description, reward_points
+            FROM achievements
+            WHERE is_active = TRUE
+            ORDER BY achievement_id ASC
+        """)
+        by_track, by_genre = {}, {}
+        for row in cursor.fetchall():
+            rule = dict(row)
+            if rule["achievement_type"] == "TRACK_PLAY" and rule["target_track_uri"]:
+                by_track.setdefault(rule["target_track_uri"], []).append(rule)
+            elif rule["achievement_type"] == "GENRE_PLAY" and rule["target_genre"]:
+                by_genre.setdefault(rule["target_genre"].lower(), []).append(rule)
+
+        with self._lock:
+            # 로드 도중 invalidate() 가 호출됐으면 오래된 결과이므로 저장하지 않음
+            if version == self._version:
+                self._by_track, self._by_genre = by_track, by_genre
+                self._loaded_at = time.monotonic()
+        return by_track, by_genre
+
+    def lookup(self, cursor, track_uri, genre):
+        """재생한 트랙/장르로 진행될 수 있는 활성 도전과제 목록 (achievement_id 순)"""
+        with self._lock:
+            fresh = self._is_fresh()
+            by_track, by_genre = self._by_track, self._by_genre
+        if not fresh:
+            by_track, by_genre = self._load(cursor)
+
+        matches = list(by_track.get(track_uri, []))
+        if genre:
+            matches.extend(by_genre.get(genre.lower(), []))
+        matches.sort(key=lambda rule: rule["achievement_id"])
+        return matches
+
+
+_ACHIEVEMENT_RULES = AchievementRuleIndex(ttl_seconds=float(os.getenv("ACHIEVEMENT_RULES_TTL", 60)))
+
+
+def apply_achievement_progress(cursor, events, changed_achievements=None):
+    """
+    재생 이벤트 리스트로 도전과제 진행도를 한 번에 갱신합니다. (commit 은 호출 측)
+
+    - 활성 도전과제는 _ACHIEVEMENT_RULES 인덱스에서 각 트랙/장르에 해당하는 것만 가져옵니다.
+    - (user_id, achievement_id) 별 재생 횟수를 합산한 뒤,
+      진행 상황 조회 1번 + 배치 UPDATE 1번 + 배치 INSERT 1번으로 처리합니다.
+
+    Args:
+        events: [{"user_id", "track_uri", "genre"}, ...]
+        changed_achievements: set 을 넘기면 달성/진행 중 인원이 바뀐 achievement_id 를 추가
+            (commit 후 통계 캐시 무효화용)
+
+    Returns:
+        dict: {user_id: [새로 달성한 도전과제 정보, ...]}
+    """
+    # 이번 재생들로 진행될 수 있는 도전과제만 모아서 횟수 합산
+    increments = {}
+    rules = {}
+    for event in events:
+        for rule in _ACHIEVEMENT_RULES.lookup(cursor, event["track_uri"], event.get("genre")):
+            key = (event["user_id"], rule["achievement_id"])
+            increments[key] = increments.get(key, 0) + 1
+            rules[rule["achievement_id"]] = rule
+
+    if not increments:
+        return {}
+
+    # 해당 유저/도전과제들의 진행 상황을 한 번에 조회
+    user_ids = sorted({user_id for user_id, _ in increments})
+    achievement_ids = sorted(rules)
+    cursor.execute(f"""
+        SELECT user_id, achievement_id, user_achievement_id, current_progress, is_completed
+        FROM user_achievements
+        WHERE user_id IN ({','.join(['%s'] * len(user_ids))})
+          AND achievement_id IN ({','.join(['%s'] * len(achievement_ids))})
+    """, (*user_ids, *achievement_ids))
+    progress_rows = {(row["user_id"], row["achievement_id"]): row for row in cursor.fetchall()}
+
+    # 업데이트할 데이터 준비
+    updates = []
+    inserts = []
+    completed_by_user = {}
+
+    for (user_id, achievement_id), count in increments.items():
+        achievement = rules[achievement_id]
+        target_value = achievement["target_value"]
+
+        # 기존 진행 상황 확인
+        progress_row = progress_rows.get((user_id, achievement_id))
+        if progress_row:
+            if progress_row["is_completed"]:
+                continue  # 이미 완료된 도전과제는 스킵
+            user_achievement_id = progress_row["user_achievement_id"]
+            current_progress = progress_row["current_progress"] + count
+        else:
+            # 새로운 도전과제 시작
+            user_achievement_id = None
+            current_progress = count
+
+        # 완료 여부 확인 (여러 재생이 한 번에 합산돼도 목표값을 넘기지 않음)
+        is_completed = current_progress >= target_value
+        if is_completed:
+            current_progress = target_value
+            completed_by_user.setdefault(user_id, []).append({
+                "achievement_id": achievement_id,
+                "title": achievement["title"],
+                "description": achievement["description"],
+                "reward_points": achievement["reward_points"]
+            })
+
+        if changed_achievements is not None and (is_completed or not user_achievement_id):
+            changed_achievements.add(achievement_id)
+
+        # INSERT 또는 UPDATE 데이터 준비
+        if user_achievement_id:
+            updates.append((current_progress, is_completed, is_completed, user_achievement_id))
+        else:
+            inserts.append((user_id, achievement_id, current_progress, is_completed, is_completed))
+
+    # 배치 UPDATE
+    if updates:
+        cursor.executemany("""
+            UPDATE user_achievements
+            SET current_progress = %s,
+                is_completed = %s,
+                completed_at = CASE WHEN %s = TRUE AND completed_at IS NULL THEN NOW() ELSE completed_at END
+            WHERE user_achievement_id = %s
+        """, updates)
+
+    # 배치 INSERT
+    if inserts:
+        cursor.executemany("""
+            INSERT INTO user_achievements (user_id, achievement_id, current_progress, is_completed, completed_at)
+            VALUES (%s, %s, %s, %s, CASE WHEN %s = TRUE THEN NOW() ELSE NULL END)
+        """, inserts)
+
+    return completed_by_user
+
+
+# 재생 횟수 집계 테이블 사용 가능 여부 (None: 아직 모름)
+# - /api/init_music_playback_log_table, /api/init_play_count_tables 호출 시 True
+# - 테이블이 없다는 오류(1146)를 받으면 False → 재생 로그 기록은 계속하고 집계만 건너뜀
+#   False 는 PLAY_COUNT_TABLES_RECHECK_SECONDS 동안만 유지하고 다시 확인
+#   (다른 워커 프로세스에서 테이블을 만든 경우)
+_PLAY_COUNT_TABLES = {"ready": None, "checked_at": 0.0}
+PLAY_COUNT_TABLES_RECHECK_SECONDS = float(os.getenv("PLAY_COUNT_TABLES_RECHECK_SECONDS", 30))
+
+
+def _is_missing_table_error(e):
+    return isinstance(e, pymysql.err.ProgrammingError) and e.args and e.args[0] == 1146
+
+
+def _mark_play_count_tables_missing():
+    _PLAY_COUNT_TABLES["ready"] = False
+    _PLAY_COUNT_TABLES["checked_at"] = time.monotonic()
+
+
+def play_count_tables_ready(cursor):
+    """재생 횟수 집계 테이블이 있는지 (있으면 이후 확인 생략, 없으면 일정 시간 뒤 다시 확인)"""
+    ready = _PLAY_COUNT_TABLES["ready"]
+    if ready is None or (
+        ready is False
+        and time.monotonic() - _PLAY_COUNT_TABLES["checked_at"] >= PLAY_COUNT_TABLES_RECHECK_SECONDS
+    ):
+        try:
+            cursor.execute("SELECT 1 FROM user_genre_play_counts LIMIT 1")
+            cursor.fetchall()
+            cursor.execute("SELECT 1 FROM user_track_play_counts LIMIT 1")
+            cursor.fetchall()
+            _PLAY_COUNT_TABLES["ready"] = True
+        except Exception as e:
+            if not _is_missing_table_error(e):
+                raise
+            _mark_play_count_tables_missing()
+    return _PLAY_COUNT_TABLES["ready"]
+
+
+def increment_play_counts(cursor, events):
+    """재생 이벤트 묶음만큼 유저별 장르/트랙 재생 횟수를 증가시킵니다. (commit 은 호출 측)"""
+    if not play_count_tables_ready(cursor):
+        return
+
+    genre_counts = {}
+    track_counts = {}
+    for e in events:
+        track_key = (e["user_id"], e["track_uri"])
+        track_counts[track_key] = track_counts.get(track_key, 0) + 1
+        if e.get("genre"):
+            genre_key = (e["user_id"], e["genre"].lower())
+            genre_counts[genre_key] = genre_counts.get(genre_key, 0) + 1
+
+    try:
+        if genre_counts:
+            cursor.executemany("""
+                INSERT INTO user_genre_play_counts (user_id, genre_key, play_count)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE play_count = play_count + VALUES(play_count)
+            """, [(uid, genre, count) for (uid, genre), count in genre_counts.items()])
+        cursor.executemany("""
+            INSERT INTO user_track_play_counts (user_id, track_uri, play_count)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE play_count = play_count + VALUES(play_count)
+        """, [(uid, uri, count) for (uid, uri), count in track_counts.items()])
+    except Exception as e:
+        if not _is_missing_table_error(e):
+            raise
+        _mark_play_count_tables_missing()
+        print("재생 횟수 집계 테이블이 없습니다. /api/init_play_count_tables 로 생성하세요.")
+
+
+def insert_playback_events(cursor, events):
+    """
+    재생 로그를 다건 INSERT 한 문장으로 기록하고, 재생 횟수 집계도 함께 증가시킵니다.
+    (commit 은 호출 측)
+    """
+    cursor.executemany("""
+        INSERT INTO music_playback_log (user_id, track_uri, track_name, artist_name, genre, playback_duration)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, [
+        (e["user_id"], e["track_uri"], e.get("track_name", ""), e.get("artist_name", ""),
+         e.get("genre"), e.get("playback_duration", 0))
+        for e in events
+    ])
+    increment_play_counts(cursor, events)
+
+
+def process_playback_batch(events):
+    """
+    재생 이벤트 묶음을 하나의 트랜잭션으로 저장합니다.
+    (동기 모드에서는 이벤트 1건, 비동기 모드에서는 워커가 모은 micro-batch)
+
+    - 재생 로그 다건 INSERT → 도전과제 진행도 일괄 갱신 → commit 1번
+    - 도전과제 체크가 실패해도 재생 로그는 기록됩니다.
+
+    Returns:
+        dict: {user_id: [새로 달성한 도전과제 정보, ...]}
+    """
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            insert_playback_events(cursor, events)
+
+            changed_achievements = set()
+            try:
+                completed_by_user = apply_achievement_progress(cursor, events, changed_achievements)
+            except Exception as e:
+                print(f"도전과제 체크 중 오류: {str(e)}")
+                completed_by_user = {}
+                changed_achievements.clear()
 
-    try:
-        # Spotify API 호출
-        spotify_url = "https://api.spotify.com/v1/search"
-        headers = {
-            "Authorization": access_token
-        }
-        params = {
-            "q": query,
-            "type": "track",
-            "limit": request.args.get('limit', 20),
-            "offset": request.args.get('offset', 0)
-        }
-        
-        res = requests.get(spotify_url, headers=headers, params=params)
-        
-        if res.status_code != 200:
-            return jsonify(res.json()), res.status_code
-            
-        data = res.json()
-        tracks = data.get("tracks", {}).get("items", [])
-        
-        return jsonify({"tracks": tracks})
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+            conn.commit()
+        finally:
+            cursor.close()
+
+    if changed_achievements:
+        invalidate_achievement_statistics(changed_achievements)
+
+    return completed_by_user
+
+
+# 재생 로그 적재 방식
+# - sync : 요청 안에서 저장 + 도전과제 체크 후 응답 (기본값)
+# - async: 큐에 넣고 바로 응답, 백그라운드 워커가 micro-batch 로 저장
+#          (새로 달성한 도전과제는 다음 재생 응답 또는 /api/music/notifications 로 전달)
+PLAYBACK_INGEST_MODE = os.getenv("PLAYBACK_INGEST_MODE", "sync").lower()
+
+_PLAYBACK_QUEUE = PlaybackIngestQueue(
+    process_playback_batch,
+    max_batch=int(os.getenv("PLAYBACK_INGEST_BATCH", 200)),
+    max_wait_seconds=float(os.getenv("PLAYBACK_INGEST_WAIT", 0.05)),
+    workers=int(os.getenv("PLAYBACK_INGEST_WORKERS", 1)),
+    maxsize=int(os.getenv("PLAYBACK_INGEST_QUEUE_SIZE", 10000)),
+)
 
-# -------------------------------------------------------------
-# 도전과제 관련 API
-# -------------------------------------------------------------
 
-# -------------------------------------------------------------
-# 노래 재생 로그 기록 API
-# -------------------------------------------------------------
 @app.route("/api/music/playback", methods=["POST"])
 def log_music_playback():
     """
@@ -2202,44 +3228,47 @@ def log_music_playback():
         "genre": "Pop" (선택적),
         "playback_duration": 180 (초, 선택적)
     }
+
+    PLAYBACK_INGEST_MODE=async 이면 이벤트를 큐에 넣고 202 로 바로 응답합니다.
+    (큐가 가득 찬 경우에는 동기 방식으로 저장)
+    completed_achievements 에는 이번 재생 또는 이전 비동기 처리에서 새로 달성한 도전과제가 담깁니다.
     """
     try:
         data = request.get_json()
         user_id = data.get("user_id")
         track_uri = data.get("track_uri")
-        track_name = data.get("track_name", "")
-        artist_name = data.get("artist_name", "")
-        genre = data.get("genre")
-        playback_duration = data.get("playback_duration", 0)
         
         if not user_id or not track_uri:
             return jsonify({"success": False, "error": "user_id와 track_uri는 필수입니다."}), 400
-        
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # 재생 로그 기록 및 도전과제 체크를 하나의 트랜잭션으로 처리
+
         try:
-            # 재생 로그 기록
-            sql = """
-            INSERT INTO music_playback_log (user_id, track_uri, track_name, artist_name, genre, playback_duration)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(sql, (user_id, track_uri, track_name, artist_name, genre, playback_duration))
-            
-            # 도전과제 달성 체크 (같은 트랜잭션 내에서)
-            completed_achievements = check_and_update_achievements(
-                cursor, conn, user_id, track_uri, genre
-            )
-            
-            # 모든 작업이 성공하면 커밋
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            cursor.close()
-            conn.close()
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "user_id는 정수여야 합니다."}), 400
+
+        event = {
+            "user_id": user_id,
+            "track_uri": track_uri,
+            "track_name": data.get("track_name", ""),
+            "artist_name": data.get("artist_name", ""),
+            "genre": data.get("genre"),
+            "playback_duration": data.get("playback_duration", 0),
+        }
+
+        if PLAYBACK_INGEST_MODE == "async":
+            if _PLAYBACK_QUEUE.submit(event):
+                return jsonify({
+                    "success": True,
+                    "queued": True,
+                    "message": "재생 로그가 접수되었습니다.",
+                    "completed_achievements": _PLAYBACK_QUEUE.pop_notifications(user_id)
+                }), 202
+            pending = _PLAYBACK_QUEUE.pop_notifications(user_id)
+        else:
+            pending = []
+
+        # 재생 로그 기록 및 도전과제 체크를 하나의 트랜잭션으로 처리
+        completed_achievements = pending + process_playback_batch([event]).get(user_id, [])
         
         return jsonify({
             "success": True,
@@ -2251,118 +3280,28 @@ def log_music_playback():
         return jsonify({"success": False, "error": f"재생 로그 기록 중 오류: {str(e)}"}), 500
 
 
-def check_and_update_achievements(cursor, conn, user_id, track_uri, genre):
+@app.route("/api/music/notifications", methods=["GET"])
+def get_music_notifications():
     """
-    도전과제 달성 여부를 체크하고 업데이트합니다. (최적화: 배치 쿼리 사용)
-    
-    Returns:
-        list: 새로 달성한 도전과제 목록
+    비동기 재생 로그 처리 중 새로 달성한 도전과제 알림을 조회합니다. (조회한 알림은 삭제)
+
+    Query Parameters:
+    - user_id: 사용자 ID (필수)
     """
-    completed_achievements = []
-    
-    try:
-        # 활성화된 모든 도전과제 조회
-        cursor.execute("""
-            SELECT achievement_id, achievement_type, target_value, target_track_uri, target_genre,
-                   title, description, reward_points
-            FROM achievements
-            WHERE is_active = TRUE
-        """)
-        achievements = cursor.fetchall()
-        
-        if not achievements:
-            return completed_achievements
-        
-        # 사용자의 모든 도전과제 진행 상황을 한 번에 조회
-        achievement_ids = [a[0] for a in achievements]
-        placeholders = ','.join(['%s'] * len(achievement_ids))
-        cursor.execute(f"""
-            SELECT achievement_id, user_achievement_id, current_progress, is_completed
-            FROM user_achievements
-            WHERE user_id = %s AND achievement_id IN ({placeholders})
-        """, (user_id, *achievement_ids))
-        
-        user_achievements_dict = {row[0]: row for row in cursor.fetchall()}
-        
-        # 업데이트할 데이터 준비
-        updates = []
-        inserts = []
-        completed_info = []
-        
-        for achievement in achievements:
-            achievement_id = achievement[0]
-            achievement_type = achievement[1]
-            target_value = achievement[2]
-            target_track_uri = achievement[3]
-            target_genre = achievement[4]
-            title = achievement[5]
-            description = achievement[6]
-            reward_points = achievement[7]
-            
-            # 진행도 증가 여부 확인
-            should_update = False
-            if achievement_type == "TRACK_PLAY" and target_track_uri and track_uri == target_track_uri:
-                should_update = True
-            elif achievement_type == "GENRE_PLAY" and target_genre and genre and target_genre.lower() == genre.lower():
-                should_update = True
-            
-            if not should_update:
-                continue
-            
-            # 기존 진행 상황 확인
-            if achievement_id in user_achievements_dict:
-                user_achievement_id, current_progress, is_completed = user_achievements_dict[achievement_id][1:]
-                if is_completed:
-                    continue  # 이미 완료된 도전과제는 스킵
-                current_progress += 1
-            else:
-                # 새로운 도전과제 시작
-                current_progress = 1
-                user_achievement_id = None
-                is_completed = False
-            
-            # 완료 여부 확인
-            if current_progress >= target_value:
-                is_completed = True
-                completed_info.append({
-                    "achievement_id": achievement_id,
-                    "title": title,
-                    "description": description,
-                    "reward_points": reward_points
-                })
-            
-            # INSERT 또는 UPDATE 데이터 준비
-            if user_achievement_id:
-                updates.append((current_progress, is_completed, user_achievement_id))
-            else:
-                inserts.append((user_id, achievement_id, current_progress, is_completed))
-        
-        # 배치 UPDATE
-        if updates:
-            cursor.executemany("""
-                UPDATE user_achievements
-                SET current_progress = %s,
-                    is_completed = %s,
-                    completed_at = CASE WHEN %s = TRUE AND completed_at IS NULL THEN NOW() ELSE completed_at END
-                WHERE user_achievement_id = %s
-            """, [(pc, ic, ic, uaid) for pc, ic, uaid in updates])
-        
-        # 배치 INSERT
-        if inserts:
-            cursor.executemany("""
-                INSERT INTO user_achievements (user_id, achievement_id, current_progress, is_completed, completed_at)
-                VALUES (%s, %s, %s, %s, CASE WHEN %s = TRUE THEN NOW() ELSE NULL END)
-            """, [(uid, aid, pc, ic, ic) for uid, aid, pc, ic in inserts])
-        
-        if updates or inserts:
-            conn.commit()
-            completed_achievements = completed_info
-    
-    except Exception as e:
-        # 도전과제 체크 실패해도 재생 로그는 기록됨
-        print(f"도전과제 체크 중 오류: {str(e)}")
-    
-    return completed_achievements
+    user_id = request.args.get("user_id", type=int)
+    if user_id is None:
+        return jsonify({"success": False, "error": "user_id는 필수입니다."}), 400
+
+    return jsonify({
+        "success": True,
+        "completed_achievements": _PLAYBACK_QUEUE.pop_notifications(user_id)
+    })
+
+
+@app.route("/api/music/playback/stats", methods=["GET"])
+def get_playback_ingest_stats():
+    """재생 로그 적재 방식과 비동기 큐 처리 통계를 조회합니다."""
+    return jsonify({"success": True, "mode": PLAYBACK_INGEST_MODE, **_PLAYBACK_QUEUE.stats()})
 
 
 # -------------------------------------------------------------
@@ -2376,10 +3315,14 @@ def get_achievements():
     Query Parameters:
     - user_id: 특정 사용자의 도전과제 진행 상황 포함 (선택적)
     - is_active: 활성화된 도전과제만 조회 (기본값: true)
+
+    user_id 가 있으면 user_achievements 를 LEFT JOIN 해서 진행 상황까지 한 번에 조회합니다.
+    (JOIN 조건의 (user_id, achievement_id) 는 UNIQUE KEY unique_user_achievement 로 인덱스 조회)
     """
     try:
         user_id = request.args.get("user_id", "").strip()
         is_active = request.args.get("is_active", "true").lower() == "true"
+        with_progress = bool(user_id and user_id.isdigit())
         
         conn = get_connection()
         cursor = conn.cursor(DictCursor)
@@ -2390,12 +3333,23 @@ def get_achievements():
         
         if is_active:
             where_clause += " AND a.is_active = TRUE"
+
+        progress_select = ""
+        progress_join = ""
+        if with_progress:
+            progress_select = """,
+               ua.user_achievement_id AS ua_id, ua.current_progress AS ua_progress,
+               ua.is_completed AS ua_completed, ua.completed_at AS ua_completed_at,
+               ua.created_at AS ua_created_at"""
+            progress_join = "LEFT JOIN user_achievements ua ON ua.user_id = %s AND ua.achievement_id = a.achievement_id"
+            params.append(int(user_id))
         
         sql = f"""
         SELECT a.achievement_id, a.title, a.description, a.achievement_type,
                a.target_value, a.target_track_uri, a.target_genre, a.reward_points,
-               a.is_active, a.created_at
+               a.is_active, a.created_at{progress_select}
         FROM achievements a
+        {progress_join}
         {where_clause}
         ORDER BY a.achievement_id ASC
         """
@@ -2404,22 +3358,18 @@ def get_achievements():
         achievements = cursor.fetchall()
         
         # 사용자 ID가 제공된 경우 진행 상황 포함
-        if user_id and user_id.isdigit():
-            user_id_int = int(user_id)
+        if with_progress:
             for achievement in achievements:
-                achievement_id = achievement["achievement_id"]
-                cursor.execute("""
-                    SELECT current_progress, is_completed, completed_at, created_at
-                    FROM user_achievements
-                    WHERE user_id = %s AND achievement_id = %s
-                """, (user_id_int, achievement_id))
-                
-                user_progress = cursor.fetchone()
-                if user_progress:
-                    achievement["user_progress"] = user_progress.get("current_progress", 0)
-                    achievement["is_completed"] = user_progress.get("is_completed", False)
-                    achievement["completed_at"] = user_progress["completed_at"].isoformat() if user_progress.get("completed_at") else None
-                    achievement["started_at"] = user_progress["created_at"].isoformat() if user_progress.get("created_at") else None
+                ua_id = achievement.pop("ua_id")
+                progress = achievement.pop("ua_progress")
+                completed = achievement.pop("ua_completed")
+                completed_at = achievement.pop("ua_completed_at")
+                started_at = achievement.pop("ua_created_at")
+                if ua_id is not None:
+                    achievement["user_progress"] = progress if progress is not None else 0
+                    achievement["is_completed"] = completed if completed is not None else False
+                    achievement["completed_at"] = completed_at.isoformat() if completed_at else None
+                    achievement["started_at"] = started_at.isoformat() if started_at else None
                 else:
                     achievement["user_progress"] = 0
                     achievement["is_completed"] = False
@@ -2446,10 +3396,167 @@ def get_achievements():
 # -------------------------------------------------------------
 # 사용자 도전과제 진행 상황 조회 API
 # -------------------------------------------------------------
+# 도전과제 달성 통계 캐시
+# - 도전과제별 달성/진행 중 인원, 전체(휴면 제외) 사용자 수, 전체 요약을 보관
+# - 도전과제 달성/진행 시작(재생 처리 commit 후), 생성, 삭제 시 해당 키를 바로 무효화
+# - 사용자 삭제 시 전체 무효화 (user_achievements 가 CASCADE 로 함께 삭제됨)
+# - 전체 사용자 수는 가입 시 따로 무효화하지 않고 TTL 로만 갱신
+_ACHIEVEMENT_STATS_CACHE = TTLCache(ttl_seconds=float(os.getenv("ACHIEVEMENT_STATS_TTL", 300)))
+
+
+def invalidate_achievement_statistics(achievement_ids=()):
+    """도전과제 통계 캐시 무효화 (해당 도전과제 + 전체 요약, None 이면 전체 사용자 수까지 모두)"""
+    if achievement_ids is None:
+        _ACHIEVEMENT_STATS_CACHE.clear()
+        return
+    for achievement_id in achievement_ids:
+        _ACHIEVEMENT_STATS_CACHE.invalidate(("achievement", achievement_id))
+    _ACHIEVEMENT_STATS_CACHE.invalidate(("summary",))
+
+
+def _load_total_users():
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) AS total FROM users WHERE grade != '00'")
+        total = cursor.fetchone()["total"]
+        cursor.close()
+    return int(total)
+
+
+def _completion_rate(completed_count, total_users):
+    return round(completed_count / total_users * 100, 2) if total_users > 0 else 0
+
+
+def _load_achievement_counts(achievement_id):
+    """도전과제 정보 + 달성/진행 중 인원 (도전과제가 없으면 None)"""
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT a.achievement_id, a.title, a.target_value,
+                   COALESCE(SUM(ua.is_completed = TRUE), 0) AS completed_count,
+                   COALESCE(SUM(ua.is_completed = FALSE), 0) AS in_progress_count
+            FROM achievements a
+            LEFT JOIN user_achievements ua ON ua.achievement_id = a.achievement_id
+            WHERE a.achievement_id = %s
+            GROUP BY a.achievement_id, a.title, a.target_value
+        """, (achievement_id,))
+        row = cursor.fetchone()
+        cursor.close()
+    if not row:
+        return None
+    row["completed_count"] = int(row["completed_count"])
+    row["in_progress_count"] = int(row["in_progress_count"])
+    return row
+
+
+def _load_achievement_summary():
+    """모든 도전과제의 달성/진행 중 인원 (GROUP BY 1번)"""
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT a.achievement_id, a.title, a.target_value,
+                   COALESCE(SUM(ua.is_completed = TRUE), 0) AS completed_count,
+                   COALESCE(SUM(ua.is_completed = FALSE), 0) AS in_progress_count
+            FROM achievements a
+            LEFT JOIN user_achievements ua ON ua.achievement_id = a.achievement_id
+            GROUP BY a.achievement_id, a.title, a.target_value
+            ORDER BY a.achievement_id
+        """)
+        rows = cursor.fetchall()
+        cursor.close()
+    for row in rows:
+        row["completed_count"] = int(row["completed_count"])
+        row["in_progress_count"] = int(row["in_progress_count"])
+    return rows
+
+
+def _fetch_completed_users_page(achievement_id, limit, cursor_values):
+    """
+    달성한 사용자 목록 한 페이지 (completed_at DESC, user_id DESC 순 keyset 페이지네이션)
+
+    Returns:
+        (users, next_cursor)
+    """
+    where = "ua.achievement_id = %s AND ua.is_completed = TRUE"
+    params = [achievement_id]
+    if cursor_values:
+        if cursor_values["completed_at"] is None:
+            # DESC 정렬에서 NULL 은 맨 뒤
+            where += " AND ua.completed_at IS NULL AND ua.user_id < %s"
+            params.append(cursor_values["user_id"])
+        else:
+            where += """ AND (ua.completed_at < %s
+                              OR (ua.completed_at = %s AND ua.user_id < %s)
+                              OR ua.completed_at IS NULL)"""
+            params.extend([cursor_values["completed_at"], cursor_values["completed_at"], cursor_values["user_id"]])
+
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT ua.user_id, u.name, ua.completed_at
+            FROM user_achievements ua
+            JOIN users u ON ua.user_id = u.user_id
+            WHERE {where}
+            ORDER BY ua.completed_at DESC, ua.user_id DESC
+            LIMIT %s
+        """, (*params, limit + 1))
+        rows = cursor.fetchall()
+        cursor.close()
+
+    users, next_cursor = split_page(
+        rows, limit, lambda row: {"completed_at": row["completed_at"], "user_id": row["user_id"]}
+    )
+    # DATETIME → 문자열 변환
+    for user in users:
+        if user.get("completed_at"):
+            user["completed_at"] = user["completed_at"].isoformat()
+    return users, next_cursor
+
+
+@app.route("/api/achievements/statistics", methods=["GET"])
+def get_achievements_statistics_summary():
+    """
+    모든 도전과제의 달성 통계를 한 번에 조회합니다. (관리자 도전과제 목록 화면용)
+
+    Returns:
+    {
+        "total_users": 100,
+        "statistics": [
+            {"achievement_id": 1, "title": "...", "target_value": 10,
+             "completed_count": 15, "in_progress_count": 20, "completion_rate": 15.0},
+            ...
+        ]
+    }
+    """
+    try:
+        total_users = _ACHIEVEMENT_STATS_CACHE.get_or_load(("total_users",), _load_total_users)
+        summary = _ACHIEVEMENT_STATS_CACHE.get_or_load(("summary",), _load_achievement_summary)
+
+        statistics = [
+            {**row, "completion_rate": _completion_rate(row["completed_count"], total_users)}
+            for row in summary
+        ]
+        return jsonify({"success": True, "total_users": total_users, "statistics": statistics})
+
+    except Exception as e:
+        import traceback
+        error_detail = traceback.format_exc()
+        print(f"도전과제 통계 요약 조회 오류: {error_detail}")
+        return jsonify({"success": False, "error": f"도전과제 통계 조회 중 오류: {str(e)}"}), 500
+
+
 @app.route("/api/achievements/<int:achievement_id>/statistics", methods=["GET"])
 def get_achievement_statistics(achievement_id):
     """
     특정 도전과제의 달성 통계를 조회합니다.
+
+    - 인원 수는 캐시에서 가져오고 (달성/생성/삭제 시 무효화)
+    - 달성한 사용자 목록은 limit 건씩 커서로 페이지네이션합니다.
+
+    Query Parameters:
+        limit: 달성한 사용자 목록 페이지 크기 (기본 50, 최대 500)
+        cursor: 이전 응답의 next_cursor
+        include_users: false 이면 사용자 목록 생략
     
     Returns:
     {
@@ -2458,73 +3565,44 @@ def get_achievement_statistics(achievement_id):
         "completed_count": 15,  # 달성한 사용자 수
         "in_progress_count": 20,  # 진행 중인 사용자 수
         "completion_rate": 15.0,  # 달성률 (%)
-        "completed_users": [  # 달성한 사용자 목록
+        "completed_users": [  # 달성한 사용자 목록 (최근 달성 순, limit 건)
             {"user_id": 1, "name": "홍길동", "completed_at": "2025-01-01"},
             ...
-        ]
+        ],
+        "next_cursor": "..."  # 다음 페이지가 없으면 null
     }
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor(DictCursor)
-        
-        # 도전과제 정보 조회
-        cursor.execute("""
-            SELECT achievement_id, title, target_value
-            FROM achievements
-            WHERE achievement_id = %s
-        """, (achievement_id,))
-        
-        achievement = cursor.fetchone()
-        if not achievement:
-            cursor.close()
-            conn.close()
+        limit = parse_limit(request.args.get("limit"), default=50, maximum=500)
+        include_users = request.args.get("include_users", "true").lower() != "false"
+        try:
+            cursor_values = decode_cursor(request.args.get("cursor"), required=("completed_at", "user_id"))
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        counts = _ACHIEVEMENT_STATS_CACHE.get_or_load(
+            ("achievement", achievement_id), lambda: _load_achievement_counts(achievement_id)
+        )
+        if counts is None:
+            _ACHIEVEMENT_STATS_CACHE.invalidate(("achievement", achievement_id))
             return jsonify({"success": False, "error": "도전과제를 찾을 수 없습니다."}), 404
-        
-        # 전체 사용자 수
-        cursor.execute("SELECT COUNT(*) AS total FROM users WHERE grade != '00'")
-        total_users = cursor.fetchone()["total"]
-        
-        # 달성한 사용자 수 및 목록
-        cursor.execute("""
-            SELECT ua.user_id, u.name, ua.completed_at
-            FROM user_achievements ua
-            JOIN users u ON ua.user_id = u.user_id
-            WHERE ua.achievement_id = %s AND ua.is_completed = TRUE
-            ORDER BY ua.completed_at DESC
-        """, (achievement_id,))
-        completed_users = cursor.fetchall()
-        completed_count = len(completed_users)
-        
-        # 진행 중인 사용자 수
-        cursor.execute("""
-            SELECT COUNT(*) AS count
-            FROM user_achievements
-            WHERE achievement_id = %s AND is_completed = FALSE
-        """, (achievement_id,))
-        in_progress_count = cursor.fetchone()["count"]
-        
-        # 달성률 계산
-        completion_rate = (completed_count / total_users * 100) if total_users > 0 else 0
-        
-        cursor.close()
-        conn.close()
-        
-        # DATETIME → 문자열 변환
-        for user in completed_users:
-            if user.get("completed_at"):
-                user["completed_at"] = user["completed_at"].isoformat()
+        total_users = _ACHIEVEMENT_STATS_CACHE.get_or_load(("total_users",), _load_total_users)
+
+        completed_users, next_cursor = [], None
+        if include_users:
+            completed_users, next_cursor = _fetch_completed_users_page(achievement_id, limit, cursor_values)
         
         return jsonify({
             "success": True,
             "achievement_id": achievement_id,
-            "title": achievement["title"],
-            "target_value": achievement["target_value"],
+            "title": counts["title"],
+            "target_value": counts["target_value"],
             "total_users": total_users,
-            "completed_count": completed_count,
-            "in_progress_count": in_progress_count,
-            "completion_rate": round(completion_rate, 2),
-            "completed_users": completed_users
+            "completed_count": counts["completed_count"],
+            "in_progress_count": counts["in_progress_count"],
+            "completion_rate": _completion_rate(counts["completed_count"], total_users),
+            "completed_users": completed_users,
+            "next_cursor": next_cursor
         })
         
     except Exception as e:
@@ -2534,6 +3612,19 @@ def get_achievement_statistics(achievement_id):
         return jsonify({"success": False, "error": f"도전과제 통계 조회 중 오류: {str(e)}"}), 500
 
 
+# 유저 도전과제 목록 (활성 도전과제 + 해당 유저 진행 상황)
+# - /api/users/<id>/achievements, /api/users/<id>/home 에서 사용
+USER_ACHIEVEMENTS_SQL = """
+SELECT a.achievement_id, a.title, a.description, a.achievement_type,
+       a.target_value, a.target_track_uri, a.target_genre, a.reward_points,
+       ua.current_progress, ua.is_completed, ua.completed_at, ua.created_at AS started_at
+FROM achievements a
+LEFT JOIN user_achievements ua ON a.achievement_id = ua.achievement_id AND ua.user_id = %s
+WHERE a.is_active = TRUE
+ORDER BY a.achievement_id ASC
+"""
+
+
 @app.route("/api/users/<int:user_id>/achievements", methods=["GET"])
 def get_user_achievements(user_id):
     """
@@ -2554,17 +3645,7 @@ def get_user_achievements(user_id):
                 "error": "achievements 테이블이 존재하지 않습니다. 먼저 테이블을 생성해주세요."
             }), 500
         
-        sql = """
-        SELECT a.achievement_id, a.title, a.description, a.achievement_type,
-               a.target_value, a.target_track_uri, a.target_genre, a.reward_points,
-               ua.current_progress, ua.is_completed, ua.completed_at, ua.created_at AS started_at
-        FROM achievements a
-        LEFT JOIN user_achievements ua ON a.achievement_id = ua.achievement_id AND ua.user_id = %s
-        WHERE a.is_active = TRUE
-        ORDER BY a.achievement_id ASC
-        """
-        
-        cursor.execute(sql, (user_id,))
+        cursor.execute(USER_ACHIEVEMENTS_SQL, (user_id,))
         achievements = cursor.fetchall()
         
         cursor.close()
@@ -2620,6 +3701,8 @@ def delete_achievement(achievement_id):
         # 도전과제 삭제 (CASCADE로 user_achievements도 함께 삭제됨)
         cursor.execute("DELETE FROM achievements WHERE achievement_id = %s", (achievement_id,))
         conn.commit()
+        _ACHIEVEMENT_RULES.invalidate()
+        invalidate_achievement_statistics([achievement_id])
         
         cursor.close()
         conn.close()
@@ -2684,6 +3767,7 @@ def create_achievement():
                             target_track_uri, target_genre, reward_points))
         conn.commit()
         achievement_id = cursor.lastrowid
+        _ACHIEVEMENT_RULES.invalidate()
         
         # 새로 생성된 도전과제에 대해 기존 재생 로그를 기반으로 모든 유저의 진행도 체크
         try:
@@ -2693,6 +3777,7 @@ def create_achievement():
             import traceback
             print(f"기존 유저 진행도 체크 중 오류 (도전과제는 생성됨): {str(e)}")
             traceback.print_exc()
+        invalidate_achievement_statistics([achievement_id])
         
         cursor.close()
         conn.close()
@@ -2736,35 +3821,54 @@ def check_all_users_for_new_achievement(cursor, conn, achievement_id, achievemen
         if not achievement:
             print(f"[배치 도전과제 체크] 도전과제 정보 없음 (achievement_id={achievement_id})")
             return {"processed_users": 0, "completed_users": 0}
-        target_value = achievement[0]
+        target_value = achievement["target_value"]
         print(f"[배치 도전과제 체크] 목표 값: {target_value}")
+
+        # 집계 테이블이 있으면 미리 계산된 재생 횟수를, 없으면 전체 재생 로그를 집계
+        use_rollup = play_count_tables_ready(cursor)
         
         # 배치 쿼리로 모든 유저의 진행도 한 번에 계산
         if achievement_type == "TRACK_PLAY" and target_track_uri:
-            print(f"[배치 도전과제 체크] 트랙 재생 횟수 조회 중 (track_uri={target_track_uri})")
-            # 특정 트랙 재생 횟수를 배치로 계산
-            cursor.execute("""
-                SELECT 
-                    m.user_id,
-                    COUNT(*) AS play_count
-                FROM music_playback_log m
-                INNER JOIN users u ON m.user_id = u.user_id
-                WHERE u.grade != '00' AND m.track_uri = %s
-                GROUP BY m.user_id
-            """, (target_track_uri,))
+            print(f"[배치 도전과제 체크] 트랙 재생 횟수 조회 중 (track_uri={target_track_uri}, 집계 테이블={use_rollup})")
+            if use_rollup:
+                cursor.execute("""
+                    SELECT c.user_id, c.play_count
+                    FROM user_track_play_counts c
+                    INNER JOIN users u ON c.user_id = u.user_id
+                    WHERE u.grade != '00' AND c.track_uri = %s
+                """, (target_track_uri,))
+            else:
+                # 특정 트랙 재생 횟수를 배치로 계산
+                cursor.execute("""
+                    SELECT 
+                        m.user_id,
+                        COUNT(*) AS play_count
+                    FROM music_playback_log m
+                    INNER JOIN users u ON m.user_id = u.user_id
+                    WHERE u.grade != '00' AND m.track_uri = %s
+                    GROUP BY m.user_id
+                """, (target_track_uri,))
             
         elif achievement_type == "GENRE_PLAY" and target_genre:
-            print(f"[배치 도전과제 체크] 장르 재생 횟수 조회 중 (genre={target_genre})")
-            # 특정 장르 재생 횟수를 배치로 계산
-            cursor.execute("""
-                SELECT 
-                    m.user_id,
-                    COUNT(*) AS play_count
-                FROM music_playback_log m
-                INNER JOIN users u ON m.user_id = u.user_id
-                WHERE u.grade != '00' AND LOWER(m.genre) = LOWER(%s)
-                GROUP BY m.user_id
-            """, (target_genre,))
+            print(f"[배치 도전과제 체크] 장르 재생 횟수 조회 중 (genre={target_genre}, 집계 테이블={use_rollup})")
+            if use_rollup:
+                cursor.execute("""
+                    SELECT c.user_id, c.play_count
+                    FROM user_genre_play_counts c
+                    INNER JOIN users u ON c.user_id = u.user_id
+                    WHERE u.grade != '00' AND c.genre_key = %s
+                """, (target_genre.lower(),))
+            else:
+                # 특정 장르 재생 횟수를 배치로 계산
+                cursor.execute("""
+                    SELECT 
+                        m.user_id,
+                        COUNT(*) AS play_count
+                    FROM music_playback_log m
+                    INNER JOIN users u ON m.user_id = u.user_id
+                    WHERE u.grade != '00' AND LOWER(m.genre) = LOWER(%s)
+                    GROUP BY m.user_id
+                """, (target_genre,))
         else:
             print(f"[배치 도전과제 체크] 잘못된 도전과제 타입 또는 파라미터")
             return {"processed_users": 0, "completed_users": 0}
@@ -2776,8 +3880,8 @@ def check_all_users_for_new_achievement(cursor, conn, achievement_id, achievemen
         # 배치 INSERT를 위한 데이터 준비
         insert_data = []
         for row in user_progresses:
-            user_id = row[0]
-            play_count = row[1]
+            user_id = row["user_id"]
+            play_count = row["play_count"]
             
             if play_count > 0:
                 is_completed = (play_count >= target_value)
@@ -2995,6 +4099,122 @@ def get_selected_achievement(user_id):
         return jsonify({"success": False, "error": f"칭호 조회 중 오류: {str(e)}"}), 500
 
 
+# -------------------------------------------------------------
+# 로그인 사용자 메인 화면 데이터 (한 번에 조회)
+# -------------------------------------------------------------
+def _isoformat_or_none(value):
+    return value.isoformat() if value is not None else None
+
+
+@app.route("/api/users/<int:user_id>/home", methods=["GET"])
+def get_user_home(user_id):
+    """
+    메인 화면 렌더링에 필요한 유저 데이터를 한 번에 반환합니다.
+    (user_prediction / user_features / selected_achievement / achievements 를 따로 호출하던 것)
+
+    - 풀 연결 하나에서 조회: users + user_prediction JOIN 1번, user_features 1번,
+      선택한 칭호 1번 (선택한 경우만), 도전과제 목록 1번
+    - user_features / achievements 테이블이 아직 없으면 해당 항목만 비워서 반환 (메인 화면은 그대로 표시)
+    - 응답 본문 해시를 ETag 로 내려주고, If-None-Match 가 같으면 본문 없이 304 반환
+      (Streamlit rerun 마다 같은 데이터를 다시 받고 파싱하지 않도록)
+
+    Response:
+    {
+      "success": true,
+      "user": {"user_id": 1, "name": "...", "favorite_music": "...", "grade": "01"},
+      "prediction": {"churn_rate": 75, "risk_score": "HIGH", "update_date": "..."} | null,
+      "features": {...} | null,
+      "selected_achievement": {"achievement_id": 3, "title": "...", "description": "...", "reward_points": 10} | null,
+      "achievements": [...]   # /api/users/<id>/achievements 와 같은 형식
+    }
+    """
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor(DictCursor)
+            cursor.execute(
+                """
+                SELECT u.user_id, u.name, u.favorite_music, u.grade, u.selected_achievement_id,
+                       p.churn_rate, p.risk_score, p.update_date
+                FROM users u
+                LEFT JOIN user_prediction p ON p.user_id = u.user_id
+                WHERE u.user_id = %s
+                """,
+                (user_id,),
+            )
+            row = cursor.fetchone()
+            if not row:
+                cursor.close()
+                return jsonify({"success": False, "error": "사용자를 찾을 수 없습니다."}), 404
+
+            try:
+                cursor.execute("SELECT * FROM user_features WHERE user_id=%s", (user_id,))
+                features = cursor.fetchone()
+            except pymysql.err.ProgrammingError as e:
+                if not _is_missing_table_error(e):
+                    raise
+                features = None
+            if features:
+                features = dict(features)
+                features.pop("user_id", None)
+
+            selected_achievement = None
+            try:
+                if row["selected_achievement_id"] is not None:
+                    cursor.execute(
+                        """
+                        SELECT achievement_id, title, description, reward_points
+                        FROM achievements
+                        WHERE achievement_id = %s
+                        """,
+                        (row["selected_achievement_id"],),
+                    )
+                    selected_achievement = cursor.fetchone()
+                cursor.execute(USER_ACHIEVEMENTS_SQL, (user_id,))
+                achievements = cursor.fetchall()
+            except pymysql.err.ProgrammingError as e:
+                if not _is_missing_table_error(e):
+                    raise
+                achievements = []
+            cursor.close()
+
+        for achievement in achievements:
+            achievement["completed_at"] = _isoformat_or_none(achievement.get("completed_at"))
+            achievement["started_at"] = _isoformat_or_none(achievement.get("started_at"))
+            if achievement.get("current_progress") is None:
+                achievement["current_progress"] = 0
+            if achievement.get("is_completed") is None:
+                achievement["is_completed"] = False
+
+        payload = {
+            "success": True,
+            "user": {
+                "user_id": row["user_id"],
+                "name": row["name"],
+                "favorite_music": row["favorite_music"],
+                "grade": row["grade"],
+            },
+            "prediction": None if row["risk_score"] is None else {
+                "churn_rate": row["churn_rate"],
+                "risk_score": row["risk_score"],
+                "update_date": _isoformat_or_none(row["update_date"]),
+            },
+            "features": features,
+            "selected_achievement": selected_achievement,
+            "achievements": achievements,
+        }
+
+        response = jsonify(payload)
+        response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+        # 브라우저/프록시가 저장해도 매번 서버에 확인 (본인 데이터)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response.make_conditional(request)
+
+    except Exception as e:
+        import traceback
+        print(f"메인 화면 데이터 조회 오류: {traceback.format_exc()}")
+        return jsonify({"success": False, "error": f"메인 화면 데이터 조회 중 오류: {str(e)}"}), 500
+
+
 
 
 
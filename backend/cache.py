@@ -0,0 +1,146 @@
+"""
+cache.py
+Auth: 박수빈
+API 응답용 프로세스 메모리 TTL 캐시 모듈.
+
+- 키별로 값을 ttl_seconds 동안 보관하고, maxsize 를 넘으면 가장 오래 쓰지 않은 키부터 버립니다.
+- get_or_load(key, loader) 는 캐시에 없을 때만 loader() 를 호출합니다.
+  같은 키를 여러 요청이 동시에 찾으면 한 요청만 loader 를 실행하고
+  나머지는 그 결과를 기다립니다. (캐시 만료 직후 같은 집계 쿼리가 몰리는 것 방지)
+- 데이터가 바뀌는 지점(예: 도전과제 달성)에서 invalidate(key) 로 바로 무효화합니다.
+
+주의:
+- 프로세스별 캐시이므로, 여러 프로세스로 운영하면 무효화는 같은 프로세스에만 적용되고
+  다른 프로세스는 최대 ttl_seconds 동안 이전 값을 볼 수 있습니다.
+
+역할 분리:
+- 캐시 자료구조          → 이 모듈
+- 캐시할 값/무효화 시점  → `backend/app.py`
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """스레드 안전 TTL + LRU 캐시"""
+
+    def __init__(self, ttl_seconds: float = 60.0, maxsize: int = 1024):
+        """
+        Args:
+            ttl_seconds: 값 보관 시간(초), 0 이하이면 캐시하지 않음
+            maxsize: 최대 키 수
+        """
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = max(1, maxsize)
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[Hashable, threading.Event] = {}
+        # invalidate 시 증가 → 무효화 전에 시작한 load 결과는 저장하지 않음
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "waits": 0, "invalidations": 0}
+
+    # ---------------------------------------------------------
+    # 조회/저장
+    # ---------------------------------------------------------
+    def _get_locked(self, key: Hashable) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def _set_locked(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._get_locked(key)
+            if value is _MISSING:
+                self._stats["misses"] += 1
+                return default
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._set_locked(key, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        캐시에 값이 있으면 반환하고, 없으면 loader() 결과를 저장 후 반환합니다.
+        같은 키의 동시 요청은 한 번만 loader 를 실행합니다. (loader 예외는 호출 측으로 전달)
+        """
+        while True:
+            with self._lock:
+                value = self._get_locked(key)
+                if value is not _MISSING:
+                    self._stats["hits"] += 1
+                    return value
+                event = self._loading.get(key)
+                if event is None:
+                    # 이 요청이 로드 담당
+                    event = threading.Event()
+                    self._loading[key] = event
+                    self._stats["misses"] += 1
+                    self._stats["loads"] += 1
+                    generation = self._generation
+                    break
+                self._stats["waits"] += 1
+            # 다른 요청의 로드가 끝나길 기다린 뒤 다시 조회
+            # (로드가 실패했으면 다음 반복에서 이 요청이 로드 담당이 됨)
+            event.wait()
+
+        try:
+            value = loader()
+            with self._lock:
+                if generation == self._generation:
+                    self._set_locked(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            event.set()
+
+    # ---------------------------------------------------------
+    # 무효화/상태
+    # ---------------------------------------------------------
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._data)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
+
+
+__all__ = ["TTLCache"]
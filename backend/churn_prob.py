@@ -1,77 +1,288 @@
 """
 churn_prob.py
 Auth: 신지용
-학습에 사용한 CSV 전체에 대해 이탈 확률 분포를 확인하는 오프라인 스크립트.
+학습에 사용한 CSV 전체(또는 임의의 피처 CSV)에 대해 이탈 확률을 일괄 계산하는 오프라인 배치 스크립트.
 
-현재 로직은 `data/processed/enhanced_data_not_clean_FE_delete.csv`를 로드해
-`backend.inference.predict_churn`을 호출하여 각 유저의 이탈 확률과
-위험도 레벨을 계산하고, 간단한 통계와 함께 CSV로 저장합니다.
+현재 로직은 입력 CSV 를 chunk_size 행씩 읽어
+`backend.inference.predict_churn_batch` 로 청크 단위 벡터화 예측을 하고,
+청크마다 part 파일(parquet, 엔진이 없으면 csv) 하나를 출력 디렉토리에 저장합니다.
+
+- --workers 2 이상이면 청크를 프로세스 풀에 나눠 병렬로 예측합니다.
+  (동시에 처리 중인 청크 수를 workers * 2 로 제한해 메모리를 일정하게 유지)
+- part 파일은 임시 파일에 쓴 뒤 이름을 바꾸므로, 중단 후 다시 실행하면
+  이미 저장된 청크는 건너뛰고 이어서 계산합니다. (--no-resume 이면 처음부터)
+- 마지막에 처리 속도(rows/s)와 캘리브레이션 통계(Brier score, 10분위 예측 평균 vs 실제 이탈률)를 출력합니다.
 
 역할 분리:
 - 전처리/파이프라인 저장 → `backend/preprocessing_pipeline.py`
 - 모델 정의/선택        → `backend/models.py`
-- 배치 예측(분포 확인)  → 이 스크립트
+- 배치 추론 함수        → `backend/inference.py`의 `predict_churn_batch`
+- 오프라인 일괄 예측    → 이 스크립트
 
 사용 방법:
     python backend/churn_prob.py
+    python backend/churn_prob.py --workers 4 --chunk-size 50000
+    python backend/churn_prob.py --merge-csv data/processed/enhanced_data_with_lgbm_churn_prob.csv
 """
 
+import argparse
+import glob
+import json
 import os
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
+import numpy as np
 import pandas as pd
 
 # 프로젝트 루트 경로를 Python 경로에 추가 (backend 패키지 import 가능하게)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from backend.inference import predict_churn
-
-
-# 1) 학습에 사용했던 CSV 불러오기
-df = pd.read_csv("data/processed/enhanced_data_not_clean_FE_delete.csv")
-n_total = len(df)
-print(f"총 {n_total}개 샘플에 대해 이탈 확률 계산 시작...")
-
-# 2) 전체 행에 대해 이탈 확률 계산
-probs = []
-risk_levels = []
-
-for i, (_, row) in enumerate(df.iterrows(), start=1):
-    features = row.to_dict()
-    result = predict_churn(user_features=features, model_name="hgb")
-    if not result.get("success", False):
-        raise RuntimeError(result.get("error"))
-    probs.append(result["churn_prob"])
-    risk_levels.append(result["risk_level"])
-
-    # 진행도 로그 (500행 단위로 출력)
-    if i % 500 == 0 or i == n_total:
-        print(f"[진행도] {i}/{n_total} 행 처리 완료")
-
-df["churn_prob"] = probs
-df["risk_level"] = risk_levels
-
-# 3) 전체 데이터 기준 이탈률/예측 통계 출력
-n = len(df)
-actual_churn_rate = df["is_churned"].mean() if "is_churned" in df.columns else None
-mean_pred_prob = df["churn_prob"].mean()
-
-th = 0.5
-pred_churn_rate = (df["churn_prob"] >= th).mean()
-
-print(f"총 샘플 수: {n}")
-if actual_churn_rate is not None:
-    print(f"실제 이탈률 (is_churned 평균): {actual_churn_rate:.4f}")
-print(f"예측 확률 평균 (churn_prob 평균): {mean_pred_prob:.4f}")
-print(f"threshold={th:.2f} 기준 예측 이탈률: {pred_churn_rate:.4f}")
-
-# 상위 50개 샘플만 미리보기 출력 (index 리셋 + user_id 기준 정렬)
-print("\n▶ 전체 샘플 (user_id, is_churned, churn_prob, risk_level):")
-cols_to_show = [c for c in ["user_id", "is_churned", "churn_prob", "risk_level"] if c in df.columns]
-preview = df[cols_to_show].sort_values("user_id").reset_index(drop=True)
-print(preview.to_string(index=False))
-
-# 4) churn_prob / risk_level 이 포함된 CSV 저장
-output_path = "data/processed/enhanced_data_with_lgbm_churn_prob.csv"
-df.to_csv(output_path, index=False, encoding="utf-8-sig")
-print(f"\n예측 결과 저장 완료: {output_path}")
\ No newline at end of file
+from backend.config import DATA_PATH, DEFAULT_MODEL_NAME
+from backend.inference import predict_churn_batch
+
+# parquet 엔진(pyarrow / fastparquet)이 설치된 경우에만 parquet 출력 사용
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PARQUET = True
+except ImportError:  # pragma: no cover - 환경에 따라 다름
+    try:
+        import fastparquet  # noqa: F401
+        _HAS_PARQUET = True
+    except ImportError:
+        _HAS_PARQUET = False
+
+
+DEFAULT_OUTPUT_DIR = "data/processed/churn_prob_parts"
+META_FILE = "_meta.json"
+
+# 예측 이탈률 계산 기준 (기존 스크립트와 동일)
+PRED_THRESHOLD = 0.5
+
+
+def _part_path(output_dir: str, chunk_idx: int, fmt: str) -> str:
+    return os.path.join(output_dir, f"part-{chunk_idx:05d}.{fmt}")
+
+
+def _write_part(df: pd.DataFrame, path: str, fmt: str) -> None:
+    """임시 파일에 쓴 뒤 교체 (중간에 중단돼도 반쯤 쓰인 part 가 남지 않음)"""
+    tmp_path = path + ".tmp"
+    if fmt == "parquet":
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _read_parts(paths, fmt: str, columns=None) -> pd.DataFrame:
+    frames = []
+    for path in paths:
+        if fmt == "parquet":
+            frames.append(pd.read_parquet(path, columns=columns))
+        else:
+            frames.append(pd.read_csv(path, usecols=columns))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns or [])
+
+
+def score_chunk(chunk_idx: int, chunk: pd.DataFrame, model_name: str, output_dir: str, fmt: str) -> dict:
+    """
+    청크 하나를 예측해 part 파일로 저장합니다. (프로세스 풀 워커에서도 실행)
+
+    Returns:
+        {"chunk_idx", "rows", "errors", "seconds"}
+    """
+    started = time.perf_counter()
+    result = predict_churn_batch(chunk, model_name=model_name)
+    if not result["success"]:
+        raise RuntimeError(f"청크 {chunk_idx} 예측 실패: {result.get('error')}")
+
+    out = chunk.reset_index(drop=True)
+    out["churn_prob"] = result["churn_prob"]
+    out["risk_level"] = result["risk_level"]
+    out["error"] = pd.Series(result["errors"], dtype=object)
+
+    _write_part(out, _part_path(output_dir, chunk_idx, fmt), fmt)
+    return {
+        "chunk_idx": chunk_idx,
+        "rows": len(out),
+        "errors": int(result["error_mask"].sum()),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _prepare_output_dir(args) -> None:
+    """출력 디렉토리 준비 + 이어서 계산할 수 있는 설정인지 확인"""
+    os.makedirs(args.output_dir, exist_ok=True)
+    meta_path = os.path.join(args.output_dir, META_FILE)
+    meta = {
+        "input": os.path.abspath(args.input),
+        "model": args.model,
+        "chunk_size": args.chunk_size,
+        "format": args.format,
+    }
+
+    if os.path.exists(meta_path) and args.resume:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous != meta:
+            raise SystemExit(
+                f"기존 출력({args.output_dir})의 설정이 다릅니다: {previous}\n"
+                f"같은 설정으로 실행하거나 --no-resume 으로 처음부터 다시 계산하세요."
+            )
+    else:
+        for path in glob.glob(os.path.join(args.output_dir, "part-*")):
+            os.remove(path)
+
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def run_scoring(args) -> dict:
+    """입력 CSV 를 청크 단위로 예측해 part 파일로 저장하고, 이번 실행의 처리 통계를 반환"""
+    _prepare_output_dir(args)
+
+    reader = pd.read_csv(args.input, chunksize=args.chunk_size)
+    scored_rows = 0
+    error_rows = 0
+    skipped_chunks = 0
+    started = time.perf_counter()
+
+    def _log(stats: dict) -> None:
+        print(
+            f"[진행도] part-{stats['chunk_idx']:05d}: {stats['rows']}행 "
+            f"(오류 {stats['errors']}행, {stats['seconds']:.2f}s)"
+        )
+
+    def _pending_chunks():
+        nonlocal skipped_chunks
+        for chunk_idx, chunk in enumerate(reader):
+            if args.resume and os.path.exists(_part_path(args.output_dir, chunk_idx, args.format)):
+                skipped_chunks += 1
+                continue
+            yield chunk_idx, chunk
+
+    if args.workers <= 1:
+        for chunk_idx, chunk in _pending_chunks():
+            stats = score_chunk(chunk_idx, chunk, args.model, args.output_dir, args.format)
+            scored_rows += stats["rows"]
+            error_rows += stats["errors"]
+            _log(stats)
+    else:
+        max_in_flight = args.workers * 2
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            in_flight = set()
+            for chunk_idx, chunk in _pending_chunks():
+                in_flight.add(
+                    executor.submit(score_chunk, chunk_idx, chunk, args.model, args.output_dir, args.format)
+                )
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stats = future.result()
+                        scored_rows += stats["rows"]
+                        error_rows += stats["errors"]
+                        _log(stats)
+            for future in in_flight:
+                stats = future.result()
+                scored_rows += stats["rows"]
+                error_rows += stats["errors"]
+                _log(stats)
+
+    return {
+        "scored_rows": scored_rows,
+        "error_rows": error_rows,
+        "skipped_chunks": skipped_chunks,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def summarize(output_dir: str, fmt: str, run_stats: dict) -> None:
+    """저장된 전체 part 에서 필요한 컬럼만 읽어 처리 속도/캘리브레이션 통계를 출력"""
+    paths = sorted(glob.glob(os.path.join(output_dir, f"part-*.{fmt}")))
+    sample = _read_parts(paths[:1], fmt)
+    columns = [c for c in ["churn_prob", "risk_level", "is_churned"] if c in sample.columns]
+    df = _read_parts(paths, fmt, columns=columns)
+
+    seconds = run_stats["seconds"]
+    rate = run_stats["scored_rows"] / seconds if seconds > 0 else float("nan")
+
+    print("\n" + "=" * 60)
+    print("오프라인 이탈 확률 계산 요약")
+    print("=" * 60)
+    print(f"이번 실행 처리 행 수 : {run_stats['scored_rows']} (건너뛴 청크 {run_stats['skipped_chunks']}개)")
+    print(f"소요 시간 / 처리 속도: {seconds:.2f}s / {rate:,.0f} rows/s")
+    print(f"전체 part 수 / 총 행 수: {len(paths)} / {len(df)}")
+
+    valid = df[df["churn_prob"].notna()] if "churn_prob" in df.columns else df.iloc[0:0]
+    print(f"예측 실패 행 수      : {len(df) - len(valid)}")
+    if valid.empty:
+        print("=" * 60)
+        return
+
+    probs = valid["churn_prob"].to_numpy(dtype=float)
+    print(f"예측 확률 평균 (churn_prob 평균): {probs.mean():.4f}")
+    print(f"threshold={PRED_THRESHOLD:.2f} 기준 예측 이탈률: {(probs >= PRED_THRESHOLD).mean():.4f}")
+    if "risk_level" in valid.columns:
+        counts = valid["risk_level"].value_counts()
+        print("위험도 분포          : " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+
+    if "is_churned" in valid.columns:
+        actual = pd.to_numeric(valid["is_churned"], errors="coerce").to_numpy(dtype=float)
+        labeled = ~np.isnan(actual)
+        if labeled.any():
+            p, y = probs[labeled], actual[labeled]
+            print(f"실제 이탈률 (is_churned 평균): {y.mean():.4f}")
+            print(f"Brier score          : {np.mean((p - y) ** 2):.4f}")
+
+            # 10분위 캘리브레이션 (예측 확률 구간별 평균 예측 vs 실제 이탈률)
+            deciles = pd.qcut(p, q=10, labels=False, duplicates="drop")
+            calib = (
+                pd.DataFrame({"decile": deciles, "pred": p, "actual": y})
+                .groupby("decile")
+                .agg(n=("pred", "size"), mean_pred=("pred", "mean"), actual_rate=("actual", "mean"))
+            )
+            calib["gap"] = calib["mean_pred"] - calib["actual_rate"]
+            print("\n▶ 10분위 캘리브레이션:")
+            print(calib.to_string(float_format=lambda v: f"{v:.4f}"))
+    print("=" * 60)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="입력 CSV 전체에 대한 오프라인 이탈 확률 일괄 계산")
+    parser.add_argument("--input", default=DATA_PATH, help=f"입력 CSV 경로 (기본: {DATA_PATH})")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="part 파일 출력 디렉토리")
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME, help="모델 이름 (backend/models.py 키)")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="청크 당 행 수")
+    parser.add_argument("--workers", type=int, default=1, help="예측 프로세스 수 (1 이면 현재 프로세스)")
+    parser.add_argument(
+        "--format",
+        choices=["parquet", "csv"],
+        default="parquet" if _HAS_PARQUET else "csv",
+        help="part 파일 형식 (parquet 은 pyarrow/fastparquet 필요)",
+    )
+    parser.add_argument("--no-resume", dest="resume", action="store_false", help="기존 part 를 지우고 처음부터 계산")
+    parser.add_argument("--merge-csv", default=None, help="모든 part 를 합친 CSV 를 추가로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and not _HAS_PARQUET:
+        parser.error("parquet 출력에는 pyarrow 또는 fastparquet 이 필요합니다. --format csv 를 사용하세요.")
+    args.chunk_size = max(1, args.chunk_size)
+    return args
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    print(f"이탈 확률 계산 시작: {args.input} (chunk={args.chunk_size}, workers={args.workers}, format={args.format})")
+
+    run_stats = run_scoring(args)
+    summarize(args.output_dir, args.format, run_stats)
+
+    if args.merge_csv:
+        paths = sorted(glob.glob(os.path.join(args.output_dir, f"part-*.{args.format}")))
+        _read_parts(paths, args.format).to_csv(args.merge_csv, index=False, encoding="utf-8-sig")
+        print(f"\n예측 결과 저장 완료: {args.merge_csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+compiled_ensemble.py
+Auth: 신지용
+LightGBM 이진 분류 앙상블(여러 LGBMClassifier 의 확률 평균)을
+평탄화된 트리 배열로 컴파일해 NumPy 로 한 번에 평가하는 모듈.
+
+기존 6피처 시뮬레이터 추론은 요청(행)마다
+1행짜리 DataFrame 을 만들고 앙상블 멤버 수만큼 predict_proba 를 호출했습니다.
+CompiledLGBMEnsemble 은 모든 멤버의 트리를 하나의 노드 테이블로 합쳐 두고,
+(행 수 × 트리 수) 노드 인덱스 행렬을 깊이 방향으로 한 번에 전진시켜
+리프 값을 구한 뒤 멤버별 sigmoid → 평균 확률을 계산합니다.
+
+분기 규칙은 LightGBM 의 수치형 분기(NumericalDecision)와 동일합니다.
+- missing_type 이 NaN 이 아니면 NaN 값은 0 으로 취급
+- (missing_type == Zero 이고 값이 0) 또는 (missing_type == NaN 이고 값이 NaN)
+  → default_left 방향
+- 그 외: 값 <= threshold 이면 왼쪽
+
+범주형 분기, linear tree, 다중 클래스, rf(average_output) 모델처럼
+위 규칙으로 표현할 수 없는 경우 `compile_lgbm_ensemble()` 은 None 을 반환하며,
+호출 측은 멤버별 predict_proba 평균(기존 방식)을 사용합니다.
+
+역할 분리:
+- 시뮬레이터 학습/저장 → `backend/training/train_simulator_6feat_lgbm_mono.py`
+- 앙상블 컴파일/평가   → 이 모듈
+- 6피처 추론 API       → `backend/inference_sim_6feat_lgbm.py`
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# LightGBM 의 kZeroThreshold
+_ZERO_THRESHOLD = 1e-35
+
+# missing_type 코드
+_MISSING_NONE, _MISSING_ZERO, _MISSING_NAN = 0, 1, 2
+_MISSING_CODES = {"None": _MISSING_NONE, "Zero": _MISSING_ZERO, "NaN": _MISSING_NAN}
+
+# (행 수 × 트리 수) 작업 행렬 한 번에 다룰 최대 원소 수 (메모리 상한)
+_MAX_WORK_ELEMENTS = 2_000_000
+
+
+class _UnsupportedModel(Exception):
+    """컴파일할 수 없는 모델 구조"""
+
+
+@dataclass(frozen=True)
+class CompiledLGBMEnsemble:
+    """
+    여러 LightGBM 이진 분류 모델의 트리를 하나로 합친 노드 테이블.
+
+    - 리프 노드는 왼쪽/오른쪽 자식이 자기 자신을 가리키므로,
+      최대 깊이만큼 전진시키면 모든 트리가 리프에 도달합니다.
+    """
+
+    n_features: int
+    n_models: int
+    feature: np.ndarray        # (n_nodes,) int
+    threshold: np.ndarray      # (n_nodes,) float
+    missing_type: np.ndarray   # (n_nodes,) int8
+    default_left: np.ndarray   # (n_nodes,) bool
+    left: np.ndarray           # (n_nodes,) int
+    right: np.ndarray          # (n_nodes,) int
+    value: np.ndarray          # (n_nodes,) float, 리프가 아니면 0
+    is_leaf: np.ndarray        # (n_nodes,) bool
+    tree_roots: np.ndarray     # (n_trees,) int
+    tree_model: np.ndarray     # (n_trees,) int, 트리가 속한 멤버 인덱스
+    sigmoid: np.ndarray        # (n_models,) float
+    max_depth: int
+
+    def _raw_scores(self, X: np.ndarray) -> np.ndarray:
+        """(n_rows, n_features) → 멤버별 raw score (n_rows, n_models)"""
+        n_rows = X.shape[0]
+        cur = np.broadcast_to(self.tree_roots, (n_rows, len(self.tree_roots))).copy()
+        row_idx = np.arange(n_rows)[:, None]
+
+        for _ in range(self.max_depth):
+            if self.is_leaf[cur].all():
+                break
+            fval = X[row_idx, self.feature[cur]]
+            mtype = self.missing_type[cur]
+            is_nan = np.isnan(fval)
+            fval = np.where(is_nan & (mtype != _MISSING_NAN), 0.0, fval)
+            use_default = ((mtype == _MISSING_ZERO) & (np.abs(fval) <= _ZERO_THRESHOLD)) | (
+                (mtype == _MISSING_NAN) & is_nan
+            )
+            go_left = np.where(use_default, self.default_left[cur], fval <= self.threshold[cur])
+            cur = np.where(go_left, self.left[cur], self.right[cur])
+
+        leaf_values = self.value[cur]
+        raw = np.zeros((n_rows, self.n_models))
+        for m in range(self.n_models):
+            raw[:, m] = leaf_values[:, self.tree_model == m].sum(axis=1)
+        return raw
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        양성 클래스 확률 (멤버별 확률의 평균)을 반환합니다.
+
+        Args:
+            X: (n_rows, n_features) float 배열 (컬럼 순서 = 학습 시 피처 순서)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"입력 피처 수가 맞지 않습니다: {X.shape[1]} (기대값 {self.n_features})")
+
+        n_rows = X.shape[0]
+        out = np.empty(n_rows)
+        step = max(1, _MAX_WORK_ELEMENTS // max(1, len(self.tree_roots)))
+        for start in range(0, n_rows, step):
+            raw = self._raw_scores(X[start:start + step])
+            out[start:start + step] = (1.0 / (1.0 + np.exp(-self.sigmoid * raw))).mean(axis=1)
+        return out
+
+
+def _parse_sigmoid(objective: str) -> float:
+    if not objective.startswith("binary"):
+        raise _UnsupportedModel(f"이진 분류 모델이 아닙니다: {objective!r}")
+    match = re.search(r"sigmoid:([0-9.eE+-]+)", objective)
+    return float(match.group(1)) if match else 1.0
+
+
+def _flatten_tree(
+    node: Dict[str, Any],
+    nodes: List[tuple],
+    depth: int = 0,
+) -> tuple:
+    """
+    dump_model() 의 tree_structure 를 재귀적으로 노드 리스트에 추가합니다.
+
+    Returns:
+        (이 노드의 인덱스, 서브트리 최대 깊이)
+    """
+    idx = len(nodes)
+    if "leaf_value" in node:
+        nodes.append((0, 0.0, _MISSING_NONE, False, idx, idx, float(node["leaf_value"]), True))
+        return idx, depth
+
+    if node.get("decision_type", "<=") != "<=":
+        raise _UnsupportedModel("범주형 분기는 지원하지 않습니다.")
+    missing = _MISSING_CODES.get(str(node.get("missing_type", "None")))
+    if missing is None:
+        raise _UnsupportedModel(f"알 수 없는 missing_type: {node.get('missing_type')!r}")
+
+    nodes.append(None)  # 자식 인덱스를 알게 된 뒤 채움
+    left_idx, left_depth = _flatten_tree(node["left_child"], nodes, depth + 1)
+    right_idx, right_depth = _flatten_tree(node["right_child"], nodes, depth + 1)
+    nodes[idx] = (
+        int(node["split_feature"]),
+        float(node["threshold"]),
+        missing,
+        bool(node.get("default_left", True)),
+        left_idx,
+        right_idx,
+        0.0,
+        False,
+    )
+    return idx, max(left_depth, right_depth)
+
+
+def compile_lgbm_ensemble(models: Sequence[Any]) -> Optional[CompiledLGBMEnsemble]:
+    """
+    LGBMClassifier (또는 lightgbm.Booster) 리스트를 CompiledLGBMEnsemble 로 컴파일합니다.
+
+    - 각 멤버는 predict_proba 와 같은 반복 수(best_iteration 이 있으면 그 값)까지의 트리를 사용합니다.
+    - 지원하지 않는 구조이면 None 을 반환합니다.
+    """
+    if not models:
+        return None
+
+    nodes: List[tuple] = []
+    roots: List[int] = []
+    owners: List[int] = []
+    sigmoids: List[float] = []
+    n_features: Optional[int] = None
+    max_depth = 0
+
+    try:
+        for m_idx, model in enumerate(models):
+            booster = getattr(model, "booster_", model)
+            if not hasattr(booster, "dump_model"):
+                return None
+            dump = booster.dump_model()
+
+            if dump.get("num_class", 1) != 1 or dump.get("num_tree_per_iteration", 1) != 1:
+                raise _UnsupportedModel("다중 클래스 모델은 지원하지 않습니다.")
+            if dump.get("average_output", False):
+                raise _UnsupportedModel("rf(average_output) 모델은 지원하지 않습니다.")
+            sigmoids.append(_parse_sigmoid(str(dump.get("objective", ""))))
+
+            model_features = int(dump["max_feature_idx"]) + 1
+            if n_features is None:
+                n_features = model_features
+            elif n_features != model_features:
+                raise _UnsupportedModel("앙상블 멤버 간 피처 수가 다릅니다.")
+
+            for tree in dump["tree_info"]:
+                if tree.get("is_linear", False):
+                    raise _UnsupportedModel("linear tree 는 지원하지 않습니다.")
+                root, depth = _flatten_tree(tree["tree_structure"], nodes)
+                roots.append(root)
+                owners.append(m_idx)
+                max_depth = max(max_depth, depth)
+    except _UnsupportedModel:
+        return None
+
+    columns = list(zip(*nodes)) if nodes else [[] for _ in range(8)]
+    return CompiledLGBMEnsemble(
+        n_features=int(n_features or 0),
+        n_models=len(models),
+        feature=np.asarray(columns[0], dtype=np.intp),
+        threshold=np.asarray(columns[1], dtype=np.float64),
+        missing_type=np.asarray(columns[2], dtype=np.int8),
+        default_left=np.asarray(columns[3], dtype=bool),
+        left=np.asarray(columns[4], dtype=np.intp),
+        right=np.asarray(columns[5], dtype=np.intp),
+        value=np.asarray(columns[6], dtype=np.float64),
+        is_leaf=np.asarray(columns[7], dtype=bool),
+        tree_roots=np.asarray(roots, dtype=np.intp),
+        tree_model=np.asarray(owners, dtype=np.intp),
+        sigmoid=np.asarray(sigmoids, dtype=np.float64),
+        max_depth=max_depth,
+    )
+
+
+__all__ = ["CompiledLGBMEnsemble", "compile_lgbm_ensemble"]
@@ -45,6 +45,22 @@ METRICS_PATH: str = "models/metrics.json"
 # - models 디렉토리 아래에 저장
 MODEL_PKL_PATH: str = "models/model_lk.pkl"
 
+# 학습 시 fit 된 ColumnTransformer(preprocessor) pkl 경로
+# - preprocessing_pipeline.save_processed_data() 가 저장
+PREPROCESSOR_PKL_PATH: str = "data/processed/preprocessor.pkl"
+
+# 서비스 추론용 번들 (preprocessor + 모델 + 입력 컬럼 순서 + threshold + schema hash)
+# - inference.py 는 이 파일 하나만 로드 (학습 행렬 pkl 은 로드하지 않음)
+# - 생성: python backend/inference_bundle.py 또는 training/train_experiments.py
+INFERENCE_BUNDLE_PATH: str = "models/inference_bundle.pkl"
+
+
+# -----------------------------------------------------
+# 위험도 레벨 기준 (churn_prob 기준)
+# -----------------------------------------------------
+# churn_prob < medium → LOW, < high → MEDIUM, 그 이상 → HIGH
+RISK_THRESHOLDS: dict[str, float] = {"medium": 0.30, "high": 0.60}
+
 
 __all__ = [
     "DATA_PATH",
@@ -56,6 +72,9 @@ __all__ = [
     "THRESH_STEP",
     "METRICS_PATH",
     "MODEL_PKL_PATH",
+    "PREPROCESSOR_PKL_PATH",
+    "INFERENCE_BUNDLE_PATH",
+    "RISK_THRESHOLDS",
 ]
 
 
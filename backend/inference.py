@@ -7,15 +7,28 @@ Auth: 신지용
 이탈 확률(churn_prob)을 계산하는 추론 모듈입니다.
 
 현재 로직은:
-- `data/processed`에 저장된 전처리 아티팩트
-  (`preprocess_and_split` + `save_processed_data`)에서 preprocessor 를 로드하고,
-- 서비스용 최종 모델 pkl(`backend.config.MODEL_PKL_PATH`)이 있으면
+- 추론 번들(`backend.config.INFERENCE_BUNDLE_PATH`)이 있으면
+  preprocessor + 모델 + 입력 컬럼 순서 + threshold 를 이 파일 하나에서 로드합니다.
+  (`backend/inference_bundle.py` 참고, 학습 행렬 pkl 은 로드하지 않음)
+- 번들이 없으면 `data/processed/preprocessor.pkl` 만 로드하고,
+  서비스용 최종 모델 pkl(`backend.config.MODEL_PKL_PATH`)이 있으면
   이를 `joblib.load` 해서 메모리에 캐시한 뒤 예측에 사용합니다.
-- pkl 이 없는 경우에만, 전처리된 학습 데이터(`X_train_processed`, `y_train`)를 이용해
+- 모델 pkl 도 없는 경우에만, 전처리된 학습 데이터(`X_train_processed`, `y_train`)를 이용해
   모델을 1회 학습한 후 캐시하여 사용합니다.
 
+예측 결과 캐시:
+- (모델 버전, 입력 피처 지문) → churn_prob 를 TTL/LRU 캐시(`backend/cache.py`)에 보관합니다.
+- 피처 지문은 입력 스키마 컬럼 순서로 정규화한 값의 해시이므로,
+  같은 유저라도 피처가 바뀌면 다른 키가 되어 이전 결과를 쓰지 않습니다.
+- predict_churn / predict_churn_batch 가 같은 캐시를 공유하며,
+  get_prediction_cache_stats() 로 hit/miss 를 확인할 수 있습니다.
+  (PREDICTION_CACHE_SIZE / PREDICTION_CACHE_TTL 환경 변수, TTL 0 이면 캐시 끔)
+- 지문은 행마다 파이썬에서 계산하므로, PREDICTION_CACHE_MAX_BATCH(기본 256)행을 넘는
+  배치는 캐시를 거치지 않고 전체를 한 번에 예측합니다. (벡터화 예측이 더 빠름)
+
 역할 분리:
 - 전처리/아티팩트 저장 → `backend/preprocessing_pipeline.py`
+- 추론 번들 저장/로드  → `backend/inference_bundle.py`
 - 모델 종류/파라미터   → `backend/models.py`의 `get_model()`
 - 최종 모델 경로       → `backend.config.MODEL_PKL_PATH`
 - 단일/배치 예측 API   → 이 모듈의 `predict_churn` 및 `backend/app.py`의 관련 엔드포인트
@@ -38,16 +51,28 @@ Auth: 신지용
 
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
+import hashlib
+import math
 import os
+import pickle
 import joblib
 import numpy as np
 import pandas as pd
 
-from backend.config import DEFAULT_MODEL_NAME, RANDOM_STATE, MODEL_PKL_PATH
+from backend.config import (
+    DEFAULT_MODEL_NAME,
+    INFERENCE_BUNDLE_PATH,
+    MODEL_PKL_PATH,
+    PREPROCESSOR_PKL_PATH,
+    RANDOM_STATE,
+    RISK_THRESHOLDS,
+)
+from backend.cache import TTLCache
+from backend.inference_bundle import load_inference_bundle
+from backend.input_schema import InputSchema, compile_input_schema
 from backend.models import get_model
-from backend.preprocessing_pipeline import load_processed_data
 
 
 # ---------------------------------------------------------
@@ -55,26 +80,52 @@ from backend.preprocessing_pipeline import load_processed_data
 # ---------------------------------------------------------
 _ARTIFACTS_LOADED: bool = False
 _PREPROCESSOR = None
+_INPUT_SCHEMA: Optional[InputSchema] = None
+_RISK_THRESHOLDS: Dict[str, float] = dict(RISK_THRESHOLDS)
+_SCHEMA_HASH: Optional[str] = None
 _MODEL_CACHE: Dict[str, Any] = {}
 
+# (모델 버전, 피처 지문) → churn_prob
+_PREDICTION_CACHE = TTLCache(
+    ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL", 3600)),
+    maxsize=int(os.getenv("PREDICTION_CACHE_SIZE", 50000)),
+)
+# 이 행 수를 넘는 배치는 캐시 조회/저장 없이 바로 예측
+PREDICTION_CACHE_MAX_BATCH = int(os.getenv("PREDICTION_CACHE_MAX_BATCH", 256))
+
 def _load_artifacts_if_needed() -> None:
     """
-    data/processed/*.pkl 에 저장된 전처리 결과를 로드하고,
-    ColumnTransformer(preprocessor) 객체를 메모리에 적재합니다.
+    추론에 필요한 아티팩트를 메모리에 적재합니다.
 
-    - X_train_processed, X_test_processed: 사용하지 않고 버립니다(이미 변환된 행렬)
-    - y_train, y_test: 현재는 사용하지 않지만, 필요 시 확장 가능
+    1) models/inference_bundle.pkl 이 있으면 번들 하나만 로드
+       - preprocessor, 모델, 입력 컬럼 순서, threshold, schema_hash
+    2) 없으면 data/processed/preprocessor.pkl 만 로드
+       - 학습/테스트 행렬 pkl(X_train_processed 등)은 로드하지 않습니다.
+    3) 어느 쪽이든 preprocessor 에서 입력 스키마(InputSchema)를 1회 컴파일합니다.
     """
-    global _ARTIFACTS_LOADED, _PREPROCESSOR
+    global _ARTIFACTS_LOADED, _PREPROCESSOR, _INPUT_SCHEMA, _RISK_THRESHOLDS, _SCHEMA_HASH
 
     if _ARTIFACTS_LOADED and _PREPROCESSOR is not None:
         return
 
-    # backend/preprocessing_pipeline.save_processed_data() 가 저장한 경로를 그대로 사용
-    _, _, _, _, preprocessor = load_processed_data(save_dir="data/processed")
-
+    if os.path.exists(INFERENCE_BUNDLE_PATH):
+        bundle = load_inference_bundle(INFERENCE_BUNDLE_PATH)
+        preprocessor = bundle["preprocessor"]
+        _RISK_THRESHOLDS = {
+            "medium": float(bundle["thresholds"].get("medium", RISK_THRESHOLDS["medium"])),
+            "high": float(bundle["thresholds"].get("high", RISK_THRESHOLDS["high"])),
+        }
+        _SCHEMA_HASH = bundle["schema_hash"]
+        _MODEL_CACHE[bundle["model_name"]] = bundle["model"]
+    else:
+        # backend/preprocessing_pipeline.save_processed_data() 가 저장한 preprocessor 만 로드
+        with open(PREPROCESSOR_PKL_PATH, "rb") as f:
+            preprocessor = pickle.load(f)
+
+    _INPUT_SCHEMA = compile_input_schema(preprocessor)
     _PREPROCESSOR = preprocessor
     _ARTIFACTS_LOADED = True
+    _PREDICTION_CACHE.clear()
 
 
 def _get_or_train_model(model_name: str) -> Any:
@@ -83,6 +134,7 @@ def _get_or_train_model(model_name: str) -> Any:
     없으면 (백업용으로) data/processed/X_train_processed.pkl, y_train.pkl 기준으로 1회 학습합니다.
 
     주의:
+        - 추론 번들이 로드된 경우, 번들의 모델이 해당 이름으로 이미 캐시되어 있습니다.
         - 서비스 환경에서는 별도 model.pkl 로 저장해 두는 것이 이상적이며,
           우선적으로 MODEL_PKL_PATHS 에 정의된 pkl 파일을 joblib.load 해서 사용합니다.
         - 해당 pkl 이 없을 때만, 이전처럼 전처리된 행렬을 이용해 1회 학습하는 패턴을 사용합니다.
@@ -117,38 +169,146 @@ def _build_input_dataframe(
     """
     단일 유저 피처 딕셔너리를 ColumnTransformer 에 들어갈 pandas.DataFrame 형태로 변환합니다.
 
-    - 전처리기에 등록된 숫자/범주형 컬럼 목록을 조회해,
+    - 아티팩트 로드 시 컴파일된 입력 스키마(_INPUT_SCHEMA)의 컬럼 순서를 사용해,
       해당 컬럼들만 1행짜리 DataFrame 으로 생성합니다.
     - 딕셔너리에 없는 컬럼은 NaN 으로 채워 두고, 이후 SimpleImputer 가 처리합니다.
+    - predict_churn 은 보통 _INPUT_SCHEMA.transform_row() 를 쓰고,
+      스키마가 이를 지원하지 않을 때만 이 함수를 사용합니다.
+    """
+    if _PREPROCESSOR is None or _INPUT_SCHEMA is None:
+        raise RuntimeError("전처리기가 아직 로드되지 않았습니다. _load_artifacts_if_needed()를 먼저 호출하세요.")
+
+    return _INPUT_SCHEMA.build_dataframe(user_features)
+
+
+def _transform_single(user_features: Mapping[str, Any]) -> np.ndarray:
+    """단일 유저 피처 → 전처리된 (1, n_features) 배열 (가능하면 DataFrame 생성 없이)"""
+    if _INPUT_SCHEMA is not None and _INPUT_SCHEMA.fast_path:
+        return _INPUT_SCHEMA.transform_row(user_features)
+    return _PREPROCESSOR.transform(_build_input_dataframe(user_features))
+
+
+BatchInput = Union[Sequence[Mapping[str, Any]], pd.DataFrame, np.ndarray]
+
+
+def _build_batch_dataframe(records: BatchInput) -> Tuple[pd.DataFrame, List[Optional[str]]]:
+    """
+    여러 유저의 피처를 한 번에 ColumnTransformer 입력용 DataFrame 으로 변환합니다.
+
+    - records: dict 리스트 / DataFrame / 2차원 ndarray (컬럼 순서 = _INPUT_SCHEMA.columns)
+    - 행 단위로 1행짜리 DataFrame 을 만들지 않고, 컬럼 단위로 한 번에 구성합니다.
+    - 숫자형 컬럼은 한 번에 숫자로 변환하고, 숫자로 바꿀 수 없는 값이 있는 행은 오류로 표시합니다.
+      (inf/-inf 는 NaN 으로 바꿔 imputer 가 처리)
+
+    Returns:
+        (DataFrame, 행별 오류 메시지 리스트 - 정상 행은 None)
     """
-    if _PREPROCESSOR is None:
+    if _PREPROCESSOR is None or _INPUT_SCHEMA is None:
         raise RuntimeError("전처리기가 아직 로드되지 않았습니다. _load_artifacts_if_needed()를 먼저 호출하세요.")
 
-    # ColumnTransformer 에서 실제로 사용하는 컬럼 이름들만 수집
-    used_columns = []
-    for name, _, cols in _PREPROCESSOR.transformers_:
-        # backend.preprocessing_pipeline.build_preprocessor 에서
-        # ("num", numeric_pipeline, numerical_features),
-        # ("cat_ohe", categorical_pipeline, categorical_features)
-        # 형태로 등록되어 있으므로 이 두 가지 이름만 사용합니다.
-        if name in ("num", "cat_ohe"):
-            used_columns.extend(list(cols))
-
-    # 중복 제거 + 순서 유지
-    seen = set()
-    ordered_cols = []
-    for c in used_columns:
-        if c not in seen:
-            seen.add(c)
-            ordered_cols.append(c)
-
-    # 유저가 준 피처 딕셔너리에서 값 채우기 (없으면 NaN)
-    row: Dict[str, Any] = {}
-    for col in ordered_cols:
-        row[col] = user_features.get(col, np.nan)
-
-    df = pd.DataFrame([row], columns=ordered_cols)
-    return df
+    ordered_cols = list(_INPUT_SCHEMA.columns)
+
+    if isinstance(records, pd.DataFrame):
+        df = records.reindex(columns=ordered_cols).reset_index(drop=True)
+        errors: List[Optional[str]] = [None] * len(df)
+    elif isinstance(records, np.ndarray):
+        arr = records.reshape(1, -1) if records.ndim == 1 else records
+        if arr.ndim != 2 or arr.shape[1] != len(ordered_cols):
+            raise ValueError(
+                f"ndarray 입력은 (n_rows, {len(ordered_cols)}) 형태여야 합니다. 입력: {records.shape}"
+            )
+        df = pd.DataFrame(arr, columns=ordered_cols)
+        errors = [None] * len(df)
+    else:
+        records = list(records)
+        errors = [None if isinstance(r, Mapping) else "행이 dict 형태가 아닙니다." for r in records]
+        df = pd.DataFrame(
+            [r if isinstance(r, Mapping) else {} for r in records],
+            columns=ordered_cols,
+        )
+
+    # 숫자형 컬럼 일괄 변환
+    for col in _INPUT_SCHEMA.numeric_columns:
+        raw = df[col]
+        if pd.api.types.is_bool_dtype(raw):
+            converted = raw.astype(float)
+        else:
+            converted = pd.to_numeric(raw, errors="coerce")
+        bad = converted.isna() & raw.notna()
+        for i in np.flatnonzero(bad.to_numpy()):
+            if errors[i] is None:
+                errors[i] = f"'{col}' 값을 숫자로 변환할 수 없습니다: {raw.iloc[i]!r}"
+        df[col] = converted.astype(float).replace([np.inf, -np.inf], np.nan)
+
+    return df, errors
+
+
+def _model_version(model_name: str, model: Any) -> str:
+    """캐시 키용 모델 버전 (모델 이름 + 번들 schema_hash + 로드된 모델 객체)"""
+    return f"{model_name}:{_SCHEMA_HASH or '-'}:{id(model):x}"
+
+
+# 범주형 입력에 키 자체가 없는 경우 (배치 입력의 NaN 과 같은 취급)
+_MISSING_CATEGORY = object()
+
+
+def _feature_fingerprint(values: Sequence[Any]) -> bytes:
+    """
+    _INPUT_SCHEMA.columns 순서의 입력값 → 16바이트 해시
+
+    정규화 규칙 (전처리에서 같은 결과가 되는 입력은 같은 지문):
+    - 숫자형: None/NaN → None, 그 외 float
+    - 범주형: 키 없음/NaN → "결측"(대체값으로 채워짐), None → None(미등록 범주), 그 외 repr
+    """
+    normalized = []
+    n_numeric = len(_INPUT_SCHEMA.numeric_columns)
+    for i, value in enumerate(values):
+        if i < n_numeric:
+            value = None if value is None else float(value)
+            normalized.append(None if value is None or math.isnan(value) else value)
+        elif value is _MISSING_CATEGORY or (isinstance(value, float) and math.isnan(value)):
+            normalized.append("<missing>")
+        else:
+            normalized.append(None if value is None else repr(value))
+    return hashlib.blake2b(repr(normalized).encode("utf-8"), digest_size=16).digest()
+
+
+
+def _single_fingerprint(user_features: Mapping[str, Any]) -> Optional[bytes]:
+    """단일 입력 dict 의 피처 지문 (숫자로 바꿀 수 없거나 inf 이면 None → 캐시 미사용)"""
+    values = []
+    for col in _INPUT_SCHEMA.numeric_columns:
+        value = user_features.get(col)
+        if value is not None:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                return None
+            if math.isinf(value):
+                return None
+        values.append(value)
+    for col in _INPUT_SCHEMA.categorical_columns:
+        values.append(user_features[col] if col in user_features else _MISSING_CATEGORY)
+    return _feature_fingerprint(values)
+
+
+def get_prediction_cache_stats() -> Dict[str, Any]:
+    """예측 결과 캐시 hit/miss 통계"""
+    return _PREDICTION_CACHE.stats()
+
+
+def clear_prediction_cache() -> None:
+    """예측 결과 캐시 비우기 (모델 파일 교체 등)"""
+    _PREDICTION_CACHE.clear()
+
+
+def _risk_levels_from_probs(probs: np.ndarray) -> np.ndarray:
+    """확률 배열을 위험도 레벨 배열로 한 번에 매핑 (_prob_to_risk_level 과 동일 기준)"""
+    return np.where(
+        probs < _RISK_THRESHOLDS["medium"],
+        "LOW",
+        np.where(probs < _RISK_THRESHOLDS["high"], "MEDIUM", "HIGH"),
+    ).astype(object)
 
 
 def _prob_to_risk_level(prob: float) -> str:
@@ -159,12 +319,12 @@ def _prob_to_risk_level(prob: float) -> str:
     - 0.30 이상 0.60 미만: MEDIUM
     - 0.60 이상: HIGH
 
-    필요 시, models/metrics.json 에 기록된 best_threshold 를 기준으로
-    규칙을 조정해도 됩니다.
+    기준값은 backend.config.RISK_THRESHOLDS 이며,
+    추론 번들이 로드된 경우 번들에 저장된 thresholds 를 사용합니다.
     """
-    if prob < 0.30:
+    if prob < _RISK_THRESHOLDS["medium"]:
         return "LOW"
-    if prob < 0.60:
+    if prob < _RISK_THRESHOLDS["high"]:
         return "MEDIUM"
     return "HIGH"
 
@@ -191,6 +351,7 @@ def predict_churn(
           "model_name": str,
           "churn_prob": float,   # 0.0 ~ 1.0
           "risk_level": str,     # "LOW" | "MEDIUM" | "HIGH"
+          "cached": bool,        # 예측 결과 캐시에서 가져왔는지
           "error": Optional[str] # 실패 시 에러 메시지
         }
     """
@@ -204,13 +365,7 @@ def predict_churn(
         # 1) 전처리기 로드
         _load_artifacts_if_needed()
 
-        # 2) 입력 DataFrame 구성
-        X_df = _build_input_dataframe(user_features)
-
-        # 3) 전처리(transform)
-        X_transformed = _PREPROCESSOR.transform(X_df)
-
-        # 4) 모델 로드/학습
+        # 2) 모델 로드/학습
         effective_model_name = (model_name or DEFAULT_MODEL_NAME).lower()
         model = _get_or_train_model(effective_model_name)
 
@@ -220,8 +375,21 @@ def predict_churn(
                 "error": f"모델 '{effective_model_name}' 은 predict_proba를 지원하지 않습니다.",
             }
 
-        # 5) 확률 예측
-        proba = float(model.predict_proba(X_transformed)[:, 1][0])
+        # 3) 같은 모델 + 같은 입력이면 캐시된 확률 사용
+        fingerprint = _single_fingerprint(user_features)
+        cache_key = (_model_version(effective_model_name, model), fingerprint)
+        proba = _PREDICTION_CACHE.get(cache_key) if fingerprint is not None else None
+        cached = proba is not None
+
+        if not cached:
+            # 4) 입력 구성 + 전처리 (컴파일된 입력 스키마로 미리 할당된 행을 채움)
+            X_transformed = _transform_single(user_features)
+
+            # 5) 확률 예측
+            proba = float(model.predict_proba(X_transformed)[:, 1][0])
+            if fingerprint is not None and math.isfinite(proba):
+                _PREDICTION_CACHE.set(cache_key, proba)
+
         risk_level = _prob_to_risk_level(proba)
 
         return {
@@ -229,6 +397,7 @@ def predict_churn(
             "model_name": effective_model_name,
             "churn_prob": proba,
             "risk_level": risk_level,
+            "cached": cached,
         }
 
     except Exception as e:  # pragma: no cover - 방어적 예외 처리
@@ -238,6 +407,132 @@ def predict_churn(
         }
 
 
-__all__ = ["predict_churn"]
+def predict_churn_batch(
+    records: BatchInput,
+    model_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    여러 유저의 피처를 한 번에 전처리/예측하는 배치 추론 함수.
+
+    Args:
+        records:
+            - dict 리스트: predict_churn 의 user_features 와 같은 형식
+            - pandas.DataFrame: 컬럼 이름 기준으로 사용 (없는 컬럼은 NaN)
+            - numpy.ndarray: (n_rows, n_input_columns), 컬럼 순서는 _INPUT_SCHEMA.columns 참고
+        model_name:
+            - None 이면 backend.config.DEFAULT_MODEL_NAME 사용
+
+    Returns:
+        {
+          "success": bool,             # 호출 자체의 성공 여부 (행 단위 오류와 별개)
+          "model_name": str,
+          "churn_prob": np.ndarray,    # float, 오류 행은 NaN
+          "risk_level": np.ndarray,    # object("LOW" | "MEDIUM" | "HIGH"), 오류 행은 None
+          "error_mask": np.ndarray,    # bool, True 인 행은 예측 실패
+          "errors": List[Optional[str]],  # 행별 오류 메시지 (정상 행은 None)
+          "cache_hits": int,           # 예측 결과 캐시에서 가져온 행 수
+          "error": Optional[str]       # 호출 자체가 실패한 경우의 메시지
+        }
+
+    행 하나가 잘못되어도 예외를 던지지 않고 error_mask 로 표시하며,
+    전처리/예측은 정상 행 전체에 대해 한 번씩만 수행합니다.
+    """
+    effective_model_name = (model_name or DEFAULT_MODEL_NAME).lower()
+    if isinstance(records, np.ndarray) and records.ndim == 1:
+        n_rows = 1
+    else:
+        records = records if isinstance(records, (pd.DataFrame, np.ndarray)) else list(records)
+        n_rows = len(records)
+
+    def _all_failed(message: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "model_name": effective_model_name,
+            "churn_prob": np.full(n_rows, np.nan),
+            "risk_level": np.full(n_rows, None, dtype=object),
+            "error_mask": np.ones(n_rows, dtype=bool),
+            "errors": [message] * n_rows,
+            "cache_hits": 0,
+            "error": message,
+        }
+
+    try:
+        _load_artifacts_if_needed()
+        model = _get_or_train_model(effective_model_name)
+        if not hasattr(model, "predict_proba"):
+            return _all_failed(f"모델 '{effective_model_name}' 은 predict_proba를 지원하지 않습니다.")
+
+        X_df, errors = _build_batch_dataframe(records)
+    except Exception as e:
+        return _all_failed(f"배치 예측 준비 중 오류 발생: {e}")
+
+    error_mask = np.array([err is not None for err in errors], dtype=bool)
+    probs = np.full(n_rows, np.nan)
+    risk_levels = np.full(n_rows, None, dtype=object)
+
+    valid_idx = np.flatnonzero(~error_mask)
+    cache_hits = 0
+    if len(valid_idx) > 0:
+        # 작은 배치: 캐시에 있는 행은 그대로 쓰고, 나머지 행만 한 번에 전처리/예측
+        # 큰 배치: 행별 지문 계산이 예측보다 느리므로 캐시 없이 전체 예측
+        use_cache = len(valid_idx) <= PREDICTION_CACHE_MAX_BATCH
+        keys = {}
+        valid_probs = np.full(len(valid_idx), np.nan)
+        miss_pos = list(range(len(valid_idx)))
+        if use_cache:
+            version = _model_version(effective_model_name, model)
+            miss_pos = []
+            for pos, row in enumerate(X_df.iloc[valid_idx].itertuples(index=False, name=None)):
+                key = (version, _feature_fingerprint(row))
+                cached_prob = _PREDICTION_CACHE.get(key)
+                if cached_prob is None:
+                    keys[pos] = key
+                    miss_pos.append(pos)
+                else:
+                    valid_probs[pos] = cached_prob
+            cache_hits = len(valid_idx) - len(miss_pos)
+
+        if miss_pos:
+            try:
+                miss_idx = valid_idx[miss_pos]
+                X_miss = X_df.iloc[miss_idx] if len(miss_idx) < n_rows else X_df
+                X_transformed = _PREPROCESSOR.transform(X_miss)
+                miss_probs = np.asarray(model.predict_proba(X_transformed)[:, 1], dtype=float)
+            except Exception as e:
+                return _all_failed(f"배치 예측 중 오류 발생: {e}")
+            valid_probs[miss_pos] = miss_probs
+            if use_cache:
+                for pos, prob in zip(miss_pos, miss_probs.tolist()):
+                    if math.isfinite(prob):
+                        _PREDICTION_CACHE.set(keys[pos], prob)
+
+        # 확률이 유한값이 아닌 행은 오류 처리
+        finite = np.isfinite(valid_probs)
+        for i in valid_idx[~finite]:
+            errors[i] = "예측 확률이 유효하지 않습니다 (NaN/inf)."
+        error_mask[valid_idx[~finite]] = True
+
+        ok_idx = valid_idx[finite]
+        ok_probs = np.clip(valid_probs[finite], 0.0, 1.0)
+        probs[ok_idx] = ok_probs
+        risk_levels[ok_idx] = _risk_levels_from_probs(ok_probs)
+
+    return {
+        "success": True,
+        "model_name": effective_model_name,
+        "churn_prob": probs,
+        "risk_level": risk_levels,
+        "error_mask": error_mask,
+        "errors": errors,
+        "cache_hits": cache_hits,
+    }
+
+
+__all__ = [
+    "predict_churn",
+    "predict_churn_batch",
+    "get_prediction_cache_stats",
+    "clear_prediction_cache",
+]
 
 
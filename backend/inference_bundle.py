@@ -0,0 +1,205 @@
+"""
+inference_bundle.py
+Auth: 신지용
+서비스 추론에 필요한 아티팩트를 하나의 파일(번들)로 묶어 저장/로드하는 모듈.
+
+번들 구성:
+- preprocessor   : 학습 시 fit 된 ColumnTransformer
+- model          : 서비스용 최종 분류 모델
+- model_name     : 모델 이름 (backend/models.py 의 MODEL_REGISTRY 키)
+- input_columns  : preprocessor 가 기대하는 입력 컬럼 순서
+- thresholds     : 위험도 레벨 기준 + (있으면) 학습 시 best threshold
+- schema_hash    : 입력 스키마 해시 (로드 시 preprocessor 와 일치 여부 검증)
+
+기존에는 추론 서버가 preprocessor 하나를 얻기 위해
+`load_processed_data()` 로 학습/테스트 행렬 pkl 4개를 모두 unpickle 했지만,
+번들을 사용하면 추론에 필요한 객체만 로드합니다.
+
+역할 분리:
+- 전처리/아티팩트 저장 → `backend/preprocessing_pipeline.py`
+- 번들 저장/로드       → 이 모듈
+- 번들 사용(추론)      → `backend/inference.py`
+
+사용 방법 (기존 preprocessor.pkl + model_lk.pkl 로 번들 생성):
+    python backend/inference_bundle.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import joblib
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.config import (
+    DEFAULT_MODEL_NAME,
+    INFERENCE_BUNDLE_PATH,
+    METRICS_PATH,
+    MODEL_PKL_PATH,
+    PREPROCESSOR_PKL_PATH,
+    RISK_THRESHOLDS,
+)
+
+
+# 번들 포맷이 바뀌면 올려서, 예전 번들을 잘못 해석하지 않도록 함
+BUNDLE_FORMAT_VERSION: int = 1
+
+# build_preprocessor() 에서 등록하는 transformer 이름
+_USED_TRANSFORMERS = ("num", "cat_ohe")
+
+
+def get_input_columns(preprocessor: Any) -> List[str]:
+    """
+    fit 된 ColumnTransformer 가 실제로 사용하는 입력 컬럼 목록을 순서대로 반환합니다.
+    (중복 제거 + 순서 유지)
+    """
+    ordered_cols: List[str] = []
+    seen = set()
+    for name, _, cols in preprocessor.transformers_:
+        if name not in _USED_TRANSFORMERS:
+            continue
+        for c in cols:
+            if c not in seen:
+                seen.add(c)
+                ordered_cols.append(c)
+    return ordered_cols
+
+
+def compute_schema_hash(preprocessor: Any) -> str:
+    """
+    preprocessor 의 입력 스키마(transformer 별 컬럼 목록 + 출력 피처 이름)를 해시합니다.
+
+    - 번들 저장 시 함께 기록하고, 로드 시 다시 계산해 비교합니다.
+    - 전처리 구성이 바뀌었는데 예전 번들을 쓰는 실수를 막기 위한 용도입니다.
+    """
+    schema: Dict[str, Any] = {
+        "transformers": [
+            [name, [str(c) for c in cols]]
+            for name, _, cols in preprocessor.transformers_
+            if name in _USED_TRANSFORMERS
+        ],
+    }
+    try:
+        schema["output_features"] = [str(c) for c in preprocessor.get_feature_names_out()]
+    except Exception:
+        # 오래된 sklearn 등으로 출력 피처 이름을 얻을 수 없으면 입력 컬럼만 사용
+        pass
+
+    payload = json.dumps(schema, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _load_best_threshold(model_name: str, metrics_path: str = METRICS_PATH) -> Optional[float]:
+    """models/metrics.json 에서 해당 모델의 가장 최근 best_threshold 를 조회 (없으면 None)"""
+    try:
+        with open(metrics_path, "r", encoding="utf-8") as f:
+            runs = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if isinstance(runs, dict):
+        runs = [runs]
+
+    for run in reversed(runs):
+        if str(run.get("model", "")).lower() == model_name.lower() and "best_threshold" in run:
+            return float(run["best_threshold"])
+    return None
+
+
+def build_inference_bundle(
+    preprocessor: Any,
+    model: Any,
+    model_name: str = DEFAULT_MODEL_NAME,
+    risk_thresholds: Optional[Dict[str, float]] = None,
+    best_threshold: Optional[float] = None,
+) -> Dict[str, Any]:
+    """추론용 번들 dict 를 구성합니다."""
+    thresholds: Dict[str, Any] = dict(risk_thresholds or RISK_THRESHOLDS)
+    if best_threshold is not None:
+        thresholds["best"] = float(best_threshold)
+
+    return {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "model_name": model_name.lower(),
+        "preprocessor": preprocessor,
+        "model": model,
+        "input_columns": get_input_columns(preprocessor),
+        "thresholds": thresholds,
+        "schema_hash": compute_schema_hash(preprocessor),
+        "created_at": datetime.now().isoformat(),
+    }
+
+
+def save_inference_bundle(bundle: Dict[str, Any], path: str = INFERENCE_BUNDLE_PATH) -> None:
+    """번들을 joblib 으로 저장합니다."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump(bundle, path)
+    print(f"💾 Inference bundle saved to {path} (schema_hash={bundle['schema_hash'][:12]})")
+
+
+def load_inference_bundle(path: str = INFERENCE_BUNDLE_PATH) -> Dict[str, Any]:
+    """
+    번들을 로드하고 포맷 버전/스키마 해시를 검증합니다.
+
+    Raises:
+        FileNotFoundError: 번들 파일이 없는 경우
+        ValueError: 포맷 버전 또는 스키마 해시가 맞지 않는 경우
+    """
+    bundle = joblib.load(path)
+
+    if not isinstance(bundle, dict) or bundle.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 추론 번들 형식입니다: {path}")
+
+    actual_hash = compute_schema_hash(bundle["preprocessor"])
+    if actual_hash != bundle.get("schema_hash"):
+        raise ValueError(
+            f"추론 번들의 schema_hash 가 preprocessor 와 일치하지 않습니다: {path}\n"
+            f"python backend/inference_bundle.py 로 번들을 다시 생성하세요."
+        )
+
+    return bundle
+
+
+def build_bundle_from_artifacts(
+    preprocessor_path: str = PREPROCESSOR_PKL_PATH,
+    model_path: str = MODEL_PKL_PATH,
+    model_name: str = DEFAULT_MODEL_NAME,
+    out_path: str = INFERENCE_BUNDLE_PATH,
+) -> Dict[str, Any]:
+    """이미 저장된 preprocessor.pkl + 모델 pkl 로 번들을 만들어 저장합니다."""
+    with open(preprocessor_path, "rb") as f:
+        preprocessor = pickle.load(f)
+    model = joblib.load(model_path)
+
+    bundle = build_inference_bundle(
+        preprocessor=preprocessor,
+        model=model,
+        model_name=model_name,
+        best_threshold=_load_best_threshold(model_name),
+    )
+    save_inference_bundle(bundle, out_path)
+    return bundle
+
+
+__all__ = [
+    "BUNDLE_FORMAT_VERSION",
+    "get_input_columns",
+    "compute_schema_hash",
+    "build_inference_bundle",
+    "save_inference_bundle",
+    "load_inference_bundle",
+    "build_bundle_from_artifacts",
+]
+
+
+if __name__ == "__main__":
+    build_bundle_from_artifacts()
@@ -7,15 +7,21 @@ Auth: 신지용
 학습/저장한 단조 제약 LGBM 모델을 로드하여,
 관리자 시뮬레이터 화면에서 조정한 6개 피처로 이탈 확률을 계산합니다.
 
+앙상블 멤버들은 로드 시 `backend/compiled_ensemble.py` 로 한 번 컴파일해 두고,
+- 소수 행(단일 유저 시뮬레이터 등)은 컴파일된 트리 배열로 NumPy 평가
+- 여러 행은 멤버별 predict_proba 를 배치 전체에 한 번씩만 호출
+합니다. (환경변수 SIM_LGBM_COMPILED=0 이면 컴파일 경로를 끕니다.)
+
 역할 분리:
 - 시뮬레이터 학습/저장 → `backend/training/train_simulator_6feat_lgbm_mono.py`
-- 6피처 추론          → 이 모듈의 `predict_churn_6feat_lgbm`
+- 앙상블 컴파일/평가   → `backend/compiled_ensemble.py`
+- 6피처 추론          → 이 모듈의 `predict_churn_6feat_lgbm`, `predict_churn_6feat_lgbm_batch`
 - API 연동            → `backend/app.py`의 `/api/predict_churn_6feat`
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 import os
 import sys
@@ -27,6 +33,8 @@ import pandas as pd
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from backend.compiled_ensemble import compile_lgbm_ensemble
+
 
 SIM_FEATURES = [
     "app_crash_count_30d",
@@ -39,6 +47,17 @@ SIM_FEATURES = [
 
 MODEL_PATH = os.path.join("models", "lgbm_sim_6feat_mono.pkl")
 
+# 컴파일된 트리 배열 평가 사용 여부
+USE_COMPILED_ENSEMBLE = os.getenv("SIM_LGBM_COMPILED", "1") != "0"
+
+# 이 행 수 이하일 때만 컴파일 경로 사용
+# (행이 많으면 LightGBM 네이티브 predict_proba 를 멤버별 1회 호출하는 쪽이 더 빠름)
+COMPILED_MAX_ROWS = 4
+
+# 위험도 기준 (train_simulator_6feat_lgbm_mono.py 에서 Best Threshold ~= 0.23)
+RISK_MEDIUM_THRESHOLD = 0.23
+RISK_HIGH_THRESHOLD = 0.60
+
 _SIM_MODEL = None
 
 
@@ -57,11 +76,17 @@ def _load_sim_model() -> Any:
     
     # 새로운 앙상블 형식인지 확인 (dict with 'models' key)
     if isinstance(loaded, dict) and 'models' in loaded:
-        _SIM_MODEL = loaded  # 앙상블 정보 전체 저장
+        model_info = loaded  # 앙상블 정보 전체 저장
     else:
         # 레거시 단일 모델 형식
-        _SIM_MODEL = {'models': [loaded], 'n_models': 1}
-    
+        model_info = {'models': [loaded], 'n_models': 1}
+
+    # 지원하지 않는 구조이면 None (멤버별 predict_proba 평균 사용)
+    model_info['compiled'] = (
+        compile_lgbm_ensemble(model_info['models']) if USE_COMPILED_ENSEMBLE else None
+    )
+
+    _SIM_MODEL = model_info
     return _SIM_MODEL
 
 
@@ -75,13 +100,86 @@ def _prob_to_risk_level(prob: float) -> str:
 
     (train_simulator_6feat_lgbm_mono.py 에서 Best Threshold ~= 0.23)
     """
-    if prob < 0.23:
+    if prob < RISK_MEDIUM_THRESHOLD:
         return "LOW"
-    if prob < 0.60:
+    if prob < RISK_HIGH_THRESHOLD:
         return "MEDIUM"
     return "HIGH"
 
 
+def _risk_levels_from_probs(probs: np.ndarray) -> np.ndarray:
+    """확률 배열을 위험도 레벨 배열로 한 번에 매핑 (_prob_to_risk_level 과 동일 기준)"""
+    return np.where(
+        probs < RISK_MEDIUM_THRESHOLD,
+        "LOW",
+        np.where(probs < RISK_HIGH_THRESHOLD, "MEDIUM", "HIGH"),
+    ).astype(object)
+
+
+BatchInput = Union[Sequence[Mapping[str, Any]], pd.DataFrame, np.ndarray]
+
+
+def _build_feature_matrix(records: BatchInput) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """
+    6피처 입력을 (n_rows, 6) float 배열로 변환합니다. (컬럼 순서 = SIM_FEATURES)
+
+    - dict 리스트 / DataFrame: 없는 컬럼은 NaN (모델이 결측으로 처리)
+    - ndarray: (n_rows, 6) 또는 (6,)
+    - 숫자로 바꿀 수 없는 값이 있는 행은 오류로 표시합니다.
+
+    Returns:
+        (피처 배열, 행별 오류 메시지 리스트 - 정상 행은 None)
+    """
+    if isinstance(records, np.ndarray):
+        arr = records.reshape(1, -1) if records.ndim == 1 else records
+        if arr.ndim != 2 or arr.shape[1] != len(SIM_FEATURES):
+            raise ValueError(
+                f"ndarray 입력은 (n_rows, {len(SIM_FEATURES)}) 형태여야 합니다. 입력: {records.shape}"
+            )
+        df = pd.DataFrame(arr, columns=SIM_FEATURES)
+        errors: List[Optional[str]] = [None] * len(df)
+    elif isinstance(records, pd.DataFrame):
+        df = records.reindex(columns=SIM_FEATURES).reset_index(drop=True)
+        errors = [None] * len(df)
+    else:
+        records = list(records)
+        errors = [None if isinstance(r, Mapping) else "행이 dict 형태가 아닙니다." for r in records]
+        df = pd.DataFrame(
+            [r if isinstance(r, Mapping) else {} for r in records],
+            columns=SIM_FEATURES,
+        )
+
+    X = np.empty((len(df), len(SIM_FEATURES)), dtype=np.float64)
+    for j, col in enumerate(SIM_FEATURES):
+        raw = df[col]
+        if pd.api.types.is_bool_dtype(raw):
+            converted = raw.astype(float)
+        else:
+            converted = pd.to_numeric(raw, errors="coerce")
+        bad = converted.isna() & raw.notna()
+        for i in np.flatnonzero(bad.to_numpy()):
+            if errors[i] is None:
+                errors[i] = f"'{col}' 값을 숫자로 변환할 수 없습니다: {raw.iloc[i]!r}"
+        X[:, j] = converted.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    return X, errors
+
+
+def _predict_ensemble(model_info: Dict[str, Any], X: np.ndarray) -> np.ndarray:
+    """
+    앙상블 평균 확률을 계산합니다.
+
+    - 행이 적고 컴파일된 앙상블이 있으면 트리 배열 평가 (멤버별 호출 오버헤드 없음)
+    - 그 외에는 멤버별 predict_proba 를 배치 전체에 한 번씩 호출해 평균
+    """
+    compiled = model_info.get('compiled')
+    if compiled is not None and len(X) <= COMPILED_MAX_ROWS:
+        return compiled.predict_proba(X)
+
+    X_df = pd.DataFrame(X, columns=SIM_FEATURES)
+    return np.mean([model.predict_proba(X_df)[:, 1] for model in model_info['models']], axis=0)
+
+
 def predict_churn_6feat_lgbm(user_features: Mapping[str, Any]) -> Dict[str, Any]:
     """
     6개 피처만 사용하는 LGBM(단조 제약) 시뮬레이터 전용 추론 함수.
@@ -105,13 +203,13 @@ def predict_churn_6feat_lgbm(user_features: Mapping[str, Any]) -> Dict[str, Any]
         for col in SIM_FEATURES:
             row[col] = user_features.get(col, np.nan)
 
-        X = pd.DataFrame([row], columns=SIM_FEATURES)
-        
+        X, errors = _build_feature_matrix([row])
+        if errors[0] is not None:
+            raise ValueError(errors[0])
+
         # 앙상블 예측: 여러 모델의 평균
-        models = model_info['models']
-        predictions = [model.predict_proba(X)[:, 1][0] for model in models]
-        proba = float(np.mean(predictions))
-        
+        proba = float(_predict_ensemble(model_info, X)[0])
+
         level = _prob_to_risk_level(proba)
 
         return {
@@ -119,7 +217,7 @@ def predict_churn_6feat_lgbm(user_features: Mapping[str, Any]) -> Dict[str, Any]
             "churn_prob": proba,
             "risk_level": level,
             "used_features": row,
-            "ensemble_size": len(models),  # 앙상블 크기 정보 추가
+            "ensemble_size": len(model_info['models']),  # 앙상블 크기 정보 추가
         }
 
     except Exception as e:  # pragma: no cover
@@ -129,6 +227,75 @@ def predict_churn_6feat_lgbm(user_features: Mapping[str, Any]) -> Dict[str, Any]
         }
 
 
-__all__ = ["predict_churn_6feat_lgbm"]
+def predict_churn_6feat_lgbm_batch(records: BatchInput) -> Dict[str, Any]:
+    """
+    여러 유저의 6피처를 한 번에 예측하는 배치 추론 함수.
+
+    Args:
+        records:
+            - dict 리스트: predict_churn_6feat_lgbm 의 user_features 와 같은 형식
+            - pandas.DataFrame: SIM_FEATURES 컬럼 이름 기준 (없는 컬럼은 NaN)
+            - numpy.ndarray: (n_rows, 6), 컬럼 순서는 SIM_FEATURES
+
+    Returns:
+        {
+          "success": bool,             # 호출 자체의 성공 여부 (행 단위 오류와 별개)
+          "churn_prob": np.ndarray,    # float, 오류 행은 NaN
+          "risk_level": np.ndarray,    # object("LOW" | "MEDIUM" | "HIGH"), 오류 행은 None
+          "error_mask": np.ndarray,    # bool, True 인 행은 예측 실패
+          "errors": List[Optional[str]],
+          "ensemble_size": int,
+          "error": Optional[str]       # 호출 자체가 실패한 경우의 메시지
+        }
+    """
+    if isinstance(records, np.ndarray) and records.ndim == 1:
+        n_rows = 1
+    else:
+        records = records if isinstance(records, (pd.DataFrame, np.ndarray)) else list(records)
+        n_rows = len(records)
+
+    def _all_failed(message: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "churn_prob": np.full(n_rows, np.nan),
+            "risk_level": np.full(n_rows, None, dtype=object),
+            "error_mask": np.ones(n_rows, dtype=bool),
+            "errors": [message] * n_rows,
+            "ensemble_size": 0,
+            "error": message,
+        }
+
+    try:
+        model_info = _load_sim_model()
+        X, errors = _build_feature_matrix(records)
+    except Exception as e:
+        return _all_failed(f"6피처 배치 예측 준비 중 오류 발생: {e}")
+
+    error_mask = np.array([err is not None for err in errors], dtype=bool)
+    probs = np.full(n_rows, np.nan)
+    risk_levels = np.full(n_rows, None, dtype=object)
+
+    valid_idx = np.flatnonzero(~error_mask)
+    if len(valid_idx) > 0:
+        try:
+            X_valid = X[valid_idx] if len(valid_idx) < n_rows else X
+            valid_probs = np.asarray(_predict_ensemble(model_info, X_valid), dtype=float)
+        except Exception as e:
+            return _all_failed(f"6피처 배치 예측 중 오류 발생: {e}")
+
+        probs[valid_idx] = valid_probs
+        risk_levels[valid_idx] = _risk_levels_from_probs(valid_probs)
+
+    return {
+        "success": True,
+        "churn_prob": probs,
+        "risk_level": risk_levels,
+        "error_mask": error_mask,
+        "errors": errors,
+        "ensemble_size": len(model_info['models']),
+    }
+
+
+__all__ = ["predict_churn_6feat_lgbm", "predict_churn_6feat_lgbm_batch"]
 
 
@@ -0,0 +1,261 @@
+"""
+input_schema.py
+Auth: 신지용
+fit 된 preprocessor(ColumnTransformer)에서 추론 입력 스키마를 한 번만 뽑아 두는 모듈.
+
+기존에는 예측 요청마다
+- transformers_ 를 다시 순회해 입력 컬럼 목록을 만들고
+- 1행짜리 pandas.DataFrame 을 새로 만든 뒤
+- ColumnTransformer.transform() 을 호출
+했습니다. 단일 유저 예측에서는 이 오버헤드가 모델 예측 시간보다 큽니다.
+
+InputSchema 는 아티팩트 로드 시 1회 생성되며 다음을 담습니다.
+- columns / numeric_columns / categorical_columns : 입력 컬럼 순서
+- dtypes        : 컬럼별 입력 dtype ("float64" | "object")
+- fill_values   : 컬럼별 결측 대체값 (학습 시 fit 된 SimpleImputer.statistics_)
+- 숫자형 scaler 파라미터(mean_/scale_), 범주형 one-hot 인덱스(category → 출력 위치)
+
+build_preprocessor() 구조(num: median imputer + StandardScaler,
+cat_ohe: most_frequent imputer + OneHotEncoder(handle_unknown="ignore"))가 확인되면
+`transform_row()` 로 미리 할당해 둔 출력 행(스레드별 버퍼)을 직접 채웁니다.
+구조가 다르거나 생성 시 자체 검증(preprocessor.transform 결과와 비교)에 실패하면
+`fast_path=False` 가 되고, 호출 측은 기존 DataFrame + transform 경로를 사용합니다.
+
+역할 분리:
+- 전처리기 정의/학습  → `backend/preprocessing_pipeline.py`
+- 입력 스키마 컴파일  → 이 모듈
+- 스키마 사용(추론)   → `backend/inference.py`
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.inference_bundle import get_input_columns
+
+
+@dataclass(frozen=True)
+class InputSchema:
+    """preprocessor 에서 컴파일한 추론 입력 스키마 (아티팩트 로드 시 1회 생성)"""
+
+    columns: Tuple[str, ...]
+    numeric_columns: Tuple[str, ...]
+    categorical_columns: Tuple[str, ...]
+    dtypes: Dict[str, str]
+    fill_values: Dict[str, Any]
+    n_features_out: int = 0
+    fast_path: bool = False
+    # 숫자형: (입력 컬럼, 출력 위치, 대체값, mean, scale)
+    _numeric_plan: Tuple[Tuple[str, int, float, float, float], ...] = field(default=(), repr=False)
+    # 범주형: (입력 컬럼, 대체값, {category: 출력 위치})
+    _categorical_plan: Tuple[Tuple[str, Any, Dict[Any, int]], ...] = field(default=(), repr=False)
+    _buffers: threading.local = field(default_factory=threading.local, repr=False, compare=False)
+
+    def _row_buffer(self) -> np.ndarray:
+        """스레드별로 1번만 할당하는 (1, n_features_out) 출력 버퍼"""
+        buf = getattr(self._buffers, "row", None)
+        if buf is None:
+            buf = np.zeros((1, self.n_features_out), dtype=np.float64)
+            self._buffers.row = buf
+        return buf
+
+    def transform_row(self, user_features: Mapping[str, Any]) -> np.ndarray:
+        """
+        단일 유저 피처 딕셔너리를 전처리된 (1, n_features_out) 배열로 변환합니다.
+
+        - preprocessor.transform(1행 DataFrame) 과 같은 결과를 냅니다.
+          (키 없음/None/NaN 숫자 → 대체값, 키 없음/NaN 범주 → 대체값,
+           None 이나 학습 때 없던 범주 → one-hot 전부 0)
+        - 반환 배열은 호출 스레드의 재사용 버퍼이므로, 다음 호출 전에 사용을 끝내야 합니다.
+
+        Raises:
+            RuntimeError: fast_path 를 쓸 수 없는 스키마인 경우
+            ValueError: 숫자형 값을 변환할 수 없거나 inf 인 경우
+        """
+        if not self.fast_path:
+            raise RuntimeError("이 입력 스키마는 transform_row() 를 지원하지 않습니다.")
+
+        out = self._row_buffer()
+        row = out[0]
+        row.fill(0.0)
+
+        for col, pos, fill, mean, scale in self._numeric_plan:
+            value = user_features.get(col)
+            if value is None:
+                x = fill
+            else:
+                try:
+                    x = float(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"'{col}' 값을 숫자로 변환할 수 없습니다: {value!r}") from None
+                if math.isnan(x):
+                    x = fill
+                elif math.isinf(x):
+                    raise ValueError(f"'{col}' 값이 무한대입니다: {value!r}")
+            row[pos] = (x - mean) / scale
+
+        for col, fill, index in self._categorical_plan:
+            if col in user_features:
+                value = user_features[col]
+                # DataFrame 경로와 동일하게: NaN 은 결측(대체값), None 은 미등록 범주
+                if isinstance(value, float) and math.isnan(value):
+                    value = fill
+            else:
+                value = fill
+            pos = index.get(value)
+            if pos is not None:
+                row[pos] = 1.0
+
+        return out
+
+    def build_dataframe(self, user_features: Mapping[str, Any]) -> pd.DataFrame:
+        """fast_path 를 쓸 수 없을 때 사용하는 1행 DataFrame (없는 컬럼은 NaN)"""
+        return pd.DataFrame(
+            [[user_features.get(col, np.nan) for col in self.columns]],
+            columns=list(self.columns),
+        )
+
+
+def _transformer_entry(preprocessor: Any, name: str) -> Optional[Tuple[Any, List[str]]]:
+    for t_name, transformer, cols in preprocessor.transformers_:
+        if t_name == name:
+            return transformer, list(cols)
+    return None
+
+
+def _compile_plans(preprocessor: Any) -> Optional[Tuple[tuple, tuple, int]]:
+    """
+    build_preprocessor() 구조일 때만 숫자형/범주형 변환 계획을 만듭니다.
+    구조가 예상과 다르면 None 을 반환합니다.
+    """
+    num = _transformer_entry(preprocessor, "num")
+    cat = _transformer_entry(preprocessor, "cat_ohe")
+    output_indices = getattr(preprocessor, "output_indices_", None)
+    if num is None or cat is None or output_indices is None:
+        return None
+
+    # 사용하지 않는 transformer 가 출력에 피처를 더하면 직접 채울 수 없음
+    for name, sl in output_indices.items():
+        if name not in ("num", "cat_ohe") and sl.stop > sl.start:
+            return None
+
+    (num_pipe, num_cols), (cat_pipe, cat_cols) = num, cat
+    steps_num = dict(getattr(num_pipe, "named_steps", {}))
+    steps_cat = dict(getattr(cat_pipe, "named_steps", {}))
+    if set(steps_num) != {"imputer", "scaler"} or set(steps_cat) != {"imputer", "ohe"}:
+        return None
+
+    imputer, scaler = steps_num["imputer"], steps_num["scaler"]
+    num_stats = np.asarray(imputer.statistics_, dtype=float)
+    if len(num_stats) != len(num_cols) or not np.all(np.isfinite(num_stats)):
+        return None
+    mean = scaler.mean_ if getattr(scaler, "with_mean", True) else None
+    scale = scaler.scale_ if getattr(scaler, "with_std", True) else None
+    mean = np.zeros(len(num_cols)) if mean is None else np.asarray(mean, dtype=float)
+    scale = np.ones(len(num_cols)) if scale is None else np.asarray(scale, dtype=float)
+
+    num_start = output_indices["num"].start
+    numeric_plan = tuple(
+        (col, num_start + i, float(num_stats[i]), float(mean[i]), float(scale[i]))
+        for i, col in enumerate(num_cols)
+    )
+
+    cat_imputer, ohe = steps_cat["imputer"], steps_cat["ohe"]
+    if (
+        getattr(ohe, "handle_unknown", None) != "ignore"
+        or getattr(ohe, "drop_idx_", None) is not None
+        or getattr(ohe, "_infrequent_enabled", False)
+        or len(cat_imputer.statistics_) != len(cat_cols)
+    ):
+        return None
+
+    categorical_plan = []
+    offset = output_indices["cat_ohe"].start
+    for col, fill, categories in zip(cat_cols, cat_imputer.statistics_, ohe.categories_):
+        index = {cat_value: offset + j for j, cat_value in enumerate(categories)}
+        categorical_plan.append((col, fill, index))
+        offset += len(categories)
+    if offset != output_indices["cat_ohe"].stop:
+        return None
+
+    n_features_out = max(sl.stop for sl in output_indices.values())
+    return numeric_plan, tuple(categorical_plan), n_features_out
+
+
+def _self_check(schema: InputSchema, preprocessor: Any) -> bool:
+    """대표 입력 몇 개로 transform_row() 와 preprocessor.transform() 결과를 비교"""
+    samples: List[Dict[str, Any]] = [{}, dict(schema.fill_values)]
+    varied: Dict[str, Any] = {col: schema.fill_values[col] * 1.5 + 1.0 for col in schema.numeric_columns}
+    for col, _, index in schema._categorical_plan:
+        categories = list(index)
+        varied[col] = categories[-1] if categories else None
+    samples.append(varied)
+
+    try:
+        for sample in samples:
+            expected = preprocessor.transform(schema.build_dataframe(sample))
+            if hasattr(expected, "toarray"):
+                expected = expected.toarray()
+            actual = schema.transform_row(sample)
+            if expected.shape != actual.shape or not np.allclose(expected, actual, rtol=1e-9, atol=1e-12):
+                return False
+    except Exception:
+        return False
+    return True
+
+
+def compile_input_schema(preprocessor: Any) -> InputSchema:
+    """
+    fit 된 preprocessor 에서 InputSchema 를 만듭니다.
+
+    - 컬럼 순서/dtype/대체값은 항상 채워집니다.
+    - transform_row() 용 변환 계획은 build_preprocessor() 구조이고
+      자체 검증을 통과했을 때만 활성화됩니다 (fast_path=True).
+    """
+    columns = tuple(get_input_columns(preprocessor))
+    num = _transformer_entry(preprocessor, "num")
+    cat = _transformer_entry(preprocessor, "cat_ohe")
+    numeric_columns = tuple(num[1]) if num else ()
+    categorical_columns = tuple(c for c in columns if c not in set(numeric_columns))
+
+    dtypes = {col: ("float64" if col in numeric_columns else "object") for col in columns}
+
+    fill_values: Dict[str, Any] = {col: np.nan for col in columns}
+    for entry in (num, cat):
+        if entry is None:
+            continue
+        transformer, cols = entry
+        imputer = getattr(transformer, "named_steps", {}).get("imputer")
+        stats = getattr(imputer, "statistics_", None)
+        if stats is not None and len(stats) == len(cols):
+            for col, value in zip(cols, stats):
+                fill_values[col] = float(value) if col in numeric_columns else value
+
+    plans = _compile_plans(preprocessor)
+    if plans is None:
+        return InputSchema(columns, numeric_columns, categorical_columns, dtypes, fill_values)
+
+    numeric_plan, categorical_plan, n_features_out = plans
+    schema = InputSchema(
+        columns,
+        numeric_columns,
+        categorical_columns,
+        dtypes,
+        fill_values,
+        n_features_out=n_features_out,
+        fast_path=True,
+        _numeric_plan=numeric_plan,
+        _categorical_plan=categorical_plan,
+    )
+    if _self_check(schema, preprocessor):
+        return schema
+    return InputSchema(columns, numeric_columns, categorical_columns, dtypes, fill_values)
+
+
+__all__ = ["InputSchema", "compile_input_schema"]
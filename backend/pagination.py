@@ -0,0 +1,98 @@
+"""
+pagination.py
+Auth: 박수빈
+목록 API 용 keyset(커서) 페이지네이션 헬퍼 모듈.
+
+OFFSET 페이지네이션은 뒤 페이지로 갈수록 앞의 행을 모두 읽고 버리므로 느려집니다.
+keyset 방식은 "마지막으로 받은 행의 정렬 키" 를 커서로 넘겨
+`WHERE (정렬키) < (커서 값) ORDER BY 정렬키 LIMIT n` 처럼 인덱스에서 바로 이어 읽습니다.
+
+- encode_cursor(values) : 마지막 행의 정렬 키 dict → 불투명한 문자열 커서 (URL-safe base64 JSON)
+- decode_cursor(cursor) : 문자열 커서 → dict (잘못된 커서는 ValueError)
+- parse_limit(value)    : limit 쿼리 파라미터 정수 변환 + 범위 제한
+- split_page(rows, limit, key_fn) : limit+1 건 조회 결과 → (이번 페이지, 다음 커서 or None)
+
+역할 분리:
+- 커서 인코딩/페이지 자르기 → 이 모듈
+- 정렬 키/WHERE 조건 구성   → 각 API (`backend/app.py`)
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime as dt
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+_DATETIME_TAG = "__dt__"
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, dt.datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return value
+
+
+def _from_json(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {_DATETIME_TAG}:
+        return dt.datetime.fromisoformat(value[_DATETIME_TAG])
+    return value
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """정렬 키 dict → 커서 문자열 (datetime 값은 그대로 복원됨)"""
+    payload = json.dumps({k: _to_json(v) for k, v in values.items()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], required: Sequence[str] = ()) -> Optional[Dict[str, Any]]:
+    """
+    커서 문자열 → 정렬 키 dict (cursor 가 비어 있으면 None)
+
+    Raises:
+        ValueError: 디코딩할 수 없거나 required 키가 없는 커서
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError("cursor payload is not an object")
+        values = {k: _from_json(v) for k, v in data.items()}
+    except (ValueError, UnicodeError, binascii.Error) as e:
+        raise ValueError(f"잘못된 cursor 입니다: {cursor}") from e
+
+    missing = [k for k in required if k not in values]
+    if missing:
+        raise ValueError(f"잘못된 cursor 입니다 (누락된 키: {', '.join(missing)})")
+    return values
+
+
+def parse_limit(value: Any, default: int = 50, maximum: int = 500) -> int:
+    """limit 파라미터 → 1 ~ maximum 범위의 정수 (변환할 수 없으면 default)"""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, maximum))
+
+
+def split_page(
+    rows: List[Dict[str, Any]],
+    limit: int,
+    key_fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    limit + 1 건으로 조회한 결과를 이번 페이지와 다음 커서로 나눕니다.
+    (limit 건 이하이면 마지막 페이지 → next_cursor=None)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(key_fn(page[-1]))
+
+
+__all__ = ["encode_cursor", "decode_cursor", "parse_limit", "split_page"]
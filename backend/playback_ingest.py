@@ -0,0 +1,190 @@
+"""
+playback_ingest.py
+Auth: 박수빈
+노래 재생 이벤트 비동기 적재 큐 모듈.
+
+`/api/music/playback` 을 async 모드(PLAYBACK_INGEST_MODE=async)로 운영할 때 사용합니다.
+- HTTP 요청은 이벤트를 메모리 큐에 넣고 바로 응답합니다.
+- 백그라운드 워커가 큐를 micro-batch(최대 max_batch 건 / max_wait 초)로 꺼내
+  process_batch(events) 를 한 번 호출합니다.
+  (app.py 에서 다건 INSERT 1번 + 도전과제 진행도 일괄 UPDATE 1번 + commit 1번)
+- 배치 처리가 실패하면 같은 이벤트를 1건씩 다시 처리해, 문제 이벤트만 버립니다.
+- 새로 달성한 도전과제는 유저별 알림함에 쌓아 두었다가
+  다음 재생 응답 또는 알림 조회 API 에서 전달합니다.
+
+주의:
+- 프로세스 메모리 큐이므로, 서버가 비정상 종료되면 아직 저장되지 않은 이벤트
+  (최대 max_wait 초 분량 + 큐에 쌓인 양)는 유실될 수 있습니다.
+  정상 종료 시에는 atexit 에서 남은 이벤트를 저장합니다.
+- 알림함도 프로세스별이므로, 여러 프로세스로 운영하면 같은 프로세스로 온 요청에만 전달됩니다.
+
+역할 분리:
+- 큐/워커/알림함     → 이 모듈
+- 배치 DB 처리       → `backend/app.py`의 `process_playback_batch`
+- 재생 로그 API      → `backend/app.py`의 `/api/music/playback`
+"""
+
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional
+
+
+PlaybackEvent = Dict[str, Any]
+ProcessBatch = Callable[[List[PlaybackEvent]], Mapping[Any, List[Dict[str, Any]]]]
+
+
+class PlaybackIngestQueue:
+    """재생 이벤트 micro-batch 적재 큐"""
+
+    def __init__(
+        self,
+        process_batch: ProcessBatch,
+        max_batch: int = 200,
+        max_wait_seconds: float = 0.05,
+        workers: int = 1,
+        maxsize: int = 10000,
+        max_notifications_per_user: int = 50,
+    ):
+        """
+        Args:
+            process_batch: 이벤트 리스트를 저장하고 {user_id: [새로 달성한 도전과제, ...]} 를 반환하는 함수
+            max_batch: 한 배치의 최대 이벤트 수
+            max_wait_seconds: 첫 이벤트를 꺼낸 뒤 배치를 채우기 위해 기다리는 최대 시간
+            workers: 워커 스레드 수
+            maxsize: 큐 최대 길이 (가득 차면 submit() 이 False 반환)
+            max_notifications_per_user: 유저별로 보관할 최대 알림 수 (오래된 것부터 버림)
+        """
+        self._process_batch = process_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self.workers = max(1, workers)
+        self._queue: "queue.Queue[PlaybackEvent]" = queue.Queue(maxsize=maxsize)
+        self._max_notifications = max_notifications_per_user
+
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._notifications: Dict[Any, Deque[Dict[str, Any]]] = defaultdict(
+            lambda: deque(maxlen=self._max_notifications)
+        )
+        self._stats = {"enqueued": 0, "processed": 0, "failed": 0, "batches": 0, "rejected": 0}
+
+    # ---------------------------------------------------------
+    # 요청 스레드에서 호출
+    # ---------------------------------------------------------
+    def submit(self, event: PlaybackEvent) -> bool:
+        """이벤트를 큐에 넣습니다. 큐가 가득 차 있으면 False (호출 측에서 동기 처리)"""
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            return False
+        with self._lock:
+            self._stats["enqueued"] += 1
+        return True
+
+    def pop_notifications(self, user_id: Any) -> List[Dict[str, Any]]:
+        """해당 유저에게 아직 전달하지 않은 도전과제 달성 알림을 꺼냅니다."""
+        with self._lock:
+            pending = self._notifications.pop(user_id, None)
+        return list(pending) if pending else []
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_size"] = self._queue.qsize()
+        stats["workers"] = len(self._threads)
+        return stats
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """큐가 빌 때까지 기다립니다. (테스트/종료 시) 제한 시간 안에 비면 True"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._queue.unfinished_tasks == 0:
+                return True
+            time.sleep(0.01)
+        return self._queue.unfinished_tasks == 0
+
+    # ---------------------------------------------------------
+    # 워커
+    # ---------------------------------------------------------
+    def _ensure_workers(self) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker_loop, name=f"playback-ingest-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            atexit.register(self.flush)
+
+    def _next_batch(self) -> List[PlaybackEvent]:
+        """첫 이벤트를 기다린 뒤, max_wait 동안 max_batch 까지 모아서 반환"""
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _deliver(self, completed_by_user: Optional[Mapping[Any, List[Dict[str, Any]]]]) -> None:
+        if not completed_by_user:
+            return
+        with self._lock:
+            for user_id, completed in completed_by_user.items():
+                if completed:
+                    self._notifications[user_id].extend(completed)
+
+    def _run_batch(self, batch: List[PlaybackEvent]) -> None:
+        try:
+            self._deliver(self._process_batch(batch))
+            processed, failed = len(batch), 0
+        except Exception as e:
+            # 배치 실패 → 1건씩 다시 처리해 문제 이벤트만 제외
+            print(f"[playback ingest] 배치 처리 실패, 1건씩 재시도: {e}")
+            processed = failed = 0
+            for event in batch:
+                try:
+                    self._deliver(self._process_batch([event]))
+                    processed += 1
+                except Exception as event_error:
+                    failed += 1
+                    print(f"[playback ingest] 이벤트 저장 실패 (user_id={event.get('user_id')}): {event_error}")
+
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["processed"] += processed
+            self._stats["failed"] += failed
+
+    def _worker_loop(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._run_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+__all__ = ["PlaybackIngestQueue", "PlaybackEvent"]
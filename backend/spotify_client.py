@@ -0,0 +1,274 @@
+"""
+spotify_client.py
+Auth: 박수빈
+Spotify Web API 검색 프록시용 HTTP 클라이언트 모듈.
+
+`/api/music/search` 가 요청마다 새 연결(TLS 핸드셰이크 포함)을 열고 타임아웃 없이
+Spotify 를 호출하던 것을 다음과 같이 바꿉니다.
+- keep-alive `requests.Session` 하나를 프로세스에서 공유 (HTTPAdapter 연결 풀 크기 제한)
+- 연결/응답 타임아웃 (기본 3초 / 10초), 타임아웃은 SpotifyAPIError(504) 로 변환
+- (토큰 해시, query, limit, offset, market) 키로 성공 응답만 TTL 캐시 (`backend/cache.py`)
+  같은 검색이 동시에 몰리면 한 요청만 Spotify 를 호출하고 나머지는 결과를 기다림
+- 트랙 응답 축약(projection): Spotify 트랙 객체(앨범 이미지 전체, available_markets 등)를
+  화면에서 쓰는 필드만 담은 평평한 dict 로 바꿉니다. (TRACK_FIELDS)
+  캐시에도 축약된 트랙을 저장하고, 원본이 필요하면 full=True 로 따로 조회/캐시합니다.
+
+환경 변수:
+- SPOTIFY_API_BASE            : API 기본 주소 (기본 https://api.spotify.com/v1, 테스트 시 로컬 stub 서버)
+- SPOTIFY_CONNECT_TIMEOUT     : 연결 타임아웃(초)
+- SPOTIFY_READ_TIMEOUT        : 응답 타임아웃(초)
+- SPOTIFY_POOL_MAXSIZE        : 유지할 최대 연결 수
+- SPOTIFY_SEARCH_CACHE_TTL    : 검색 결과 캐시 시간(초), 0 이면 캐시 끔
+- SPOTIFY_SEARCH_CACHE_SIZE   : 캐시할 최대 검색 수
+
+주의:
+- 캐시 키에 토큰 해시를 넣어, Spotify 가 확인한 토큰으로 받은 결과만 같은 토큰에 돌려줍니다.
+  (토큰이 없는 키를 쓰면 아무 문자열 토큰으로도 캐시된 결과를 받을 수 있음)
+  토큰 원문은 캐시 키에 남기지 않습니다.
+
+역할 분리:
+- Spotify 호출/연결 풀/캐시 → 이 모듈
+- 요청 파라미터 검증/응답 → `backend/app.py`의 `/api/music/search`
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.cache import TTLCache
+
+
+DEFAULT_SPOTIFY_API_BASE = "https://api.spotify.com/v1"
+
+
+def _album_images(track: Dict[str, Any]) -> list:
+    # Spotify 는 큰 이미지부터 내려줌 (640 → 300 → 64)
+    return (track.get("album") or {}).get("images") or []
+
+
+# 축약 트랙 필드 → Spotify 트랙 객체에서 값을 꺼내는 함수
+TRACK_FIELDS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "id": lambda t: t.get("id"),
+    "uri": lambda t: t.get("uri"),
+    "name": lambda t: t.get("name"),
+    "artists": lambda t: [a.get("name") for a in t.get("artists") or []],
+    "album": lambda t: (t.get("album") or {}).get("name"),
+    "release_date": lambda t: (t.get("album") or {}).get("release_date"),
+    "image_url": lambda t: (_album_images(t)[0].get("url") if _album_images(t) else None),
+    "thumbnail_url": lambda t: (_album_images(t)[-1].get("url") if _album_images(t) else None),
+    "duration_ms": lambda t: t.get("duration_ms"),
+    "popularity": lambda t: t.get("popularity"),
+    "explicit": lambda t: t.get("explicit"),
+    "preview_url": lambda t: t.get("preview_url"),
+    "external_url": lambda t: (t.get("external_urls") or {}).get("spotify"),
+}
+
+# fields 를 지정하지 않았을 때 응답 필드 (프론트엔드 화면에서 쓰는 것)
+DEFAULT_TRACK_FIELDS = (
+    "id", "uri", "name", "artists", "album", "image_url", "thumbnail_url", "duration_ms", "popularity",
+)
+
+
+def parse_track_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    fields 파라미터 → 필드 튜플
+    - 비어 있으면 DEFAULT_TRACK_FIELDS
+    - "full" 이면 None (Spotify 원본 객체)
+
+    Raises:
+        ValueError: 알 수 없는 필드
+    """
+    if not value:
+        return DEFAULT_TRACK_FIELDS
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    if names == ["full"]:
+        return None
+    unknown = [name for name in names if name not in TRACK_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"알 수 없는 fields: {', '.join(unknown)} (사용 가능: full, {', '.join(TRACK_FIELDS)})"
+        )
+    return tuple(dict.fromkeys(names)) or DEFAULT_TRACK_FIELDS
+
+
+def project_track(track: Dict[str, Any], fields: Sequence[str] = tuple(TRACK_FIELDS)) -> Dict[str, Any]:
+    """Spotify 트랙 객체 → fields 만 담은 축약 dict"""
+    return {name: TRACK_FIELDS[name](track) for name in fields}
+
+
+class SpotifyAPIError(Exception):
+    """Spotify 호출 실패 (status_code 와 응답 본문을 그대로 전달)"""
+
+    def __init__(self, status_code: int, payload: Any):
+        super().__init__(f"Spotify API 오류 (status={status_code})")
+        self.status_code = status_code
+        self.payload = payload
+
+
+class SpotifyClient:
+    """keep-alive 세션 + 검색 결과 TTL 캐시"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        pool_maxsize: int = 10,
+        cache_ttl_seconds: float = 300.0,
+        cache_maxsize: int = 1000,
+    ):
+        """
+        Args:
+            base_url: API 기본 주소 (None 이면 SPOTIFY_API_BASE 환경 변수 또는 기본값)
+            connect_timeout: 연결 타임아웃(초)
+            read_timeout: 응답 타임아웃(초)
+            pool_maxsize: 유지할 최대 keep-alive 연결 수
+            cache_ttl_seconds: 검색 결과 캐시 시간(초), 0 이하이면 캐시하지 않음
+            cache_maxsize: 캐시할 최대 검색 수
+        """
+        self.base_url = (base_url or os.getenv("SPOTIFY_API_BASE") or DEFAULT_SPOTIFY_API_BASE).rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_maxsize = max(1, pool_maxsize)
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._cache = TTLCache(ttl_seconds=cache_ttl_seconds, maxsize=cache_maxsize)
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "timeouts": 0}
+
+    # ---------------------------------------------------------
+    # 세션
+    # ---------------------------------------------------------
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _get(self, path: str, access_token: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET {base_url}{path} → JSON (200 이 아니면 SpotifyAPIError)"""
+        self._count("requests")
+        try:
+            res = self.session.get(
+                f"{self.base_url}{path}",
+                headers={"Authorization": access_token},
+                params=params,
+                timeout=self.timeout,
+            )
+        except requests.Timeout:
+            self._count("timeouts")
+            raise SpotifyAPIError(504, {"error": "Spotify API 응답 시간 초과"})
+        except requests.RequestException as e:
+            self._count("errors")
+            raise SpotifyAPIError(502, {"error": f"Spotify API 연결 실패: {e}"})
+
+        try:
+            payload = res.json()
+        except ValueError:
+            payload = {"error": res.text[:500]}
+        if res.status_code != 200:
+            self._count("errors")
+            raise SpotifyAPIError(res.status_code, payload)
+        return payload
+
+    # ---------------------------------------------------------
+    # API
+    # ---------------------------------------------------------
+    def search_tracks(
+        self,
+        query: str,
+        access_token: str,
+        limit: int = 20,
+        offset: int = 0,
+        market: Optional[str] = None,
+        full: bool = False,
+    ) -> Tuple[list, bool]:
+        """
+        트랙 검색 (성공 응답만 캐시)
+
+        Args:
+            full: True 면 Spotify 원본 트랙 객체, False 면 TRACK_FIELDS 전체로 축약한 트랙
+
+        캐시는 토큰별로 나뉩니다. (다른 토큰의 첫 검색은 항상 Spotify 를 호출해 토큰을 확인)
+
+        Returns:
+            (트랙 리스트, 캐시에서 가져왔는지)
+
+        Raises:
+            SpotifyAPIError: Spotify 오류 응답 / 타임아웃(504) / 연결 실패(502)
+        """
+        token_hash = hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:32]
+        key = ("search", "track", token_hash, query, int(limit), int(offset), market, full)
+        loaded = []
+
+        def _load():
+            params = {"q": query, "type": "track", "limit": int(limit), "offset": int(offset)}
+            if market:
+                params["market"] = market
+            data = self._get("/search", access_token, params)
+            loaded.append(True)
+            items = data.get("tracks", {}).get("items", [])
+            return items if full else [project_track(item) for item in items if item]
+
+        tracks = self._cache.get_or_load(key, _load)
+        return tracks, not loaded
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["base_url"] = self.base_url
+        stats["cache"] = self._cache.stats()
+        return stats
+
+
+_CLIENT: Optional[SpotifyClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_spotify_client() -> SpotifyClient:
+    """환경 변수 설정으로 만든 프로세스 공유 클라이언트"""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = SpotifyClient(
+                    connect_timeout=float(os.getenv("SPOTIFY_CONNECT_TIMEOUT", 3)),
+                    read_timeout=float(os.getenv("SPOTIFY_READ_TIMEOUT", 10)),
+                    pool_maxsize=int(os.getenv("SPOTIFY_POOL_MAXSIZE", 10)),
+                    cache_ttl_seconds=float(os.getenv("SPOTIFY_SEARCH_CACHE_TTL", 300)),
+                    cache_maxsize=int(os.getenv("SPOTIFY_SEARCH_CACHE_SIZE", 1000)),
+                )
+    return _CLIENT
+
+
+__all__ = [
+    "SpotifyClient",
+    "SpotifyAPIError",
+    "get_spotify_client",
+    "DEFAULT_SPOTIFY_API_BASE",
+    "TRACK_FIELDS",
+    "DEFAULT_TRACK_FIELDS",
+    "parse_track_fields",
+    "project_track",
+]
@@ -0,0 +1,121 @@
+"""
+test_compiled_ensemble.py
+Auth: 신지용
+컴파일된 LGBM 앙상블(`backend/compiled_ensemble.py`)이
+기존 방식(멤버별 predict_proba 평균)과 같은 확률을 내는지 확인하는 테스트.
+
+- 작은 합성 데이터로 단조 제약 LGBM 5개를 학습해 앙상블을 만들고
+  결측(NaN), 0 값이 섞인 입력으로 두 방식의 결과를 비교합니다.
+- 배치 함수(predict_churn_6feat_lgbm_batch)가 단일 함수와 같은 결과를 내는지도 확인합니다.
+- models/lgbm_sim_6feat_mono_v1_baseline.pkl 이 있으면 실제 모델로도 비교합니다.
+
+실행:
+    python -m pytest backend/tests/test_compiled_ensemble.py
+    또는 python backend/tests/test_compiled_ensemble.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 프로젝트 루트 경로를 Python 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import backend.inference_sim_6feat_lgbm as sim
+from backend.compiled_ensemble import compile_lgbm_ensemble
+from backend.models import get_model
+
+BASELINE_MODEL_PATH = os.path.join("models", "lgbm_sim_6feat_mono_v1_baseline.pkl")
+
+
+def _train_small_ensemble(n_models: int = 5):
+    rng = np.random.default_rng(0)
+    n = 3000
+    X = pd.DataFrame(rng.normal(size=(n, len(sim.SIM_FEATURES))), columns=sim.SIM_FEATURES)
+    X["app_crash_count_30d"] = rng.integers(0, 5, n)
+    X = X.mask(X.abs() > 2.2)  # 일부 결측
+    y = ((X.fillna(0).sum(axis=1) + rng.normal(size=n)) > 0.5).astype(int)
+
+    return [
+        get_model(
+            name="lgbm",
+            random_state=i,
+            n_estimators=80,
+            monotone_constraints=[1, 1, 1, -1, -1, -1],
+            scale_pos_weight=2.2,
+            verbose=-1,
+        ).fit(X, y)
+        for i in range(n_models)
+    ]
+
+
+def _sample_inputs(n: int = 500) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(n, len(sim.SIM_FEATURES)))
+    X[rng.random(X.shape) < 0.1] = np.nan
+    X[rng.random(X.shape) < 0.05] = 0.0
+    return X
+
+
+def _reference_proba(models, X: np.ndarray) -> np.ndarray:
+    X_df = pd.DataFrame(X, columns=sim.SIM_FEATURES)
+    return np.mean([m.predict_proba(X_df)[:, 1] for m in models], axis=0)
+
+
+def test_compiled_matches_per_model_average():
+    models = _train_small_ensemble()
+    compiled = compile_lgbm_ensemble(models)
+    assert compiled is not None
+
+    X = _sample_inputs()
+    np.testing.assert_allclose(compiled.predict_proba(X), _reference_proba(models, X), rtol=0, atol=1e-12)
+    # 단일 행 / 1차원 입력
+    np.testing.assert_allclose(compiled.predict_proba(X[0]), _reference_proba(models, X[:1]), rtol=0, atol=1e-12)
+
+
+def test_batch_matches_single_prediction():
+    models = _train_small_ensemble()
+    original = sim._SIM_MODEL
+    sim._SIM_MODEL = {"models": models, "n_models": len(models), "compiled": compile_lgbm_ensemble(models)}
+    try:
+        X = _sample_inputs(50)
+        records = [
+            {col: X[i, j] for j, col in enumerate(sim.SIM_FEATURES) if not (i % 7 == 0 and j == 2)}
+            for i in range(len(X))
+        ]
+        records.append({**records[0], "login_frequency_30d": "abc"})
+
+        batch = sim.predict_churn_6feat_lgbm_batch(records)
+        assert batch["success"]
+        assert batch["error_mask"].tolist() == [False] * len(X) + [True]
+
+        for i, rec in enumerate(records[:-1]):
+            single = sim.predict_churn_6feat_lgbm(rec)
+            assert single["success"]
+            assert abs(single["churn_prob"] - batch["churn_prob"][i]) < 1e-12
+            assert single["risk_level"] == batch["risk_level"][i]
+    finally:
+        sim._SIM_MODEL = original
+
+
+def test_compiled_matches_saved_baseline_model():
+    if not os.path.exists(BASELINE_MODEL_PATH):
+        pytest.skip(f"{BASELINE_MODEL_PATH} 가 없습니다.")
+    import joblib
+
+    models = [joblib.load(BASELINE_MODEL_PATH)]
+    compiled = compile_lgbm_ensemble(models)
+    if compiled is None:
+        pytest.skip("컴파일할 수 없는 모델 구조입니다.")
+    X = _sample_inputs() * 10
+    np.testing.assert_allclose(compiled.predict_proba(X), _reference_proba(models, X), rtol=0, atol=1e-12)
+
+
+if __name__ == "__main__":
+    test_compiled_matches_per_model_average()
+    test_batch_matches_single_prediction()
+    test_compiled_matches_saved_baseline_model()
+    print("컴파일된 앙상블 parity 테스트 통과")
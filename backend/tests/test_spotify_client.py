@@ -0,0 +1,207 @@
+"""
+test_spotify_client.py
+Auth: 박수빈
+Spotify 검색 클라이언트(`backend/spotify_client.py`)를 로컬 stub 서버로 확인하는 테스트.
+
+- Spotify 대신 /v1/search 를 흉내 내는 HTTP 서버를 띄우고 base_url 로 연결합니다.
+- 같은 토큰의 같은 검색은 캐시에서 반환되고, 동시에 몰린 같은 검색은 한 번만 호출되는지 확인합니다.
+- 다른 토큰은 캐시를 공유하지 않고 Spotify 를 다시 호출하는지 확인합니다.
+- 오류 응답은 캐시하지 않고, 응답 지연은 타임아웃(504)으로 바뀌는지 확인합니다.
+- 여러 번 호출해도 keep-alive 연결 하나를 재사용하는지 확인합니다.
+- 트랙이 축약 필드(TRACK_FIELDS)로 바뀌고, full=True 면 원본 객체가 오는지 확인합니다.
+
+실행:
+    python -m pytest backend/tests/test_spotify_client.py
+    또는 python backend/tests/test_spotify_client.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 프로젝트 루트 경로를 Python 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.spotify_client import (
+    DEFAULT_TRACK_FIELDS,
+    TRACK_FIELDS,
+    SpotifyAPIError,
+    SpotifyClient,
+    parse_track_fields,
+)
+
+
+def _fake_track(name):
+    return {
+        "id": name,
+        "uri": f"spotify:track:{name}",
+        "name": name,
+        "artists": [{"name": "artist", "id": "a1", "external_urls": {"spotify": "https://open.spotify.com/artist/a1"}}],
+        "album": {
+            "name": "album",
+            "release_date": "2024-01-01",
+            "images": [{"url": f"https://img/{size}", "width": size, "height": size} for size in (640, 300, 64)],
+            "available_markets": ["KR"] * 180,
+        },
+        "available_markets": ["KR"] * 180,
+        "duration_ms": 201000,
+        "popularity": 80,
+        "explicit": False,
+        "external_ids": {"isrc": "KR0000000000"},
+    }
+
+
+class _StubSpotify(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    calls = []
+    connections = set()
+    delay_seconds = 0.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        type(self).calls.append(params)
+        type(self).connections.add(self.client_address)
+        time.sleep(type(self).delay_seconds)
+
+        if params.get("q") == "error":
+            status, body = 429, {"error": {"status": 429, "message": "rate limited"}}
+        else:
+            items = [_fake_track(f"{params['q']} #{int(params['offset']) + i}") for i in range(int(params["limit"]))]
+            status, body = 200, {"tracks": {"items": items}}
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_stub():
+    _StubSpotify.calls = []
+    _StubSpotify.connections = set()
+    _StubSpotify.delay_seconds = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSpotify)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def test_search_is_cached_and_reuses_connection():
+    server, base_url = _start_stub()
+    client = SpotifyClient(base_url=base_url)
+    try:
+        tracks, cached = client.search_tracks("iu", "Bearer t", limit=3, offset=0)
+        assert [t["name"] for t in tracks] == ["iu #0", "iu #1", "iu #2"]
+        assert not cached
+
+        tracks, cached = client.search_tracks("iu", "Bearer t", limit=3, offset=0)
+        assert cached and len(tracks) == 3
+        assert len(_StubSpotify.calls) == 1
+
+        # 토큰이 다르면 캐시를 쓰지 않음
+        _, cached = client.search_tracks("iu", "Bearer other", limit=3, offset=0)
+        assert not cached
+        assert len(_StubSpotify.calls) == 2
+
+        # 키가 다르면 새로 호출 (같은 keep-alive 연결 사용)
+        client.search_tracks("iu", "Bearer t", limit=3, offset=3)
+        client.search_tracks("iu", "Bearer t", limit=3, offset=0, market="KR")
+        assert len(_StubSpotify.calls) == 4
+        assert _StubSpotify.calls[-1]["market"] == "KR"
+        assert len(_StubSpotify.connections) == 1
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_tracks_are_projected():
+    server, base_url = _start_stub()
+    client = SpotifyClient(base_url=base_url)
+    try:
+        tracks, _ = client.search_tracks("iu", "Bearer t", limit=2)
+        assert set(tracks[0]) == set(TRACK_FIELDS)
+        assert tracks[0]["artists"] == ["artist"]
+        assert tracks[0]["album"] == "album"
+        assert tracks[0]["image_url"] == "https://img/640"
+        assert tracks[0]["thumbnail_url"] == "https://img/64"
+        assert len(json.dumps(tracks)) * 5 < len(json.dumps([_fake_track("iu #0")] * 2))
+
+        # 원본은 별도 키로 조회/캐시
+        raw, cached = client.search_tracks("iu", "Bearer t", limit=2, full=True)
+        assert not cached and "available_markets" in raw[0]
+        assert len(_StubSpotify.calls) == 2
+    finally:
+        client.close()
+        server.shutdown()
+
+    assert parse_track_fields(None) == DEFAULT_TRACK_FIELDS
+    assert parse_track_fields("full") is None
+    assert parse_track_fields("uri, name,uri") == ("uri", "name")
+    try:
+        parse_track_fields("uri,available_markets")
+        assert False, "ValueError 가 발생해야 합니다."
+    except ValueError:
+        pass
+
+
+def test_concurrent_same_search_calls_once():
+    server, base_url = _start_stub()
+    _StubSpotify.delay_seconds = 0.2
+    client = SpotifyClient(base_url=base_url)
+    try:
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.search_tracks("newjeans", "Bearer t")))
+            for _ in range(10)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(results) == 10
+        assert len(_StubSpotify.calls) == 1
+        assert sum(1 for _, cached in results if not cached) == 1
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_errors_are_not_cached_and_timeouts_map_to_504():
+    server, base_url = _start_stub()
+    client = SpotifyClient(base_url=base_url, read_timeout=0.2)
+    try:
+        for _ in range(2):
+            try:
+                client.search_tracks("error", "Bearer t")
+                assert False, "SpotifyAPIError 가 발생해야 합니다."
+            except SpotifyAPIError as e:
+                assert e.status_code == 429
+                assert e.payload["error"]["message"] == "rate limited"
+        assert len(_StubSpotify.calls) == 2
+
+        _StubSpotify.delay_seconds = 1.0
+        try:
+            client.search_tracks("slow", "Bearer t")
+            assert False, "SpotifyAPIError 가 발생해야 합니다."
+        except SpotifyAPIError as e:
+            assert e.status_code == 504
+        assert client.stats()["timeouts"] == 1
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_search_is_cached_and_reuses_connection()
+    test_tracks_are_projected()
+    test_concurrent_same_search_calls_once()
+    test_errors_are_not_cached_and_timeouts_map_to_504()
+    print("Spotify 검색 클라이언트 테스트 통과")
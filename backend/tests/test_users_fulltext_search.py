@@ -0,0 +1,143 @@
+"""
+test_users_fulltext_search.py
+Auth: 박수빈
+users_search 의 FULLTEXT(ngram) 검색 조건(`backend/app.py`)을 확인하는 테스트.
+
+- 불용어(stopword) 설정에 따라 FULLTEXT 사용 여부가 정해지는지 가짜 cursor 로 확인합니다.
+  (ngram 파서는 불용어를 포함한 토큰을 버리므로 기본 불용어 목록이면 LIKE 로 검색)
+- 공백/기호가 있거나 짧은 검색어는 LIKE 로 대체되는지 확인합니다.
+- MySQL 에 연결할 수 있으면 불용어를 끈 ngram 인덱스로 영문/한글 검색어의
+  MATCH 결과가 LIKE '%검색어%' 결과와 같은지 비교합니다. (연결할 수 없으면 skip)
+
+실행:
+    python -m pytest backend/tests/test_users_fulltext_search.py
+    또는 python backend/tests/test_users_fulltext_search.py
+"""
+
+import os
+import sys
+
+import pymysql
+import pytest
+from pymysql.cursors import DictCursor
+
+# 프로젝트 루트 경로를 Python 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.app import NGRAM_TOKEN_SIZE, fulltext_stopwords_disabled, text_search_condition
+from utils.constants import DB_CONFIG
+
+PARITY_TABLE = "users_fulltext_parity_test"
+
+PARITY_ROWS = [
+    ("Liam", "Jazz"),
+    ("Daniel", "Classical"),
+    ("Amelia", "Pop"),
+    ("Isabella", "Indie"),
+    ("Noah", "Hip-Hop"),
+    ("Mia", "Rock"),
+    ("김민지", "재즈"),
+    ("이지은", "발라드"),
+    ("박서준", "클래식"),
+]
+PARITY_TERMS = ["Liam", "li", "am", "Daniel", "ia", "Jazz", "zz", "Classical", "Indie", "Mia", "민지", "재즈", "클래식"]
+
+
+class _FakeCursor:
+    """SELECT @@innodb_ft_* / 불용어 테이블 COUNT(*) 만 흉내 내는 cursor"""
+
+    def __init__(self, enabled, user_table="", server_table="", stopword_count=0):
+        self.settings = {"enabled": enabled, "user_table": user_table, "server_table": server_table}
+        self.stopword_count = stopword_count
+        self.queries = []
+        self._row = None
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql)
+        if "@@innodb_ft_enable_stopword" in sql:
+            self._row = self.settings
+        else:
+            self._row = {"cnt": self.stopword_count}
+
+    def fetchone(self):
+        return self._row
+
+
+def test_fulltext_requires_stopwords_off():
+    assert fulltext_stopwords_disabled(_FakeCursor(enabled=0))
+    # 기본 불용어 목록 (a, i 등 포함)
+    assert not fulltext_stopwords_disabled(_FakeCursor(enabled=1))
+
+    # 빈 불용어 테이블이면 사용, 비어 있지 않으면 사용 안 함 (사용자 테이블 우선)
+    cursor = _FakeCursor(enabled=1, server_table="app_db/empty_stopwords")
+    assert fulltext_stopwords_disabled(cursor)
+    assert "`app_db`.`empty_stopwords`" in cursor.queries[-1]
+    assert not fulltext_stopwords_disabled(_FakeCursor(enabled=1, user_table="app_db/words", stopword_count=3))
+
+    # 형식이 다른 테이블 이름은 쿼리에 넣지 않음
+    cursor = _FakeCursor(enabled=1, user_table="app_db/x`; DROP TABLE users; --")
+    assert not fulltext_stopwords_disabled(cursor)
+    assert len(cursor.queries) == 1
+
+
+def test_non_word_terms_fall_back_to_like():
+    condition, params, relevance = text_search_condition("u.name", "Liam", True)
+    assert condition.startswith("MATCH(u.name)") and params == ['"Liam"'] and relevance == condition
+
+    short_term = "L" * (NGRAM_TOKEN_SIZE - 1)
+    for term in ["Hip-Hop", "Hip Hop", 'a"b', "a_b", "100%"] + ([short_term] if short_term else []):
+        condition, params, relevance = text_search_condition("u.favorite_music", term, True)
+        assert condition == "u.favorite_music LIKE %s" and params == [f"%{term}%"] and relevance is None
+
+    condition, _, relevance = text_search_condition("u.name", "Liam", False)
+    assert condition == "u.name LIKE %s" and relevance is None
+
+
+def _connect():
+    try:
+        return pymysql.connect(**DB_CONFIG, cursorclass=DictCursor, connect_timeout=3, autocommit=True)
+    except pymysql.err.MySQLError as e:
+        pytest.skip(f"MySQL 에 연결할 수 없습니다: {e}")
+
+
+def test_fulltext_matches_like_for_latin_terms():
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        # 인덱스는 만들 때의 불용어 설정으로 색인되므로 이 세션에서만 불용어를 끄고 생성
+        cursor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+        assert fulltext_stopwords_disabled(cursor)
+
+        cursor.execute(f"DROP TABLE IF EXISTS {PARITY_TABLE}")
+        cursor.execute(f"""
+            CREATE TABLE {PARITY_TABLE} (
+                user_id INT AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                favorite_music VARCHAR(50),
+                FULLTEXT INDEX ft_name (name) WITH PARSER ngram,
+                FULLTEXT INDEX ft_favorite_music (favorite_music) WITH PARSER ngram
+            )
+        """)
+        cursor.executemany(f"INSERT INTO {PARITY_TABLE} (name, favorite_music) VALUES (%s, %s)", PARITY_ROWS)
+
+        for column in ("name", "favorite_music"):
+            for term in PARITY_TERMS:
+                like_sql, like_params, _ = text_search_condition(column, term, False)
+                match_sql, match_params, relevance = text_search_condition(column, term, True)
+                assert relevance is not None, term
+
+                cursor.execute(f"SELECT user_id FROM {PARITY_TABLE} WHERE {like_sql} ORDER BY user_id", like_params)
+                expected = [row["user_id"] for row in cursor.fetchall()]
+                cursor.execute(f"SELECT user_id FROM {PARITY_TABLE} WHERE {match_sql} ORDER BY user_id", match_params)
+                assert [row["user_id"] for row in cursor.fetchall()] == expected, (column, term)
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {PARITY_TABLE}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    test_fulltext_requires_stopwords_off()
+    test_non_word_terms_fall_back_to_like()
+    test_fulltext_matches_like_for_latin_terms()
+    print("users_search FULLTEXT 검색 테스트 통과")
@@ -6,6 +6,7 @@ Auth: 신지용
 - 모델 학습
 - 평가(F1, AUC, Best Threshold)
 - 학습이 끝난 최종 모델을 pkl(`backend.config.MODEL_PKL_PATH`)로 저장
+- preprocessor + 모델을 추론 번들(`backend.config.INFERENCE_BUNDLE_PATH`)로 저장
 까지 수행하는 스크립트입니다.
 
 현재 전처리 로직은 `notebooks/pipeline.ipynb`에서 정의된
@@ -17,6 +18,7 @@ sklearn ColumnTransformer 기반 파이프라인을 그대로 옮긴
 - 모델 종류/파라미터 → `backend/models.py`의 `get_model()`
 - 데이터 경로/seed/비율 → `backend/config.py`의 상수들
 - 최종 모델 저장 경로 → `backend.config.MODEL_PKL_PATH`
+- 추론 번들 저장 경로 → `backend.config.INFERENCE_BUNDLE_PATH`
 """
 
 import json
@@ -46,7 +48,9 @@ from backend.config import (
     THRESH_STEP,
     METRICS_PATH,
     MODEL_PKL_PATH,
+    INFERENCE_BUNDLE_PATH,
 )
+from backend.inference_bundle import build_inference_bundle, save_inference_bundle
 from backend.models import get_model
 from backend.preprocessing_pipeline import preprocess_and_split  # 같은 backend 디렉터리 기준 import
 
@@ -112,7 +116,7 @@ def main():
     # 1) 전처리 파이프라인 실행
     #    - 데이터 경로/비율/seed는 상단 CONFIG를 통해 제어
     #    - notebooks/pipeline.ipynb와 동일한 sklearn ColumnTransformer 파이프라인 사용
-    X_train, X_test, y_train, y_test, _ = preprocess_and_split(
+    X_train, X_test, y_train, y_test, preprocessor = preprocess_and_split(
         path=DATA_PATH,
         test_size=TEST_SIZE,
         random_state=RANDOM_STATE,
@@ -173,6 +177,19 @@ def main():
     except Exception as e:
         print(f"⚠️  모델 저장 중 오류가 발생했지만, 학습/평가 자체는 완료되었습니다: {e}")
 
+    # 6) 추론 번들 저장
+    #    - inference.py 는 이 번들만 로드 (학습 행렬 pkl 로드 불필요)
+    try:
+        bundle = build_inference_bundle(
+            preprocessor=preprocessor,
+            model=model,
+            model_name=MODEL_NAME,
+            best_threshold=best_th,
+        )
+        save_inference_bundle(bundle, INFERENCE_BUNDLE_PATH)
+    except Exception as e:
+        print(f"⚠️  추론 번들 저장 중 오류가 발생했지만, 학습/평가 자체는 완료되었습니다: {e}")
+
 
 def save_metrics(
     model_name: str,
@@ -25,6 +25,7 @@ import numpy as np
 import os
 import streamlit.components.v1 as components
 from utils.spotify_auth import get_login_url
+from utils.api_client import fetch_all, get_api_client
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 
@@ -34,6 +35,11 @@ plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
 
 API_URL = "http://localhost:5000/api"
 
+# 공유 keep-alive 세션 (연결 풀/기본 타임아웃/GET 재시도/응답 시간 기록)
+api_client = get_api_client(API_URL)
+# 테이블 생성/CSV import/예측 일괄 처리 등 오래 걸리는 API 의 응답 타임아웃(초)
+LONG_API_TIMEOUT = (3.05, 600)
+
 # ----------------------------------------------------------
 # 플레이어 HTML 파일 로드 (캐싱)
 # ----------------------------------------------------------
@@ -414,12 +420,13 @@ def get_music_categories():
 # ----------------------------------------------------------
 # API 호출 유틸 함수
 # ----------------------------------------------------------
-def call_api(endpoint: str):
+def call_api(endpoint: str, timeout=None, retries=None):
     """
     Flask API(endpoint)를 GET 요청으로 호출하는 함수
+    (timeout/retries 를 지정하지 않으면 api_client 기본값 사용)
     """
     try:
-        res = requests.get(f"{API_URL}/{endpoint}")
+        res = api_client.get(endpoint, timeout=timeout, retries=retries)
         if res.status_code == 200:
             try:
                 return True, res.json()
@@ -433,7 +440,7 @@ def call_api(endpoint: str):
 
 def call_api_post(endpoint: str, payload: dict):
     try:
-        res = requests.post(f"{API_URL}/{endpoint}", json=payload)
+        res = api_client.post(endpoint, json=payload)
         return True, res.json()
     except Exception as e:
         return False, {"error": str(e)}
@@ -449,7 +456,7 @@ def search_tracks_api_cached(query, limit, offset, access_token):
             "limit": limit,
             "offset": offset
         }
-        res = requests.get(f"{API_URL}/music/search", headers=headers, params=params, timeout=10)
+        res = api_client.get("music/search", headers=headers, params=params, timeout=10)
         
         if res.status_code == 200:
             data = res.json()
@@ -473,6 +480,10 @@ def search_tracks_api(query, limit=20, offset=0):
     
     return search_tracks_api_cached(query, limit, offset, st.session_state.access_token)
 
+# 홈 화면 인기/추천 카드에서 쓰는 트랙 필드 (/api/music/search fields 파라미터)
+HOME_TRACK_FIELDS = "uri,name,artists,image_url,popularity"
+
+
 def get_popular_tracks(access_token, limit=3):
     """
     Spotify 인기 음악 가져오기 (인기 트랙 검색)
@@ -484,15 +495,16 @@ def get_popular_tracks(access_token, limit=3):
             "q": "year:2024",
             "type": "track",
             "limit": 50,
-            "offset": 0
+            "offset": 0,
+            "fields": HOME_TRACK_FIELDS
         }
-        res = requests.get(f"{API_URL}/music/search", headers=headers, params=params, timeout=10)
+        res = api_client.get("music/search", headers=headers, params=params, timeout=10)
         
         if res.status_code == 200:
             data = res.json()
             tracks = data.get("tracks", [])
             # 인기도 순으로 정렬하고 상위 limit개만 반환
-            tracks_sorted = sorted(tracks, key=lambda x: x.get("popularity", 0), reverse=True)
+            tracks_sorted = sorted(tracks, key=lambda x: x.get("popularity") or 0, reverse=True)
             return tracks_sorted[:limit]
         else:
             return []
@@ -517,15 +529,16 @@ def get_recommended_tracks(access_token, genre, limit=3):
             "q": f'genre:"{genre_lower}"',
             "type": "track",
             "limit": 50,
-            "offset": 0
+            "offset": 0,
+            "fields": HOME_TRACK_FIELDS
         }
-        res = requests.get(f"{API_URL}/music/search", headers=headers, params=params, timeout=10)
+        res = api_client.get("music/search", headers=headers, params=params, timeout=10)
         
         if res.status_code == 200:
             data = res.json()
             tracks = data.get("tracks", [])
             # 인기도 순으로 정렬하고 상위 limit개만 반환
-            tracks_sorted = sorted(tracks, key=lambda x: x.get("popularity", 0), reverse=True)
+            tracks_sorted = sorted(tracks, key=lambda x: x.get("popularity") or 0, reverse=True)
             return tracks_sorted[:limit]
         else:
             return []
@@ -536,6 +549,28 @@ def get_recommended_tracks(access_token, genre, limit=3):
 # ----------------------------------------------------------
 # 서브 페이지 함수들
 # ----------------------------------------------------------
+def fetch_user_home(user_id):
+    """
+    /api/users/<id>/home 조회 (ETag 사용)
+    - 이전 응답의 ETag 를 If-None-Match 로 보내고, 304 이면 저장해 둔 본문을 그대로 사용
+    - 조회 실패 시 저장해 둔 본문(없으면 None) 반환
+    """
+    home_key = f"user_home_{user_id}"
+    cached = st.session_state.get(home_key)
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+    try:
+        res = api_client.get(f"users/{user_id}/home", headers=headers, timeout=5)
+        if res.status_code == 304 and cached:
+            return cached["data"]
+        if res.status_code == 200:
+            data = res.json()
+            st.session_state[home_key] = {"etag": res.headers.get("ETag"), "data": data}
+            return data
+    except Exception as e:
+        print(f"[메인 화면 데이터 조회 오류] {str(e)}")
+    return cached["data"] if cached else None
+
+
 def show_home_page():
     render_top_guide_banner("home")
     
@@ -568,18 +603,25 @@ def show_user_home_page():
         st.stop()
 
     # 인기 음악과 추천 음악 표시 (가이드 배너와 검색 기능 중간)
+    # 캐시에 없는 것만 두 검색을 동시에 요청
+    access_token = st.session_state.access_token
+    favorite_music = user.get("favorite_music", "")
+    popular_tracks_key = "popular_tracks_cache"
+    recommended_tracks_key = f"recommended_tracks_cache_{user_id}_{favorite_music}"
+    pending = {}
+    if popular_tracks_key not in st.session_state:
+        pending[popular_tracks_key] = lambda: get_popular_tracks(access_token, limit=3)
+    if favorite_music and recommended_tracks_key not in st.session_state:
+        pending[recommended_tracks_key] = lambda: get_recommended_tracks(access_token, favorite_music, limit=3)
+    if pending:
+        with st.spinner("음악을 불러오는 중..."):
+            st.session_state.update(fetch_all(pending, default=[]))
+
     col_popular, col_recommended = st.columns(2)
     
     with col_popular:
         st.markdown("### 🔥 현재 인기 음악")
         
-        # 인기 음악 가져오기 (캐싱)
-        popular_tracks_key = "popular_tracks_cache"
-        if popular_tracks_key not in st.session_state:
-            with st.spinner("인기 음악을 불러오는 중..."):
-                popular_tracks = get_popular_tracks(st.session_state.access_token, limit=3)
-                st.session_state[popular_tracks_key] = popular_tracks
-        
         popular_tracks = st.session_state.get(popular_tracks_key, [])
         
         if popular_tracks:
@@ -588,9 +630,7 @@ def show_user_home_page():
             for idx, track in enumerate(popular_tracks[:3]):
                 with cols[idx]:
                     # 앨범 이미지 (크기 축소)
-                    image_url = None
-                    if track.get("album") and track["album"].get("images"):
-                        image_url = track["album"]["images"][0]["url"] if track["album"]["images"] else None
+                    image_url = track.get("image_url")
                     
                     if image_url:
                         try:
@@ -602,7 +642,7 @@ def show_user_home_page():
                     
                     # 트랙 정보
                     track_name = track.get("name", "알 수 없음")
-                    artists = ", ".join([artist["name"] for artist in track.get("artists", [])])
+                    artists = ", ".join(track.get("artists") or [])
                     track_uri = track.get("uri", "")
                     
                     st.markdown(f"**{track_name[:18]}{'...' if len(track_name) > 18 else ''}**")
@@ -621,19 +661,9 @@ def show_user_home_page():
             st.info("인기 음악을 불러올 수 없습니다.")
     
     with col_recommended:
-        # 사용자의 좋아하는 음악 장르 가져오기
-        favorite_music = user.get("favorite_music", "")
-        
         if favorite_music:
             st.markdown(f"### 🎯 {favorite_music} 추천 음악")
             
-            # 추천 음악 가져오기 (캐싱)
-            recommended_tracks_key = f"recommended_tracks_cache_{user_id}_{favorite_music}"
-            if recommended_tracks_key not in st.session_state:
-                with st.spinner("추천 음악을 불러오는 중..."):
-                    recommended_tracks = get_recommended_tracks(st.session_state.access_token, favorite_music, limit=3)
-                    st.session_state[recommended_tracks_key] = recommended_tracks
-            
             recommended_tracks = st.session_state.get(recommended_tracks_key, [])
             
             if recommended_tracks:
@@ -642,9 +672,7 @@ def show_user_home_page():
                 for idx, track in enumerate(recommended_tracks[:3]):
                     with cols[idx]:
                         # 앨범 이미지
-                        image_url = None
-                        if track.get("album") and track["album"].get("images"):
-                            image_url = track["album"]["images"][0]["url"] if track["album"]["images"] else None
+                        image_url = track.get("image_url")
                         
                         if image_url:
                             try:
@@ -656,7 +684,7 @@ def show_user_home_page():
                         
                         # 트랙 정보
                         track_name = track.get("name", "알 수 없음")
-                        artists = ", ".join([artist["name"] for artist in track.get("artists", [])])
+                        artists = ", ".join(track.get("artists") or [])
                         track_uri = track.get("uri", "")
                         
                         st.markdown(f"**{track_name[:18]}{'...' if len(track_name) > 18 else ''}**")
@@ -748,7 +776,7 @@ def show_user_home_page():
                     
                     # 인기도 필터 적용
                     if min_popularity > 0:
-                        new_tracks = [t for t in new_tracks if t.get("popularity", 0) >= min_popularity]
+                        new_tracks = [t for t in new_tracks if (t.get("popularity") or 0) >= min_popularity]
                     
                     st.session_state.search_results = new_tracks
                     print(f"[검색 결과 저장] {len(new_tracks)}개 트랙 저장됨")
@@ -766,21 +794,22 @@ def show_user_home_page():
             
             for idx, track in enumerate(tracks):
                 track_name = track.get("name", "알 수 없음")
-                artists = ", ".join([artist.get("name", "") for artist in track.get("artists", [])])
-                album = track.get("album", {}).get("name", "알 수 없음")
-                duration_ms = track.get("duration_ms", 0)
+                artists = ", ".join(track.get("artists") or [])
+                album = track.get("album") or "알 수 없음"
+                duration_ms = track.get("duration_ms") or 0
                 duration_str = f"{duration_ms // 60000}:{(duration_ms % 60000) // 1000:02d}"
                 
-                images = track.get("album", {}).get("images", [])
-                image_url = images[0].get("url") if images and len(images) > 0 else None
+                # 목록은 작은 썸네일로 표시, 재생 패널은 큰 이미지 사용
+                thumbnail_url = track.get("thumbnail_url")
+                image_url = track.get("image_url")
                 track_uri = track.get("uri", "")
                 
                 with st.container(border=True):
                     cols = st.columns([1, 4, 1])
                     with cols[0]:
-                        if image_url:
+                        if thumbnail_url:
                             try:
-                                st.image(image_url, width=60)
+                                st.image(thumbnail_url, width=60)
                             except Exception as e:
                                 # 이미지 로드 실패 시 대체 표시
                                 st.write("🎵")
@@ -814,7 +843,7 @@ def show_user_home_page():
                          
                          # 인기도 필터 적용
                          if min_popularity > 0:
-                             new_tracks = [t for t in new_tracks if t.get("popularity", 0) >= min_popularity]
+                             new_tracks = [t for t in new_tracks if (t.get("popularity") or 0) >= min_popularity]
                          
                          st.session_state.search_results.extend(new_tracks)
                          
@@ -873,10 +902,28 @@ def show_user_home_page():
 
 
 @st.cache_data(ttl=60, show_spinner=False)  # 1분 캐싱
-def _fetch_user_predictions():
-    """유저 예측 데이터 조회 (캐싱)"""
+def _fetch_prediction_summary():
+    """위험도/이탈률 집계 조회 (캐싱, 백엔드에서 GROUP BY 한 결과만 받음)"""
     try:
-        res = requests.get(f"{API_URL}/user_prediction", timeout=10)
+        res = api_client.get("prediction_summary", timeout=10)
+        if res.status_code == 200:
+            return res.json()
+        return None
+    except:
+        return None
+
+
+PREDICTION_DETAIL_PAGE_SIZE = 500
+
+
+@st.cache_data(ttl=60, show_spinner=False)  # 1분 캐싱
+def _fetch_user_prediction_page(cursor=None):
+    """유저별 예측 결과 한 페이지 조회 (컬럼별 배열 형식, user_id 순)"""
+    try:
+        params = {"format": "columnar", "limit": PREDICTION_DETAIL_PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        res = api_client.get("user_prediction", params=params, timeout=10)
         if res.status_code == 200:
             return res.json()
         return None
@@ -888,28 +935,26 @@ def show_admin_home_page():
     st.markdown("## 📊 유저 위험도 및 이탈률 통계")
     
     try:
-        # 전체 유저 예측 데이터 조회 (캐싱 적용)
-        data = _fetch_user_predictions()
+        # 위험도/이탈률 집계 조회 (캐싱 적용)
+        data = _fetch_prediction_summary()
         if data and data.get("success"):
-                predictions = data.get("rows", [])
-                
-                if predictions:
-                    # 데이터프레임 생성
-                    df = pd.DataFrame(predictions)
+                if data.get("total_users", 0) > 0:
+                    risk_counts = data.get("risk_counts", {})
+                    by_risk = pd.DataFrame(data.get("by_risk", []), columns=["risk_score", "count", "avg_churn_rate"])
                     
                     # 통계 요약
                     col1, col2, col3, col4 = st.columns(4)
                     with col1:
-                        total_users = len(df)
+                        total_users = data.get("total_users", 0)
                         st.metric("전체 유저 수", f"{total_users}명")
                     with col2:
-                        avg_churn = df['churn_rate'].mean() if 'churn_rate' in df.columns else 0
+                        avg_churn = data.get("avg_churn_rate", 0)
                         st.metric("평균 이탈률", f"{avg_churn:.1f}%")
                     with col3:
-                        high_risk = len(df[df['risk_score'] == 'HIGH']) if 'risk_score' in df.columns else 0
+                        high_risk = risk_counts.get("HIGH", 0)
                         st.metric("고위험 유저", f"{high_risk}명")
                     with col4:
-                        medium_risk = len(df[df['risk_score'] == 'MEDIUM']) if 'risk_score' in df.columns else 0
+                        medium_risk = risk_counts.get("MEDIUM", 0)
                         st.metric("중위험 유저", f"{medium_risk}명")
                     
                     st.markdown("---")
@@ -919,9 +964,8 @@ def show_admin_home_page():
                     
                     with col_chart1:
                         st.markdown("#### 위험도 분포")
-                        if 'risk_score' in df.columns:
-                            risk_counts = df['risk_score'].value_counts()
-                            
+                        if risk_counts:
+                            risk_counts = pd.Series(risk_counts).sort_values(ascending=False)
                             fig, ax = plt.subplots(figsize=(5, 4))
                             fig.patch.set_facecolor('none')
                             ax.set_facecolor('none')
@@ -945,19 +989,14 @@ def show_admin_home_page():
                     
                     with col_chart2:
                         st.markdown("#### 이탈률 분포")
-                        if 'churn_rate' in df.columns:
+                        churn_histogram = data.get("churn_histogram", [])
+                        if churn_histogram:
                             fig, ax = plt.subplots(figsize=(5, 4))
                             fig.patch.set_facecolor('none')
                             ax.set_facecolor('none')
                             
-                            # 이탈률 구간별 분류
-                            bins = [0, 20, 40, 60, 80, 100]
-                            labels_bin = ['0-20%', '20-40%', '40-60%', '60-80%', '80-100%']
-                            df_temp = df.copy()
-                            df_temp['churn_range'] = pd.cut(df_temp['churn_rate'], bins=bins, labels=labels_bin, include_lowest=True)
-                            churn_counts = df_temp['churn_range'].value_counts().sort_index()
-                            
-                            ax.bar(churn_counts.index, churn_counts.values, color='#3498db')
+                            # 이탈률 구간별 유저 수 (백엔드 집계)
+                            ax.bar([b["range"] for b in churn_histogram], [b["count"] for b in churn_histogram], color='#3498db')
                             ax.set_xlabel('이탈률 구간', fontsize=9, color='white')
                             ax.set_ylabel('유저 수', fontsize=9, color='white')
                             ax.set_title('이탈률 분포', fontsize=11, fontweight='bold', color='white')
@@ -975,9 +1014,9 @@ def show_admin_home_page():
                     
                     with col_chart3:
                         st.markdown("#### 위험도별 평균 이탈률")
-                        if 'risk_score' in df.columns and 'churn_rate' in df.columns:
+                        if not by_risk.empty:
                             risk_labels = {'LOW': '낮음', 'MEDIUM': '중간', 'HIGH': '높음', 'UNKNOWN': '알 수 없음'}
-                            risk_churn = df.groupby('risk_score')['churn_rate'].agg(['mean']).reset_index()
+                            risk_churn = by_risk[['risk_score', 'avg_churn_rate']].copy()
                             risk_churn.columns = ['위험도', '평균 이탈률']
                             risk_churn['위험도'] = risk_churn['위험도'].map(risk_labels).fillna(risk_churn['위험도'])
                             risk_churn['평균 이탈률'] = risk_churn['평균 이탈률'].round(2)
@@ -1015,9 +1054,9 @@ def show_admin_home_page():
                     st.markdown("---")
                     
                     # 위험도별 상세 통계 테이블
-                    if 'risk_score' in df.columns and 'churn_rate' in df.columns:
+                    if not by_risk.empty:
                         risk_labels = {'LOW': '낮음', 'MEDIUM': '중간', 'HIGH': '높음', 'UNKNOWN': '알 수 없음'}
-                        risk_churn = df.groupby('risk_score')['churn_rate'].agg(['mean', 'count']).reset_index()
+                        risk_churn = by_risk[['risk_score', 'avg_churn_rate', 'count']].copy()
                         risk_churn.columns = ['위험도', '평균 이탈률', '유저 수']
                         risk_churn['위험도'] = risk_churn['위험도'].map(risk_labels).fillna(risk_churn['위험도'])
                         risk_churn['평균 이탈률'] = risk_churn['평균 이탈률'].round(2)
@@ -1025,9 +1064,16 @@ def show_admin_home_page():
                     
                     st.markdown("---")
                     
-                    # 상세 데이터 테이블
+                    # 상세 데이터 테이블 (user_id 순으로 PREDICTION_DETAIL_PAGE_SIZE 명씩)
                     st.subheader("유저별 상세 정보")
-                    display_df = df.copy()
+                    if "prediction_detail_cursors" not in st.session_state:
+                        st.session_state.prediction_detail_cursors = [None]
+                    detail_cursors = st.session_state.prediction_detail_cursors
+                    detail_page = _fetch_user_prediction_page(detail_cursors[-1])
+                    if not detail_page or not detail_page.get("success"):
+                        st.info("유저별 상세 정보를 불러올 수 없습니다.")
+                        return
+                    display_df = pd.DataFrame(detail_page.get("data", {}), columns=detail_page.get("columns"))
                     risk_labels = {'LOW': '낮음', 'MEDIUM': '중간', 'HIGH': '높음', 'UNKNOWN': '알 수 없음'}
                     
                     # 필요한 컬럼만 선택하고 이름 변경
@@ -1052,6 +1098,19 @@ def show_admin_home_page():
                     display_df = display_df[display_columns]
                     
                     st.dataframe(display_df, use_container_width=True, height=400)
+                    
+                    page_no = len(detail_cursors)
+                    start_no = (page_no - 1) * PREDICTION_DETAIL_PAGE_SIZE + 1
+                    st.caption(f"{start_no} ~ {start_no + len(display_df) - 1}번째 / 전체 {total_users}명 (전체 목록은 CSV 다운로드 이용)")
+                    col_prev, col_next = st.columns(2)
+                    with col_prev:
+                        if page_no > 1 and st.button("⬅ 이전 목록", key="prediction_detail_prev"):
+                            detail_cursors.pop()
+                            st.rerun()
+                    with col_next:
+                        if detail_page.get("next_cursor") and st.button("다음 목록 ➡", key="prediction_detail_next"):
+                            detail_cursors.append(detail_page["next_cursor"])
+                            st.rerun()
                 else:
                     st.info("예측 데이터가 없습니다. 먼저 이탈 예측을 실행해주세요.")
         elif data:
@@ -1209,7 +1268,7 @@ def show_profile_page():
     user_id = user.get("user_id") if user else None
     if user_id:
         try:
-            requests.post(f"{API_URL}/log", json={
+            api_client.post("log", json={
                 "user_id": user_id,
                 "action_type": "PAGE_VIEW",
                 "page_name": "개인정보 수정"
@@ -1281,7 +1340,7 @@ def show_profile_page():
         st.info("ℹ️ 테스트 계정입니다. 세션 정보를 사용합니다.")
     else:
         try:
-            res = requests.get(f"{API_URL}/users/{user_id}")
+            res = api_client.get(f"users/{user_id}")
             if res.status_code == 200:
                 user_data = res.json()
                 
@@ -1502,7 +1561,7 @@ def show_profile_page():
                                     "reason": reason,
                                     "feedback": feedback
                                 }
-                                res = requests.post(f"{API_URL}/unsubscribe", json=payload)
+                                res = api_client.post("unsubscribe", json=payload)
                                 
                                 if res.status_code == 200:
                                     result = res.json()
@@ -1751,6 +1810,9 @@ def search_user():
     # 페이지 상태 및 조회 실행 여부 관리
     if "user_page" not in st.session_state:
         st.session_state.user_page = 1
+    if "user_page_cursors" not in st.session_state:
+        # user_page_cursors[i] = (i + 1) 페이지를 조회할 cursor (1페이지는 None)
+        st.session_state.user_page_cursors = [None]
     if "search_executed" not in st.session_state:
         st.session_state.search_executed = False
     if "search_params" not in st.session_state:
@@ -1769,6 +1831,7 @@ def search_user():
     if search_button:
         # 조회 실행 시 세션 상태 업데이트
         st.session_state.user_page = 1  # 첫 페이지로 리셋
+        st.session_state.user_page_cursors = [None]
         st.session_state.search_executed = True
         st.session_state.search_params = {
             "name": search_name,
@@ -1794,9 +1857,12 @@ def search_user():
     current_search_risk = saved_params.get("risk_score", "")
     current_page_size = saved_params.get("page_size", page_size)
 
-    # API 요청 URL 구성
+    # API 요청 URL 구성 (cursor 기반 페이지 이동, 전체 개수는 캐시된 값 사용)
+    page_cursors = st.session_state.user_page_cursors
+    page_cursor = page_cursors[page - 1] if page - 1 < len(page_cursors) else None
     api_url = (
-        f"users_search?page={page}&page_size={current_page_size}"
+        f"users_search?page={page}&page_size={current_page_size}&count=cached"
+        f"&cursor={page_cursor or ''}"
         f"&name={current_search_name}"
         f"&user_id={current_search_user_id}"
         f"&favorite_music={current_search_music}"
@@ -1814,6 +1880,7 @@ def search_user():
     rows = res["rows"]
     total_rows = res["total_rows"]
     total_pages = res["total_pages"]
+    next_cursor = res.get("next_cursor")
 
     st.write(f"총 {total_rows}명, 페이지 {page}/{total_pages}")
 
@@ -2106,7 +2173,9 @@ def search_user():
 
     with colC:
         if st.button("다음 페이지 ➡"):
-            if page < total_pages:
+            if next_cursor:
+                del page_cursors[page:]
+                page_cursors.append(next_cursor)
                 st.session_state.user_page += 1
                 st.rerun()
 
@@ -2133,26 +2202,32 @@ def show_achievements_admin_page():
     with tab1:
         st.subheader("📋 도전과제 목록")
         try:
-            res = requests.get(f"{API_URL}/achievements")
+            res = api_client.get("achievements")
             if res.status_code == 200:
                 data = res.json()
                 if data.get("success"):
                     achievements = data.get("achievements", [])
                     
                     if achievements:
+                        # 전체 도전과제 통계를 한 번에 조회
+                        statistics_by_id = {}
+                        total_users = 0
+                        try:
+                            res_stats = api_client.get("achievements/statistics")
+                            if res_stats.status_code == 200:
+                                stats_data = res_stats.json()
+                                if stats_data.get("success"):
+                                    total_users = stats_data.get("total_users", 0)
+                                    statistics_by_id = {
+                                        stat.get("achievement_id"): {**stat, "total_users": total_users}
+                                        for stat in stats_data.get("statistics", [])
+                                    }
+                        except:
+                            pass
+                        
                         for achievement in achievements:
                             achievement_id = achievement.get('achievement_id')
-                            
-                            # 도전과제 통계 조회
-                            statistics = None
-                            try:
-                                res_stats = requests.get(f"{API_URL}/achievements/{achievement_id}/statistics")
-                                if res_stats.status_code == 200:
-                                    stats_data = res_stats.json()
-                                    if stats_data.get("success"):
-                                        statistics = stats_data
-                            except:
-                                pass
+                            statistics = statistics_by_id.get(achievement_id)
                             
                             with st.container(border=True):
                                 col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
@@ -2180,14 +2255,39 @@ def show_achievements_admin_page():
                                         # 달성한 유저 목록 (expander)
                                         if statistics.get('completed_count', 0) > 0:
                                             with st.expander(f"달성한 유저 목록 ({statistics.get('completed_count', 0)}명)", expanded=False):
-                                                completed_users = statistics.get('completed_users', [])
-                                                if completed_users:
-                                                    for user in completed_users:
-                                                        completed_at = user.get('completed_at', '')
-                                                        if completed_at:
-                                                            completed_at = completed_at[:10]  # 날짜만 표시
-                                                        st.write(f"• {user.get('name', '')} (ID: {user.get('user_id', '')}) - {completed_at}")
-                                                else:
+                                                # 목록은 버튼을 눌렀을 때 페이지 단위로 조회
+                                                page_key = f"completed_users_{achievement_id}"
+                                                page_state = st.session_state.get(page_key)
+                                                completed_users = page_state["users"] if page_state else []
+                                                for user in completed_users:
+                                                    completed_at = user.get('completed_at', '')
+                                                    if completed_at:
+                                                        completed_at = completed_at[:10]  # 날짜만 표시
+                                                    st.write(f"• {user.get('name', '')} (ID: {user.get('user_id', '')}) - {completed_at}")
+                                                
+                                                if page_state is None or page_state.get("next_cursor"):
+                                                    button_label = "목록 불러오기" if page_state is None else "더 보기"
+                                                    if st.button(button_label, key=f"load_completed_users_{achievement_id}"):
+                                                        params = {"limit": 50}
+                                                        if page_state:
+                                                            params["cursor"] = page_state["next_cursor"]
+                                                        try:
+                                                            res_users = api_client.get(
+                                                                f"achievements/{achievement_id}/statistics",
+                                                                params=params
+                                                            )
+                                                            users_data = res_users.json()
+                                                            if res_users.status_code == 200 and users_data.get("success"):
+                                                                st.session_state[page_key] = {
+                                                                    "users": completed_users + users_data.get("completed_users", []),
+                                                                    "next_cursor": users_data.get("next_cursor")
+                                                                }
+                                                                st.rerun()
+                                                            else:
+                                                                st.error(users_data.get("error", "달성한 유저 목록 조회 실패"))
+                                                        except Exception as e:
+                                                            st.error(f"달성한 유저 목록 조회 중 오류: {e}")
+                                                elif not completed_users:
                                                     st.info("달성한 유저가 없습니다.")
                                 with col2:
                                     if achievement.get('is_active'):
@@ -2206,7 +2306,7 @@ def show_achievements_admin_page():
                                 with col4:
                                     if st.button("삭제", key=f"delete_achievement_{achievement_id}", type="secondary", use_container_width=True):
                                         try:
-                                            res_delete = requests.delete(f"{API_URL}/achievements/{achievement_id}")
+                                            res_delete = api_client.delete(f"achievements/{achievement_id}")
                                             if res_delete.status_code == 200:
                                                 st.success("도전과제가 삭제되었습니다!")
                                                 st.rerun()
@@ -2264,7 +2364,7 @@ def show_achievements_admin_page():
                             "target_track_uri": target_track_uri,
                             "reward_points": reward_points
                         }
-                        res = requests.post(f"{API_URL}/achievements", json=payload)
+                        res = api_client.post("achievements", json=payload)
                         if res.status_code == 200:
                             result = res.json()
                             if result.get("success"):
@@ -2296,7 +2396,7 @@ def show_achievements_page():
         # 사용자의 도전과제 조회 (캐싱 적용)
         achievements_cache_key = f"user_achievements_{user_id}"
         if achievements_cache_key not in st.session_state:
-            res = requests.get(f"{API_URL}/users/{user_id}/achievements", timeout=5)
+            res = api_client.get(f"users/{user_id}/achievements", timeout=5)
             if res.status_code == 200:
                 data = res.json()
                 if data.get("success"):
@@ -2327,7 +2427,7 @@ def show_achievements_page():
                 else:
                     # 캐싱이 없으면 조회
                     try:
-                        res_selected = requests.get(f"{API_URL}/users/{user_id}/selected_achievement", timeout=3)
+                        res_selected = api_client.get(f"users/{user_id}/selected_achievement", timeout=3)
                         if res_selected.status_code == 200:
                             data_selected = res_selected.json()
                             if data_selected.get("success") and data_selected.get("selected_achievement"):
@@ -2356,8 +2456,8 @@ def show_achievements_page():
                                 st.success("⭐ 칭호")
                                 if st.button("칭호 해제", key=f"deselect_title_{achievement_id}", use_container_width=True):
                                     try:
-                                        res_update = requests.put(
-                                            f"{API_URL}/users/{user_id}/selected_achievement",
+                                        res_update = api_client.put(
+                                            f"users/{user_id}/selected_achievement",
                                             json={"achievement_id": None}
                                         )
                                         if res_update.status_code == 200:
@@ -2374,8 +2474,8 @@ def show_achievements_page():
                             else:
                                 if st.button("칭호로 선택", key=f"select_title_{achievement_id}", use_container_width=True):
                                     try:
-                                        res_update = requests.put(
-                                            f"{API_URL}/users/{user_id}/selected_achievement",
+                                        res_update = api_client.put(
+                                            f"users/{user_id}/selected_achievement",
                                             json={"achievement_id": achievement_id}
                                         )
                                         if res_update.status_code == 200:
@@ -2482,6 +2582,9 @@ def show_logs_page():
     # 페이지 상태 관리
     if "log_page" not in st.session_state:
         st.session_state.log_page = 1
+    if "log_page_cursors" not in st.session_state:
+        # log_page_cursors[i] = (i + 1) 페이지를 조회할 cursor (1페이지는 None)
+        st.session_state.log_page_cursors = [None]
     if "log_search_executed" not in st.session_state:
         st.session_state.log_search_executed = False
     if "log_search_params" not in st.session_state:
@@ -2489,6 +2592,7 @@ def show_logs_page():
     
     if search_button:
         st.session_state.log_page = 1
+        st.session_state.log_page_cursors = [None]
         st.session_state.log_search_executed = True
         st.session_state.log_search_params = {
             "user_id": search_user_id,
@@ -2508,8 +2612,13 @@ def show_logs_page():
     current_page_size = saved_params.get("page_size", page_size)
     page = st.session_state.log_page
     
-    # API 요청
-    api_url = f"logs?page={page}&page_size={current_page_size}"
+    # API 요청 (cursor 기반 페이지 이동, 전체 개수는 캐시된 값 사용)
+    page_cursors = st.session_state.log_page_cursors
+    page_cursor = page_cursors[page - 1] if page - 1 < len(page_cursors) else None
+    api_url = (
+        f"logs?page={page}&page_size={current_page_size}&count=cached"
+        f"&cursor={page_cursor or ''}"
+    )
     if current_user_id:
         api_url += f"&user_id={current_user_id}"
     if current_action_type:
@@ -2525,6 +2634,7 @@ def show_logs_page():
     rows = res["rows"]
     total_rows = res["total_rows"]
     total_pages = res["total_pages"]
+    next_cursor = res.get("next_cursor")
     
     st.write(f"총 {total_rows}개 로그, 페이지 {page}/{total_pages}")
     st.markdown("---")
@@ -2549,7 +2659,9 @@ def show_logs_page():
             st.write(f"현재 페이지: {page}")
         with colC:
             if st.button("다음 페이지 ➡", key="log_next"):
-                if page < total_pages:
+                if next_cursor:
+                    del page_cursors[page:]
+                    page_cursors.append(next_cursor)
                     st.session_state.log_page += 1
                     st.rerun()
     else:
@@ -2572,7 +2684,7 @@ def show_churn_prediction_page():
     
     if st.button("유저 데이터 불러오기"):
         try:
-            res = requests.get(f"{API_URL}/user_features/{user_id}")
+            res = api_client.get(f"user_features/{user_id}")
             if res.status_code == 200:
                 data = res.json()
                 if data.get("success"):
@@ -2642,7 +2754,7 @@ def show_churn_prediction_page():
                 with log_container.container():
                     st.caption("🔄 API 호출 중...")
                 
-                res = requests.post(f"{API_URL}/predict_churn", json=payload, timeout=60)
+                res = api_client.post("predict_churn", json=payload, timeout=60)
                 
                 progress_bar.progress(0.7)
                 with log_container.container():
@@ -2755,7 +2867,7 @@ def show_churn_prediction_bulk_page():
                         st.caption(f"📊 3단계: 백엔드에서 배치 예측 처리 중...")
                         st.caption(f"   - DB에서 {total_rows}개 유저 피처 조회 중...")
                     
-                    res = requests.post(f"{API_URL}/predict_churn_bulk", json=payload, timeout=600)
+                    res = api_client.post("predict_churn_bulk", json=payload, timeout=600)
                     
                     progress_bar.progress(0.8)
                     
@@ -2978,7 +3090,7 @@ def show_churn_prediction_6feat_page():
             with log_container.container():
                 st.caption("🔄 API 호출 중...")
             
-            res = requests.post(f"{API_URL}/predict_churn_6feat", json=payload, timeout=60)
+            res = api_client.post("predict_churn_6feat", json=payload, timeout=60)
             
             progress_bar.progress(0.7)
             with log_container.container():
@@ -3035,7 +3147,7 @@ def show_prediction_results_page():
         user_id = st.number_input("User ID", min_value=1, value=1, step=1, key="result_user_id")
         if st.button("조회", key="result_single"):
             try:
-                res = requests.get(f"{API_URL}/user_prediction/{user_id}")
+                res = api_client.get(f"user_prediction/{user_id}")
                 if res.status_code == 200:
                     result = res.json()
                     if result.get("success"):
@@ -3066,7 +3178,7 @@ def show_prediction_results_page():
                 if user_ids_input.strip():
                     params["user_ids"] = user_ids_input.strip()
                 
-                res = requests.get(f"{API_URL}/user_prediction", params=params)
+                res = api_client.get("user_prediction", params=params)
                 if res.status_code == 200:
                     result = res.json()
                     if result.get("success"):
@@ -3136,7 +3248,7 @@ def show_prediction_csv_page():
                     if st.button("일괄 예측 실행", type="primary"):
                         try:
                             files = {"file": (uploaded_file.name, uploaded_file.getvalue(), "text/csv")}
-                            res = requests.post(f"{API_URL}/upload_prediction_csv", files=files)
+                            res = api_client.post("upload_prediction_csv", files=files, timeout=LONG_API_TIMEOUT)
                             if res.status_code == 200:
                                 result = res.json()
                                 if result.get("success"):
@@ -3156,7 +3268,7 @@ def show_prediction_csv_page():
         
         if st.button("CSV 다운로드", type="primary"):
             try:
-                res = requests.get(f"{API_URL}/download_prediction_csv")
+                res = api_client.get("download_prediction_csv", timeout=LONG_API_TIMEOUT)
                 if res.status_code == 200:
                     st.download_button(
                         label="다운로드",
@@ -3181,7 +3293,7 @@ def show_user_admin_tools():
 
     # User 테이블 생성
     if st.button("📘 User Table 생성"):
-        ok, res = call_api("init_user_table")
+        ok, res = call_api("init_user_table", timeout=LONG_API_TIMEOUT)
         if ok:
             st.success(res.get("message", "테이블 생성 완료"))
         else:
@@ -3189,7 +3301,7 @@ def show_user_admin_tools():
 
     # User Features 테이블 생성
     if st.button("📊 User Features Table 생성"):
-        ok, res = call_api("init_user_features_table")
+        ok, res = call_api("init_user_features_table", timeout=LONG_API_TIMEOUT)
         if ok:
             st.success(res.get("message", "테이블 생성 완료"))
         else:
@@ -3197,7 +3309,7 @@ def show_user_admin_tools():
 
     # User Prediction 테이블 생성
     if st.button("📊 User Prediction Table 생성"):
-        ok, res = call_api("init_user_prediction_table")
+        ok, res = call_api("init_user_prediction_table", timeout=LONG_API_TIMEOUT)
         if ok:
             st.success(res.get("message", "테이블 생성 완료"))
         else:
@@ -3205,7 +3317,7 @@ def show_user_admin_tools():
 
     # Log 테이블 생성
     if st.button("📋 Log Table 생성"):
-        ok, res = call_api("init_log_table")
+        ok, res = call_api("init_log_table", timeout=LONG_API_TIMEOUT)
         if ok:
             st.success(res.get("message", "테이블 생성 완료"))
         else:
@@ -3216,7 +3328,7 @@ def show_user_admin_tools():
     
     # Achievements 테이블 생성
     if st.button("🏆 Achievements Table 생성"):
-        ok, res = call_api("init_achievements_table")
+        ok, res = call_api("init_achievements_table", timeout=LONG_API_TIMEOUT)
         if ok:
             st.success(res.get("message", "테이블 생성 완료"))
         else:
@@ -3224,7 +3336,7 @@ def show_user_admin_tools():
     
     # User Achievements 테이블 생성
     if st.button("📊 User Achievements Table 생성"):
-        ok, res = call_api("init_user_achievements_table")
+        ok, res = call_api("init_user_achievements_table", timeout=LONG_API_TIMEOUT)
         if ok:
             st.success(res.get("message", "테이블 생성 완료"))
         else:
@@ -3232,11 +3344,22 @@ def show_user_admin_tools():
     
     # Music Playback Log 테이블 생성
     if st.button("🎵 Music Playback Log Table 생성"):
-        ok, res = call_api("init_music_playback_log_table")
+        ok, res = call_api("init_music_playback_log_table", timeout=LONG_API_TIMEOUT)
         if ok:
             st.success(res.get("message", "테이블 생성 완료"))
         else:
             st.error(res)
+
+    # 재생 횟수 집계 테이블 생성 (기존 재생 로그로 재집계)
+    if st.button("🔢 Play Count Tables 생성 / 재집계"):
+        ok, res = call_api("init_play_count_tables", timeout=LONG_API_TIMEOUT)
+        if ok:
+            st.success(
+                f"{res.get('message', '테이블 생성 완료')} "
+                f"(장르 {res.get('genre_rows', 0)}행, 트랙 {res.get('track_rows', 0)}행)"
+            )
+        else:
+            st.error(res)
     
 
     st.markdown("---")
@@ -3245,7 +3368,7 @@ def show_user_admin_tools():
     # 테스트 계정 설정 버튼
     if st.button("🧪 테스트 계정 설정 (위험도 HIGH)", type="primary"):
         try:
-            res = requests.post(f"{API_URL}/setup_test_accounts", timeout=30)
+            res = api_client.post("setup_test_accounts", timeout=30)
             if res.status_code == 200:
                 result = res.json()
                 if result.get("success"):
@@ -3263,7 +3386,7 @@ def show_user_admin_tools():
     
     # CSV → DB Insert 실행 (users)
     if st.button("📥 Users CSV → DB Insert 실행"):
-        ok, res = call_api("import_users_from_csv")
+        ok, res = call_api("import_users_from_csv", timeout=LONG_API_TIMEOUT, retries=0)
         if ok:
             st.success(res.get("message", "CSV Import 완료"))
         else:
@@ -3297,7 +3420,7 @@ def show_user_admin_tools():
                             # 파일을 다시 읽어서 전송
                             uploaded_file.seek(0)  # 파일 포인터를 처음으로
                             files = {'file': (uploaded_file.name, uploaded_file, 'text/csv')}
-                            res = requests.post(f"{API_URL}/import_user_features_from_csv", files=files)
+                            res = api_client.post("import_user_features_from_csv", files=files, timeout=LONG_API_TIMEOUT)
                             
                             if res.status_code == 200:
                                 result = res.json()
@@ -3330,7 +3453,7 @@ def show_user_admin_tools():
     if st.button("📥 기본 경로 CSV Import 실행 (data/enhanced_data_not_clean_FE_delete.csv)"):
         try:
             with st.spinner("CSV 데이터를 import하는 중..."):
-                res = requests.post(f"{API_URL}/import_user_features_from_csv")
+                res = api_client.post("import_user_features_from_csv", timeout=LONG_API_TIMEOUT)
                 if res.status_code == 200:
                     result = res.json()
                     if result.get("success"):
@@ -3369,42 +3492,25 @@ def show_main_page():
     user_id = user.get("user_id")
     grade = user.get("grade")
     
+    # 위험도/구독 유형/선택한 칭호/도전과제 목록을 한 번에 조회
+    achievement_key = f"selected_achievement_{user_id}"
+    home = fetch_user_home(user_id) if user_id else None
+    if home:
+        st.session_state[achievement_key] = home.get("selected_achievement")
+        st.session_state[f"user_achievements_{user_id}"] = home.get("achievements", [])
+
     # 위험도 정보를 저장할 변수 (나중에 배너 표시용)
     risk_banner_data = None
-    if grade != "99" and user_id:
-        try:
-            # 위험도와 구독 유형 조회
-            res_prediction = requests.get(f"{API_URL}/user_prediction/{user_id}", timeout=5)
-            res_features = requests.get(f"{API_URL}/user_features/{user_id}", timeout=5)
-            
-            risk_score = None
-            subscription_type = None
-            
-            if res_prediction.status_code == 200:
-                pred_data = res_prediction.json()
-                if pred_data.get("success"):
-                    risk_score = pred_data.get("data", {}).get("risk_score")
-            elif res_prediction.status_code == 404:
-                # user_prediction에 데이터가 없는 경우 (정상)
-                risk_score = None
-            
-            if res_features.status_code == 200:
-                feat_data = res_features.json()
-                if feat_data.get("success"):
-                    subscription_type = feat_data.get("data", {}).get("subscription_type")
-            elif res_features.status_code == 404:
-                # user_features에 데이터가 없는 경우 (정상)
-                subscription_type = None
-            
-            # 위험도가 HIGH인 경우 배너 데이터 저장
-            if risk_score == "HIGH":
-                risk_banner_data = {
-                    "subscription_type": subscription_type,
-                    "user_id": user_id
-                }
-        except Exception as e:
-            # 오류 발생 시 무시
-            pass
+    if grade != "99" and home:
+        risk_score = (home.get("prediction") or {}).get("risk_score")
+        subscription_type = (home.get("features") or {}).get("subscription_type")
+        
+        # 위험도가 HIGH인 경우 배너 데이터 저장
+        if risk_score == "HIGH":
+            risk_banner_data = {
+                "subscription_type": subscription_type,
+                "user_id": user_id
+            }
     
     # ---------------------------
     # 사용자 정보 사이드바 출력
@@ -3415,22 +3521,6 @@ def show_main_page():
         st.write(f"**이름:** {user['name']}")
         st.write(f"**등급:** {user['grade']}")
         
-        # 선택한 칭호 표시 (캐싱 적용)
-        achievement_key = f"selected_achievement_{user_id}"
-        if achievement_key not in st.session_state:
-            try:
-                res = requests.get(f"{API_URL}/users/{user_id}/selected_achievement", timeout=3)
-                if res.status_code == 200:
-                    data = res.json()
-                    if data.get("success") and data.get("selected_achievement"):
-                        st.session_state[achievement_key] = data.get("selected_achievement")
-                    else:
-                        st.session_state[achievement_key] = None
-                else:
-                    st.session_state[achievement_key] = None
-            except:
-                st.session_state[achievement_key] = None
-        
         # 캐싱된 칭호 정보 표시
         achievement = st.session_state.get(achievement_key)
         if achievement:
@@ -3440,6 +3530,22 @@ def show_main_page():
             st.caption(achievement.get('description', ''))
         
         st.markdown("---")
+
+        # 관리자: 이 프로세스의 API 호출 응답 시간
+        if grade == "99":
+            with st.expander("⏱️ API 응답 시간"):
+                api_stats = api_client.stats()
+                if api_stats:
+                    st.dataframe(
+                        pd.DataFrame(api_stats)[["endpoint", "calls", "avg_ms", "max_ms", "errors", "retries"]],
+                        hide_index=True,
+                        use_container_width=True,
+                    )
+                    if st.button("초기화", key="reset_api_stats"):
+                        api_client.reset_stats()
+                        st.rerun()
+                else:
+                    st.caption("기록된 호출이 없습니다.")
         
     # # ---------------------------
     # # 메인 화면 제목
@@ -3496,7 +3602,7 @@ def show_main_page():
             }
             page_name = page_name_map.get(menu, menu)
                 # 매우 짧은 타임아웃으로 비동기 처리 (화면 전환 속도에 영향 없음)
-            requests.post(f"{API_URL}/log", json={
+            api_client.post("log", json={
                 "user_id": user_id,
                 "action_type": "PAGE_VIEW",
                 "page_name": page_name
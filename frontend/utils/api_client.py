@@ -0,0 +1,160 @@
+"""
+api_client.py (백엔드 API 호출 유틸리티)
+Auth: 박수빈
+Date: 2025-11-18
+Description
+- 프로세스에서 공유하는 keep-alive requests.Session 으로 Flask API 호출
+  (st.cache_resource → Streamlit rerun/세션이 바뀌어도 같은 연결 풀 재사용)
+- 기본 타임아웃 (연결 3초 / 응답 30초), 호출별로 timeout 지정 가능
+- 멱등 요청(GET/HEAD)만 연결 실패/타임아웃/502·503·504 응답에 대해 backoff 재시도
+- 엔드포인트별 응답 시간 기록 (stats() - 숫자 path 는 {id} 로 묶음)
+- fetch_all(): 서로 독립적인 호출 여러 개를 스레드 풀에서 동시에 실행
+  (화면 로딩 시간 = 호출 시간의 합 → 가장 느린 호출 시간)
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_TIMEOUT = (3.05, 30)
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+RETRY_STATUS = frozenset({502, 503, 504})
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class ApiClient:
+    """Flask API 호출용 공유 세션 클라이언트"""
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT, retries=2, backoff_seconds=0.3, pool_maxsize=10):
+        """
+        Args:
+            base_url: API 기본 주소 (예: http://localhost:5000/api)
+            timeout: 기본 타임아웃 (초 또는 (연결, 응답) 튜플)
+            retries: GET/HEAD 최대 재시도 횟수
+            backoff_seconds: 첫 재시도 대기 시간 (재시도마다 2배)
+            pool_maxsize: 유지할 최대 keep-alive 연결 수
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.backoff_seconds = backoff_seconds
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    # ---------------------------------------------------------
+    # 호출
+    # ---------------------------------------------------------
+    def request(self, method, path, timeout=None, retries=None, **kwargs):
+        """
+        {base_url}/{path} 호출 → requests.Response
+        (재시도 후에도 연결 실패/타임아웃이면 requests 예외를 그대로 전달)
+        """
+        method = method.upper()
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        max_retries = (self.retries if retries is None else retries) if method in RETRY_METHODS else 0
+        endpoint = f"{method} {_NUMERIC_SEGMENT.sub('/{id}', '/' + path.split('?')[0].strip('/'))}"
+
+        attempt = 0
+        started = time.perf_counter()
+        while True:
+            try:
+                res = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+                if res.status_code not in RETRY_STATUS or attempt >= max_retries:
+                    self._record(endpoint, started, attempt, error=res.status_code >= 500)
+                    return res
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= max_retries:
+                    self._record(endpoint, started, attempt, error=True)
+                    raise
+            time.sleep(self.backoff_seconds * (2 ** attempt))
+            attempt += 1
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    # ---------------------------------------------------------
+    # 응답 시간 기록
+    # ---------------------------------------------------------
+    def _record(self, endpoint, started, retries, error):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stat = self._stats.setdefault(
+                endpoint, {"calls": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            stat["calls"] += 1
+            stat["errors"] += int(error)
+            stat["retries"] += retries
+            stat["total_ms"] += elapsed_ms
+            stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+
+    def stats(self):
+        """엔드포인트별 호출 수/오류 수/재시도 수/평균·최대 응답 시간(ms), 총 소요 시간 큰 순"""
+        with self._lock:
+            rows = [{"endpoint": endpoint, **stat} for endpoint, stat in self._stats.items()]
+        for row in rows:
+            row["avg_ms"] = round(row["total_ms"] / row["calls"], 1)
+            row["total_ms"] = round(row["total_ms"], 1)
+            row["max_ms"] = round(row["max_ms"], 1)
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+@st.cache_resource
+def get_api_client(base_url):
+    """base_url 별로 하나만 만들어 프로세스 전체에서 공유"""
+    return ApiClient(base_url)
+
+
+@st.cache_resource
+def _fetch_executor():
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="api-fetch")
+
+
+def fetch_all(calls, default=None):
+    """
+    {이름: 인자 없는 함수} 를 동시에 실행하고 {이름: 결과} 로 모아서 반환합니다.
+    - 예외가 난 호출은 로그만 남기고 default 로 채웁니다.
+    - 함수 안에서 st.* 를 호출하지 마세요. (스레드에는 Streamlit 실행 컨텍스트가 없음)
+      HTTP 호출만 하고, 화면 출력/session_state 저장은 결과를 받은 뒤에 합니다.
+    """
+    if not calls:
+        return {}
+    if len(calls) == 1:
+        futures = None
+    else:
+        executor = _fetch_executor()
+        futures = {name: executor.submit(fn) for name, fn in calls.items()}
+
+    results = {}
+    for name, fn in calls.items():
+        try:
+            results[name] = futures[name].result() if futures else fn()
+        except Exception as e:
+            print(f"[fetch_all] {name} 호출 실패: {e}")
+            results[name] = default
+    return results
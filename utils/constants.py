@@ -5,13 +5,18 @@ Date: 2025-11-18
 Description
 - 공용 상수 선언 파일
 - 로컬 / 외부(팀원) 환경 자동 스위칭
+- DB 연결 풀 (get_connection / db_connection)
+- 대용량 내보내기용 스트리밍 연결 (get_streaming_connection)
 """
 
 import os
 import pymysql
 from dotenv import load_dotenv
-from pymysql.cursors import DictCursor
+from pymysql.cursors import DictCursor, SSCursor
+import queue
 import threading
+import time
+from contextlib import contextmanager
 
 # -------------------------------------
 # .env 파일 로드
@@ -51,37 +56,27 @@ else:
 # -------------------------------------
 # 연결 풀 설정
 # -------------------------------------
+# 환경 변수로 풀 크기/타임아웃 조정 가능
+POOL_CONFIG = {
+    "max_connections": int(os.getenv("DB_POOL_MAX", 10)),
+    "min_connections": int(os.getenv("DB_POOL_MIN", 2)),
+    "max_idle_seconds": float(os.getenv("DB_POOL_MAX_IDLE", 300)),     # 이 시간 이상 놀던 연결은 폐기 후 재생성
+    "ping_interval_seconds": float(os.getenv("DB_POOL_PING_INTERVAL", 5)),  # 이 시간 이상 놀던 연결은 대여 시 ping 확인
+    "checkout_timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),        # 풀이 가득 찼을 때 대기 시간
+}
+
 _connection_pool = None
 _pool_lock = threading.Lock()
 
-def _init_connection_pool():
-    """연결 풀 초기화"""
-    global _connection_pool
-    if _connection_pool is None:
-        with _pool_lock:
-            if _connection_pool is None:
-                # pymysql은 기본적으로 연결 풀을 지원하지 않으므로
-                # 연결 재사용을 위한 최적화 설정
-                _connection_pool = {
-                    "config": DB_CONFIG,
-                    "max_connections": 10,
-                    "min_connections": 2
-                }
-    return _connection_pool
 
-# -------------------------------------
-# DB Connection 함수 (최적화)
-# -------------------------------------
-def get_connection():
+def _create_raw_connection():
     """
-    MySQL DB 연결 생성 (연결 최적화)
+    MySQL DB 실제 연결 생성
     - autocommit=False: 트랜잭션 제어 가능
     - connect_timeout=5: 연결 타임아웃 설정
     - read_timeout=10: 읽기 타임아웃 설정
     - write_timeout=10: 쓰기 타임아웃 설정
     """
-    _init_connection_pool()
-    
     return pymysql.connect(
         host=DB_CONFIG["host"],
         port=DB_CONFIG["port"],
@@ -96,3 +91,266 @@ def get_connection():
         write_timeout=10,  # 쓰기 타임아웃
         init_command="SET sql_mode='STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO'"
     )
+
+
+class PoolTimeoutError(Exception):
+    """풀의 모든 연결이 사용 중이고 대기 시간 안에 반환되지 않은 경우"""
+
+
+class PooledConnection:
+    """
+    풀에서 대여한 pymysql 연결 래퍼
+
+    - cursor/commit/rollback 등은 실제 연결로 그대로 위임
+    - close() 는 연결을 끊지 않고 풀에 반환 (기존 라우트의 conn.close() 호출을 그대로 사용 가능)
+    """
+
+    def __init__(self, pool, raw_conn):
+        self._pool = pool
+        self._conn = raw_conn
+
+    def __getattr__(self, name):
+        conn = self.__dict__.get("_conn")
+        if conn is None:
+            raise pymysql.err.InterfaceError(0, "이미 풀에 반환된 연결입니다.")
+        return getattr(conn, name)
+
+    def close(self):
+        """연결을 풀에 반환 (중복 호출 시 무시)"""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+
+    def __del__(self):
+        # close() 없이 버려진 연결(예외/조기 return)은 GC 시점에 풀로 회수
+        conn = self.__dict__.get("_conn")
+        if conn is not None:
+            self._conn = None
+            self._pool.reclaim(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 고정 크기 MySQL 연결 풀
+
+    - min_connections 만큼 미리 연결을 만들어 둠 (pre-warm)
+    - 대여 시 오래 놀던 연결은 ping 으로 상태 확인, 실패하면 새 연결로 교체
+    - max_idle_seconds 이상 사용되지 않은 연결은 폐기 후 재생성
+    - 동시에 빌려줄 수 있는 연결 수는 max_connections 로 제한
+    """
+
+    def __init__(self, connect_func, max_connections=10, min_connections=2,
+                 max_idle_seconds=300.0, ping_interval_seconds=5.0, checkout_timeout=10.0):
+        self._connect = connect_func
+        self.max_connections = max(1, max_connections)
+        self.min_connections = max(0, min(min_connections, self.max_connections))
+        self.max_idle_seconds = max_idle_seconds
+        self.ping_interval_seconds = ping_interval_seconds
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = []  # [(raw_conn, last_used_at)] - 마지막에 반환된 연결부터 재사용 (LIFO)
+        self._in_use = 0
+        self._cond = threading.Condition(threading.Lock())
+        # __del__ 에서 회수된 연결 (SimpleQueue.put 은 __del__ 에서도 안전하게 호출 가능)
+        self._orphans = queue.SimpleQueue()
+
+    def prewarm(self):
+        """min_connections 만큼 연결을 미리 생성 (DB 미기동 시에도 서버 기동은 계속)"""
+        while True:
+            with self._cond:
+                if len(self._idle) + self._in_use >= self.min_connections:
+                    return
+            try:
+                conn = self._connect()
+            except Exception as e:
+                print(f"[DB Pool] 사전 연결 생성 실패 (요청 시 재시도): {e}")
+                return
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def acquire(self, timeout=None):
+        """연결 대여 (풀이 가득 차면 timeout 동안 대기)"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            self._drain_orphans()
+            with self._cond:
+                if self._idle or self._in_use < self.max_connections:
+                    candidate = self._idle.pop() if self._idle else None
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"DB 연결 풀이 가득 찼습니다. (max_connections={self.max_connections})"
+                    )
+                # 회수 대기 중인 연결도 확인할 수 있도록 짧게 나눠서 대기
+                self._cond.wait(min(remaining, 0.1))
+
+        try:
+            conn = self._validate(candidate) if candidate is not None else None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, conn)
+
+    def _validate(self, candidate):
+        """대여 직전 연결 상태 확인 - 사용할 수 없으면 닫고 None 반환"""
+        conn, last_used_at = candidate
+        idle_for = time.monotonic() - last_used_at
+
+        if idle_for >= self.max_idle_seconds or not conn.open:
+            self._discard(conn)
+            return None
+
+        if idle_for >= self.ping_interval_seconds:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                self._discard(conn)
+                return None
+
+        return conn
+
+    def release(self, conn):
+        """연결 반환 - 끝나지 않은 트랜잭션은 롤백해 다음 사용자에게 넘기지 않음"""
+        reusable = conn.open
+        if reusable:
+            try:
+                conn.rollback()
+            except Exception:
+                reusable = False
+
+        if not reusable:
+            self._discard(conn)
+
+        with self._cond:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def reclaim(self, conn):
+        """GC 로 회수된 연결을 다음 acquire 에서 반환 처리하도록 예약"""
+        self._orphans.put(conn)
+
+    def _drain_orphans(self):
+        while True:
+            try:
+                conn = self._orphans.get_nowait()
+            except queue.Empty:
+                return
+            self.release(conn)
+
+    def close_all(self):
+        """대기 중인 연결을 모두 닫음 (대여 중인 연결은 반환 시점에 정리)"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def status(self):
+        """풀 상태 (모니터링용)"""
+        with self._cond:
+            return {
+                "max_connections": self.max_connections,
+                "min_connections": self.min_connections,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+            }
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def _init_connection_pool():
+    """연결 풀 초기화 (최초 1회, min_connections 만큼 미리 연결)"""
+    global _connection_pool
+    if _connection_pool is None:
+        with _pool_lock:
+            if _connection_pool is None:
+                pool = ConnectionPool(_create_raw_connection, **POOL_CONFIG)
+                pool.prewarm()
+                _connection_pool = pool
+    return _connection_pool
+
+# -------------------------------------
+# DB Connection 함수 (연결 풀 사용)
+# -------------------------------------
+def get_connection():
+    """
+    연결 풀에서 MySQL DB 연결을 대여
+    - 반환된 연결의 close() 는 실제로 연결을 끊지 않고 풀에 반환합니다.
+    - 연결 옵션은 _create_raw_connection() 참고
+    """
+    return _init_connection_pool().acquire()
+
+
+def get_streaming_connection(net_write_timeout=600):
+    """
+    대용량 내보내기(CSV 스트리밍 등) 전용 연결 - 풀을 사용하지 않음
+
+    - SSCursor(unbuffered): 결과를 클라이언트 메모리에 한 번에 받지 않고 fetchmany 로 조금씩 읽음
+    - 응답 전송이 느려 결과를 천천히 읽어도 서버가 끊지 않도록 net_write_timeout 을 늘림
+    - 오래 걸리는 다운로드가 API 요청용 풀 연결을 붙잡지 않도록 별도 연결 사용
+    - 사용 후 반드시 close() (중간에 멈춘 경우 남은 결과를 읽지 않고 연결째 닫음)
+    """
+    return pymysql.connect(
+        host=DB_CONFIG["host"],
+        port=DB_CONFIG["port"],
+        user=DB_CONFIG["user"],
+        password=DB_CONFIG["password"],
+        db=DB_CONFIG["db"],
+        charset=DB_CONFIG["charset"],
+        cursorclass=SSCursor,
+        autocommit=True,  # 읽기 전용
+        connect_timeout=5,
+        read_timeout=60,
+        write_timeout=10,
+        init_command=f"SET SESSION net_write_timeout = {int(net_write_timeout)}"
+    )
+
+
+@contextmanager
+def db_connection():
+    """
+    연결 대여/반환 컨텍스트 매니저
+
+    사용 예시:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(...)
+            conn.commit()
+
+    - 블록 안에서 예외가 발생하면 롤백 후 풀에 반환
+    - commit 은 호출하는 쪽에서 명시적으로 수행
+    """
+    conn = get_connection()
+    try:
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        conn.close()
@@ -4,16 +4,98 @@ Auth: 박수빈
 Date: 2025-11-18
 Description
 - User Data DB Insert (bcrypt 암호화)
+- bcrypt 해싱은 CPU 작업이지만 bcrypt 가 해싱 중 GIL 을 놓으므로 스레드 풀에서 병렬로 처리
+  (Flask 요청 스레드에서 프로세스를 fork 하지 않도록 프로세스 풀 대신 모듈 전역 스레드 풀 재사용)
+- 해싱 결과를 batch_size 행씩 executemany 로 INSERT, commit_interval 행마다 commit
+- 행마다 print 하지 않고 progress_callback 으로 진행 상황 전달
 """
 
 import csv
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 from utils.constants import get_connection
 
 
-def load_users_from_csv(csv_path):
+# bcrypt cost (bcrypt.gensalt 기본값 12)
+# - 로컬/개발 환경 시드 시간을 줄이려면 BCRYPT_SEED_ROUNDS 로 낮출 수 있음 (4 ~ 31)
+DEFAULT_BCRYPT_ROUNDS = int(os.getenv("BCRYPT_SEED_ROUNDS", 12))
+
+USER_INSERT_SQL = """
+    INSERT INTO users
+    (user_id, name, favorite_music, password, join_date, modify_date, grade)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+# 해싱 스레드 풀 (처음 사용할 때 만들고 모듈이 살아 있는 동안 재사용)
+_HASH_POOL = {"executor": None, "workers": 0}
+_HASH_POOL_LOCK = threading.Lock()
+
+
+def _get_hash_pool(workers):
+    """workers 개 이상의 스레드를 가진 공유 스레드 풀 (더 많이 요청되면 새로 만듦)"""
+    with _HASH_POOL_LOCK:
+        if _HASH_POOL["executor"] is None or _HASH_POOL["workers"] < workers:
+            previous = _HASH_POOL["executor"]
+            _HASH_POOL["executor"] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt-hash")
+            _HASH_POOL["workers"] = workers
+            if previous is not None:
+                previous.shutdown(wait=False)
+        return _HASH_POOL["executor"]
+
+
+def _hash_password(args):
+    """
+    (raw_pw, rounds) → bcrypt 해시 문자열 (해싱 스레드 풀에서 실행)
+    해싱할 수 없는 값이면 None
+    """
+    raw_pw, rounds = args
+    try:
+        return bcrypt.hashpw(raw_pw.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+    except Exception:
+        return None
+
+
+def _iter_hashes(passwords, rounds, workers):
+    """입력 순서대로 해시를 돌려주는 제너레이터 (workers <= 1 이면 현재 스레드에서 처리)"""
+    tasks = [(pw, rounds) for pw in passwords]
+    if workers <= 1 or len(tasks) < 2:
+        for task in tasks:
+            yield _hash_password(task)
+        return
+
+    yield from _get_hash_pool(workers).map(_hash_password, tasks)
+
+
+def _print_progress(done, total, inserted, failed):
+    print(f"[{done}/{total}] 진행 중... 성공 {inserted} / 실패 {failed}")
+
+
+def load_users_from_csv(
+    csv_path,
+    batch_size=500,
+    commit_interval=2000,
+    workers=None,
+    rounds=None,
+    progress_callback=_print_progress,
+):
     """
     CSV의 Password 값을 bcrypt 해시로 변환하여 DB에 Insert
+
+    Args:
+        csv_path: user_data.csv 경로
+        batch_size: executemany 한 번에 INSERT 할 행 수
+        commit_interval: 이 행 수 이상 INSERT 할 때마다 commit
+        workers: 해싱 스레드 수 (None 이면 CPU 수)
+        rounds: bcrypt cost (None 이면 DEFAULT_BCRYPT_ROUNDS)
+        progress_callback: callback(done, total, inserted, failed), commit 할 때마다 호출 (None 이면 생략)
+
+    Returns:
+        {"inserted": int, "failed": int, "elapsed_sec": float}
     """
 
     print("\n-----------------------------------------")
@@ -21,6 +103,12 @@ def load_users_from_csv(csv_path):
     print(f"파일 경로: {csv_path}")
     print("-----------------------------------------")
 
+    started = time.perf_counter()
+    rounds = DEFAULT_BCRYPT_ROUNDS if rounds is None else rounds
+    workers = workers or os.cpu_count() or 1
+    batch_size = max(1, batch_size)
+    commit_interval = max(batch_size, commit_interval)
+
     try:
         conn = get_connection()
         cursor = conn.cursor()
@@ -39,50 +127,80 @@ def load_users_from_csv(csv_path):
         print("CSV Columns:", list(rows[0].keys()))
     except Exception as e:
         print("CSV 읽기 실패:", e)
+        cursor.close()
+        conn.close()
         return
 
+    total = len(rows)
     inserted = 0
     failed = 0
-
-    for i, row in enumerate(rows, start=1):
+    uncommitted = 0
+    batch = []
+
+    def flush():
+        """batch 를 다건 INSERT, 실패하면 행 단위로 다시 INSERT 해 문제 행만 제외"""
+        nonlocal inserted, failed, uncommitted
+        if not batch:
+            return
         try:
-            print(f"[{i}/{len(rows)}] ➜ 삽입 중... id={row.get('user_id')}")
-
-            # ----------------------------
-            # ① Password bcrypt 해싱
-            # ----------------------------
-            raw_pw = row.get("Password")
-            hashed_pw = bcrypt.hashpw(raw_pw.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-
-            sql = """
-                INSERT INTO users 
-                (user_id, name, favorite_music, password, join_date, modify_date, grade)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-
-            cursor.execute(sql, (
-                row.get("user_id"),
-                row.get("Name"),
-                row.get("Favorite_Music"),
-                hashed_pw,                       # ← bcrypt 해시 저장
-                row.get("JoinDate") or None,
-                row.get("ModifyDate") or None,
-                row.get("Grade"),
-            ))
-
-            conn.commit()
-            inserted += 1
-            print(f"성공 (누적: {inserted})")
-
-        except Exception as e:
-            failed += 1
-            print(f"실패 (누적: {failed}) → 이유: {e}")
-
-    cursor.close()
-    conn.close()
+            cursor.executemany(USER_INSERT_SQL, batch)
+            inserted += len(batch)
+        except Exception:
+            # 다건 INSERT 는 문장 단위로 롤백되므로 같은 행을 다시 시도해도 안전
+            for values in batch:
+                try:
+                    cursor.execute(USER_INSERT_SQL, values)
+                    inserted += 1
+                except Exception as e:
+                    failed += 1
+                    if failed <= 5:
+                        print(f"실패 id={values[0]} → 이유: {e}")
+        uncommitted += len(batch)
+        batch.clear()
+
+    def commit(done):
+        nonlocal uncommitted
+        conn.commit()
+        uncommitted = 0
+        if progress_callback is not None:
+            progress_callback(done, total, inserted, failed)
+
+    try:
+        # ① Password bcrypt 해싱 (스레드 풀) → ② 배치 INSERT
+        hashes = _iter_hashes([row.get("Password") for row in rows], rounds, workers)
+        for i, (row, hashed_pw) in enumerate(zip(rows, hashes), start=1):
+            if hashed_pw is None:
+                failed += 1
+            else:
+                batch.append((
+                    row.get("user_id"),
+                    row.get("Name"),
+                    row.get("Favorite_Music"),
+                    hashed_pw,                       # ← bcrypt 해시 저장
+                    row.get("JoinDate") or None,
+                    row.get("ModifyDate") or None,
+                    row.get("Grade"),
+                ))
+
+            if len(batch) >= batch_size:
+                flush()
+            if uncommitted >= commit_interval:
+                commit(i)
+
+        flush()
+        if uncommitted or total == 0:
+            commit(total)
+    finally:
+        cursor.close()
+        conn.close()
+
+    elapsed = time.perf_counter() - started
 
     print("\n-----------------------------------------")
     print("Insert 완료")
     print(f"성공: {inserted}")
     print(f"실패: {failed}")
+    print(f"소요 시간: {elapsed:.1f}s (bcrypt rounds={rounds}, workers={workers})")
     print("-----------------------------------------\n")
+
+    return {"inserted": inserted, "failed": failed, "elapsed_sec": round(elapsed, 3)}